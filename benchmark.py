@@ -0,0 +1,251 @@
+"""
+Script de benchmarks - Mesure les gains des options de performance
+"""
+import argparse
+import contextlib
+import gzip
+import io
+import os
+import time
+import xml.etree.ElementTree as ET
+
+import cv2
+import numpy as np
+
+from src.advanced_shapes import HybridLowPolyGenerator
+from src.batch_processor import BatchConfig, BatchProcessor
+from src.analysis import ImageAnalysis
+from src.low_poly import EdgeDetector, LowPolyGenerator
+from src.mixed_engine import MixedLowPolyGenerator
+from src.superpixel_engine import SuperpixelLowPolyGenerator
+from src.svg_export import SVGExporter
+
+
+def best_time(func, repeats: int) -> float:
+    """Meilleur temps d'exécution sur plusieurs essais (sorties console masquées)"""
+    times = []
+    for _ in range(repeats):
+        with contextlib.redirect_stdout(io.StringIO()):
+            start_time = time.perf_counter()
+            func()
+            times.append(time.perf_counter() - start_time)
+    return min(times)
+
+
+def bench_hybrid_workers(args):
+    """Rendu hybride par bandes : temps et accélération selon le nombre de workers"""
+    generator = HybridLowPolyGenerator(args.input, max_megapixels=args.max_size)
+    smoothed = generator.smoothed_image()
+    generator.edge_map()
+
+    print(f"📐 Image {generator.width}x{generator.height}, grille {args.grid_size}px, "
+          f"backend={args.backend}, {os.cpu_count()} CPU")
+
+    reference = None
+    baseline = None
+    workers = 1
+    while workers <= args.max_workers:
+        def render():
+            return generator.generate_hybrid(grid_size=args.grid_size, smoothed_image=smoothed,
+                                             adaptive=args.adaptive, workers=workers,
+                                             backend=args.backend)
+        elapsed = best_time(render, args.repeats)
+        with contextlib.redirect_stdout(io.StringIO()):
+            pixels = np.asarray(render())
+        if reference is None:
+            reference, baseline = pixels, elapsed
+        identical = "✅" if np.array_equal(pixels, reference) else "❌"
+        print(f"  workers={workers:2}  {elapsed * 1000:8.1f} ms  x{baseline / elapsed:4.2f}  "
+              f"identique {identical}")
+        workers *= 2
+
+
+def bench_mixed(args):
+    """Moteur mixte contre mode classique : primitives et temps de rendu"""
+    classic = LowPolyGenerator(args.input, num_points=args.points, max_megapixels=args.max_size)
+    mixed = MixedLowPolyGenerator(args.input, num_points=args.points, grid_size=args.grid_size,
+                                  detail_threshold=args.detail_threshold, image=classic.image)
+    print(f"📐 Image {classic.width}x{classic.height}, {args.points} points, grille {args.grid_size}px")
+
+    np.random.seed(0)
+    classic_time = best_time(classic.generate, args.repeats)
+    classic_triangles = len(classic.triangulate(classic.generate_points()).simplices)
+    np.random.seed(0)
+    mixed_time = best_time(mixed.generate, args.repeats)
+    mixed_total = sum(mixed.primitives.values())
+
+    print(f"  classique  {classic_time * 1000:8.1f} ms  {classic_triangles:6} triangles")
+    print(f"  mixte      {mixed_time * 1000:8.1f} ms  {mixed_total:6} primitives "
+          f"({mixed.primitives['triangles']} triangles + {mixed.primitives['formes']} formes)")
+    print(f"  gain       x{classic_time / mixed_time:4.2f} en temps, "
+          f"{100 * (1 - mixed_total / classic_triangles):.0f}% de primitives en moins")
+
+
+def bench_superpixels(args):
+    """Moteur superpixels contre mode classique : temps, primitives et fidélité"""
+    classic = LowPolyGenerator(args.input, num_points=args.points, enhance_colors=False,
+                               max_megapixels=args.max_size)
+    regions = SuperpixelLowPolyGenerator(args.input, num_regions=args.regions, enhance_colors=False,
+                                         image=classic.image)
+    print(f"📐 Image {classic.width}x{classic.height}, {args.points} points / {args.regions} régions "
+          f"(sans amélioration des couleurs)")
+
+    results = []
+    for name, generator in (("classique", classic), ("superpixels", regions)):
+        np.random.seed(0)
+        elapsed = best_time(lambda: generator.generate(add_outlines=False), args.repeats)
+        np.random.seed(0)
+        with contextlib.redirect_stdout(io.StringIO()):
+            rendered = cv2.cvtColor(np.asarray(generator.generate(add_outlines=False)), cv2.COLOR_RGB2BGR)
+        results.append((name, elapsed, cv2.PSNR(classic.image, rendered)))
+
+    np.random.seed(0)
+    triangles = len(classic.triangulate(classic.generate_points()).simplices)
+    counts = {"classique": f"{triangles} triangles",
+              "superpixels": f"{regions.primitives['régions']} polygones "
+                             f"({regions.primitives['sommets']} sommets)"}
+    for name, elapsed, quality in results:
+        print(f"  {name:12} {elapsed * 1000:8.1f} ms  {quality:5.2f} dB  {counts[name]}")
+
+
+def bench_edges(args):
+    """Niveaux de détection de contours : coût de la détection et qualité du maillage"""
+    image = LowPolyGenerator(args.input, max_megapixels=args.max_size).image
+    height, width = image.shape[:2]
+    print(f"📐 Image {width}x{height}, {args.points} points, sensibilité {args.sensitivity} "
+          f"(qualité sans contours ni amélioration)")
+
+    for detector in (EdgeDetector.SOBEL, EdgeDetector.CANNY, EdgeDetector.FULL):
+        def make_generator():
+            return LowPolyGenerator(args.input, num_points=args.points, enhance_colors=False,
+                                    edge_sensitivity=args.sensitivity, edge_detector=detector,
+                                    analysis=ImageAnalysis(image))
+        # Nouvelle analyse à chaque essai : rien n'est relu du cache
+        detect_time = best_time(lambda: make_generator().detect_edges(), args.repeats)
+        np.random.seed(0)
+        total_time = best_time(lambda: make_generator().generate(add_outlines=False), args.repeats)
+
+        generator = make_generator()
+        edge_pixels = int(np.count_nonzero(generator.detect_edges()))
+        np.random.seed(0)
+        rendered = cv2.cvtColor(np.asarray(generator.generate(add_outlines=False)), cv2.COLOR_RGB2BGR)
+        print(f"  {detector:6} contours {detect_time * 1000:7.1f} ms  total {total_time * 1000:7.1f} ms  "
+              f"{cv2.PSNR(image, rendered):5.2f} dB  {edge_pixels / (width * height):5.1%} de pixels de contour")
+
+
+def bench_svg(args):
+    """Export SVG standard contre compact : taille, écriture et relecture"""
+    generator = LowPolyGenerator(args.input, num_points=args.points, max_megapixels=args.max_size)
+    np.random.seed(0)
+    points = generator.generate_points()
+    simplices = generator.triangulate(points).simplices
+    smoothed = generator.smooth_image()
+    colors = [generator.get_triangle_color(triangle, points, smoothed) for triangle in simplices]
+
+    exporter = SVGExporter(generator.width, generator.height)
+    for triangle, color in zip(simplices, colors):
+        exporter.add_triangle(points[triangle], color, (0, 0, 0), 1)
+    print(f"📐 Image {generator.width}x{generator.height}, {len(simplices)} triangles")
+
+    variants = [("standard", "svg", {}),
+                ("compact", "svg", {"compact": True}),
+                ("standard gz", "svgz", {}),
+                ("compact gz", "svgz", {"compact": True})]
+    reference_size = None
+    for name, extension, options in variants:
+        path = f"/tmp/benchmark_{name.replace(' ', '_')}.{extension}"
+        opener = gzip.open if extension == "svgz" else open
+        write_time = best_time(lambda: exporter.save(path, **options), args.repeats)
+        size = os.path.getsize(path)
+        reference_size = reference_size or size
+        def parse():
+            with opener(path, "rb") as f:
+                ET.parse(f)
+        parse_time = best_time(parse, args.repeats)
+        print(f"  {name:11} {size / 1024:9.1f} Ko  ({size / reference_size:4.0%})  "
+              f"écriture {write_time * 1000:7.1f} ms  lecture {parse_time * 1000:7.1f} ms")
+
+
+def bench_batch(args):
+    """Traitement par lots : séquentiel, pipeline d'E/S et processus parallèles"""
+    variants = [("séquentiel", {}),
+                (f"prefetch {args.prefetch}", {"prefetch": args.prefetch}),
+                (f"workers {args.workers}", {"parallel": True, "workers": args.workers}),
+                ("mém. partagée", {"parallel": True, "workers": args.workers,
+                                   "shared_memory": True, "prefetch": args.prefetch})]
+    print(f"📂 {args.input}, {args.points} points, max {args.max_size} MP, {os.cpu_count()} CPU")
+
+    for name, options in variants:
+        config = BatchConfig(input_dir=args.input, output_dir=args.output_dir,
+                             num_points=args.points, max_megapixels=args.max_size, **options)
+        processor = BatchProcessor(config)
+        elapsed = best_time(processor.process_batch, args.repeats)
+        count = len(processor.results)
+        busy = sum(r.processing_time for r in processor.results)
+        print(f"  {name:13} {elapsed:7.2f} s  {count / elapsed:5.2f} images/s  "
+              f"(somme des temps par image {busy:6.2f} s)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks du générateur Low Poly")
+    subparsers = parser.add_subparsers(dest="benchmark", required=True)
+
+    hybrid_workers = subparsers.add_parser("hybrid-workers",
+                                           help="Rendu hybride par bandes parallèles")
+    hybrid_workers.add_argument("input", help="Image à traiter")
+    hybrid_workers.add_argument("--grid-size", type=int, default=10)
+    hybrid_workers.add_argument("--adaptive", action="store_true")
+    hybrid_workers.add_argument("--backend", choices=["thread", "process"], default="thread")
+    hybrid_workers.add_argument("--max-workers", type=int, default=os.cpu_count() or 1)
+    hybrid_workers.add_argument("--max-size", type=float, default=None)
+    hybrid_workers.add_argument("--repeats", type=int, default=3)
+    hybrid_workers.set_defaults(func=bench_hybrid_workers)
+
+    mixed = subparsers.add_parser("mixed", help="Moteur mixte contre mode classique")
+    mixed.add_argument("input", help="Image à traiter")
+    mixed.add_argument("--points", type=int, default=1000)
+    mixed.add_argument("--grid-size", type=int, default=25)
+    mixed.add_argument("--detail-threshold", type=float, default=0.5)
+    mixed.add_argument("--max-size", type=float, default=None)
+    mixed.add_argument("--repeats", type=int, default=3)
+    mixed.set_defaults(func=bench_mixed)
+
+    superpixels = subparsers.add_parser("superpixels", help="Moteur superpixels contre mode classique")
+    superpixels.add_argument("input", help="Image à traiter")
+    superpixels.add_argument("--points", type=int, default=1000)
+    superpixels.add_argument("--regions", type=int, default=400)
+    superpixels.add_argument("--max-size", type=float, default=None)
+    superpixels.add_argument("--repeats", type=int, default=3)
+    superpixels.set_defaults(func=bench_superpixels)
+
+    edges = subparsers.add_parser("edges", help="Niveaux de détection de contours")
+    edges.add_argument("input", help="Image à traiter")
+    edges.add_argument("--points", type=int, default=1000)
+    edges.add_argument("--sensitivity", type=int, default=2)
+    edges.add_argument("--max-size", type=float, default=None)
+    edges.add_argument("--repeats", type=int, default=3)
+    edges.set_defaults(func=bench_edges)
+
+    svg = subparsers.add_parser("svg", help="Export SVG standard contre compact")
+    svg.add_argument("input", help="Image à traiter")
+    svg.add_argument("--points", type=int, default=1000)
+    svg.add_argument("--max-size", type=float, default=None)
+    svg.add_argument("--repeats", type=int, default=3)
+    svg.set_defaults(func=bench_svg)
+
+    batch = subparsers.add_parser("batch", help="Traitement par lots : pipeline et parallélisme")
+    batch.add_argument("input", help="Dossier d'images")
+    batch.add_argument("--output-dir", default="/tmp/benchmark_batch")
+    batch.add_argument("--points", type=int, default=1000)
+    batch.add_argument("--prefetch", type=int, default=2)
+    batch.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    batch.add_argument("--max-size", type=float, default=None)
+    batch.add_argument("--repeats", type=int, default=1)
+    batch.set_defaults(func=bench_batch)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
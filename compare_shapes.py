@@ -34,21 +34,25 @@ def compare_all_methods():
         }
     ]
     
+    # Un seul générateur : flou, contours et statistiques sont calculés une
+    # fois puis relus pour chaque taille de grille
+    generator = HybridLowPolyGenerator(input_path)
+    
     for i, config in enumerate(configs, 1):
         print(f"\n{i}️⃣  {config['name']}")
         print("-" * 70)
         
         # Générer triangles uniquement
         print(f"   Génération triangles (grille {config['grid_size']}px)...")
-        gen_tri = HybridLowPolyGenerator(input_path, enable_shape_mixing=False)
-        img_tri = gen_tri.generate_hybrid(grid_size=config['grid_size'])
+        generator.enable_shape_mixing = False
+        img_tri = generator.generate_hybrid(grid_size=config['grid_size'])
         img_tri.save(f"data/output/{config['filename_tri']}")
         print(f"   ✅ {config['filename_tri']}")
         
         # Générer formes hybrides
         print(f"   Génération hybrid (grille {config['grid_size']}px)...")
-        gen_hybrid = HybridLowPolyGenerator(input_path, enable_shape_mixing=True)
-        img_hybrid = gen_hybrid.generate_hybrid(grid_size=config['grid_size'])
+        generator.enable_shape_mixing = True
+        img_hybrid = generator.generate_hybrid(grid_size=config['grid_size'])
         img_hybrid.save(f"data/output/{config['filename_hybrid']}")
         print(f"   ✅ {config['filename_hybrid']}")
     
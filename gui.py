@@ -9,8 +9,12 @@ from PIL import Image, ImageTk
 import threading
 import os
 from pathlib import Path
-from src.low_poly import LowPolyGenerator
+from src.low_poly import EdgeDetector, LowPolyGenerator, load_image
 from src.advanced_shapes import HybridLowPolyGenerator
+from src.analysis import ImageAnalysis
+from src.batch_manifest import file_digest
+from src.batch_processor import BatchConfig, effective_params
+from src.result_cache import ResultCache
 from src.preset_manager import get_preset_manager, Preset
 
 
@@ -24,7 +28,12 @@ class PolyGenGUI:
         # Variables
         self.current_image_path = None
         self.generator = None
+        self.hybrid_generator = None  # Réutilisé tant que l'image ne change pas
+        self.analysis = None  # Analyse de l'image partagée par les deux modes
+        self.analysis_path = None
         self.is_generating = False
+        self.result_cache = None  # Cache de résultats partagé avec la CLI et le mode batch
+        self.edge_detector = EdgeDetector.FULL  # Niveau de contours du preset chargé (mode classique)
         
         # Gestionnaire de presets
         self.preset_manager = get_preset_manager()
@@ -103,6 +112,10 @@ class PolyGenGUI:
         self.grid_size_label.grid(row=6, column=2)
         self.grid_size_scale.config(state=tk.DISABLED)  # Désactivé par défaut
         
+        self.cache_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(params_frame, text="Utiliser le cache (même rendu pour mêmes paramètres)",
+                        variable=self.cache_var).grid(row=7, column=1, sticky=tk.W)
+        
         # === Section Presets ===
         preset_frame = ttk.LabelFrame(main_frame, text="🎨 Presets (Prédéfinis et Personnalisés)", padding="10")
         preset_frame.grid(row=1, column=1, sticky=(tk.W, tk.E, tk.N, tk.S), pady=5, padx=5)
@@ -249,6 +262,7 @@ class PolyGenGUI:
         
         self.outlines_var.set(preset.add_outlines)
         self.enhance_var.set(preset.enhance_colors)
+        self.edge_detector = preset.edge_detector
         
         self.status_var.set(f"✅ Preset chargé: {preset_name}")
     
@@ -289,7 +303,8 @@ class PolyGenGUI:
                 edge_sensitivity=int(self.sensitivity_var.get()),
                 enhance_colors=self.enhance_var.get(),
                 add_outlines=self.outlines_var.get(),
-                grid_size=int(self.grid_size_var.get())
+                grid_size=int(self.grid_size_var.get()),
+                edge_detector=self.edge_detector
             )
             
             # Sauvegarder
@@ -433,6 +448,21 @@ class PolyGenGUI:
         thread.daemon = True
         thread.start()
     
+    def _cache_key(self) -> str:
+        """Clé du rendu courant dans le cache (mêmes paramètres que le mode batch)"""
+        config = BatchConfig(
+            input_dir="", output_dir="",
+            num_points=int(self.points_var.get()),
+            blur_strength=int(self.blur_var.get()),
+            edge_sensitivity=int(self.sensitivity_var.get()),
+            edge_detector=self.edge_detector,
+            enhance_colors=self.enhance_var.get(),
+            add_outlines=self.outlines_var.get(),
+            hybrid_mode=self.hybrid_var.get(),
+            grid_size=int(self.grid_size_var.get())
+        )
+        return ResultCache.key(file_digest(Path(self.current_image_path)), effective_params(config))
+    
     def _generate_thread(self):
         """Génère l'image dans un thread séparé"""
         self.is_generating = True
@@ -441,13 +471,39 @@ class PolyGenGUI:
         self.root.update()
         
         try:
+            cache_key = None
+            if self.cache_var.get():
+                if self.result_cache is None:
+                    self.result_cache = ResultCache()
+                cache_key = self._cache_key()
+                cached = self.result_cache.get_image(cache_key)
+                if cached is not None:
+                    self.current_image = cached
+                    self.display_preview_pil(self.current_image)
+                    self.status_var.set("♻️ Repris du cache! Cliquez 'Sauvegarder' pour exporter.")
+                    return
+            
+            # Une seule analyse (gris, CLAHE, contours, flous) par image,
+            # conservée quand on passe d'un mode à l'autre
+            if self.analysis_path != self.current_image_path:
+                image = load_image(self.current_image_path)
+                if image is None:
+                    raise ValueError(f"Impossible de charger l'image: {self.current_image_path}")
+                self.analysis = ImageAnalysis(image)
+                self.analysis_path = self.current_image_path
+                self.hybrid_generator = None
+            
             # Mode hybride
             if self.hybrid_var.get():
-                hybrid_gen = HybridLowPolyGenerator(
-                    self.current_image_path,
-                    enable_shape_mixing=True
-                )
-                self.current_image = hybrid_gen.generate_hybrid(
+                # Même image : flou, contours et statistiques de grille déjà
+                # calculés, seul le dessin est refait quand la grille change
+                if self.hybrid_generator is None:
+                    self.hybrid_generator = HybridLowPolyGenerator(
+                        self.current_image_path,
+                        enable_shape_mixing=True,
+                        analysis=self.analysis
+                    )
+                self.current_image = self.hybrid_generator.generate_hybrid(
                     grid_size=int(self.grid_size_var.get())
                 )
             # Mode classique
@@ -457,7 +513,9 @@ class PolyGenGUI:
                     num_points=int(self.points_var.get()),
                     blur_strength=int(self.blur_var.get()),
                     enhance_colors=self.enhance_var.get(),
-                    edge_sensitivity=int(self.sensitivity_var.get())
+                    edge_sensitivity=int(self.sensitivity_var.get()),
+                    edge_detector=self.edge_detector,
+                    analysis=self.analysis
                 )
                 
                 self.current_image = self.generator.generate(
@@ -465,6 +523,9 @@ class PolyGenGUI:
                     add_outlines=self.outlines_var.get()
                 )
             
+            if cache_key is not None:
+                self.result_cache.put_image(cache_key, self.current_image)
+            
             # Afficher le résultat
             self.display_preview_pil(self.current_image)
             self.status_var.set("✅ Généré! Cliquez 'Sauvegarder' pour exporter.")
@@ -5,11 +5,54 @@ Script principal - Interface CLI pour PolyGen
 import argparse
 import sys
 from pathlib import Path
-from src.low_poly import LowPolyGenerator
-from src.svg_export import SVGExporter
+from typing import Dict
+import numpy as np
+from src.low_poly import EdgeDetector, LowPolyGenerator, PointSource
+from src.svg_export import SVGStreamWriter
 from src.advanced_shapes import HybridLowPolyGenerator
-from src.batch_processor import batch_process_cli
+from src.mixed_engine import MixedLowPolyGenerator
+from src.superpixel_engine import SuperpixelLowPolyGenerator
+from src.batch_processor import BatchConfig, batch_process_cli, effective_params
+from src.batch_manifest import file_digest
+from src.result_cache import DEFAULT_MAX_MB, ResultCache
 from src.preset_manager import get_preset_manager, Preset
+from src.auto_tune import auto_tune_preset
+
+
+def render_params(args, mesh: bool = False) -> Dict:
+    """
+    Paramètres effectifs du rendu demandé en ligne de commande
+    
+    Mêmes clés que le mode batch (effective_params) : une image déjà
+    traitée par un lot est retrouvée dans le cache, et inversement.
+    
+    Args:
+        args: Arguments de la ligne de commande
+        mesh: Paramètres du seul maillage (sans contours ni format SVG)
+    
+    Returns:
+        Dictionnaire sérialisable en JSON
+    """
+    config = BatchConfig(
+        input_dir="", output_dir="",
+        num_points=args.points, blur_strength=args.blur, edge_sensitivity=args.sensitivity,
+        edge_detector=args.edge_detector, enhance_colors=not args.no_enhance,
+        add_outlines=not args.no_outlines, hybrid_mode=args.hybrid, mixed_mode=args.mixed,
+        detail_threshold=args.detail_threshold, superpixel_mode=args.superpixels,
+        num_regions=args.regions, grid_size=args.grid_size, adaptive_grid=args.adaptive,
+        max_megapixels=args.max_size, point_source=args.point_source,
+        contour_tolerance=args.contour_tolerance
+    )
+    params = effective_params(config)
+    if args.no_edges:
+        params["use_edges"] = False
+    if mesh:
+        params.pop("add_outlines", None)
+        params["mesh"] = True
+    elif args.svg:
+        params.update(svg=True, add_outlines=not args.no_outlines,
+                      svg_compact=args.svg_compact, svg_precision=args.svg_precision)
+    return params
 
 
 def main():
@@ -71,10 +114,44 @@ def main():
         help="Sensibilité de détection des contours 1-5 (défaut: 2)"
     )
     
+    parser.add_argument(
+        "--edge-detector",
+        choices=[EdgeDetector.SOBEL, EdgeDetector.CANNY, EdgeDetector.FULL],
+        default=EdgeDetector.FULL,
+        help="Détecteur de contours: sobel (rapide), canny (sans CLAHE), full (CLAHE + Canny, défaut)"
+    )
+    
+    parser.add_argument(
+        "--point-source",
+        choices=[PointSource.RANDOM, PointSource.CONTOURS],
+        default=PointSource.RANDOM,
+        help="Placement des points de contour: tirage aléatoire ou sommets des contours simplifiés (défaut: random)"
+    )
+    
+    parser.add_argument(
+        "--contour-tolerance",
+        type=float,
+        default=2.0,
+        help="Tolérance de simplification des contours en pixels pour --point-source contours (défaut: 2.0)"
+    )
+    
     parser.add_argument(
         "--svg",
         action="store_true",
-        help="Exporter en SVG vectoriel au lieu de PNG"
+        help="Exporter en SVG vectoriel au lieu de PNG (sortie .svgz = compressée en gzip)"
+    )
+    
+    parser.add_argument(
+        "--svg-compact",
+        action="store_true",
+        help="SVG compact : triangles de même couleur fusionnés en <path> relatifs (mode classique)"
+    )
+    
+    parser.add_argument(
+        "--svg-precision",
+        type=int,
+        default=0,
+        help="Décimales des coordonnées en SVG compact (défaut: 0, tronquées comme en SVG standard)"
     )
     
     parser.add_argument(
@@ -83,11 +160,51 @@ def main():
         help="Utiliser des formes géométriques mixtes (carrés, hexagones, etc.) au lieu de seulement des triangles"
     )
     
+    parser.add_argument(
+        "--mixed",
+        action="store_true",
+        help="Moteur mixte: triangles dans les zones détaillées, formes hybrides dans les zones plates"
+    )
+    
+    parser.add_argument(
+        "--detail-threshold",
+        type=float,
+        default=0.5,
+        help="Mode mixte: densité de contours (0-1) à partir de laquelle une cellule est triangulée (défaut: 0.5)"
+    )
+    
+    parser.add_argument(
+        "--superpixels",
+        action="store_true",
+        help="Moteur superpixels: une région SLIC = un polygone (peu de primitives)"
+    )
+    
+    parser.add_argument(
+        "--regions",
+        type=int,
+        default=400,
+        help="Mode superpixels: nombre de régions visé (défaut: 400)"
+    )
+    
     parser.add_argument(
         "--grid-size",
         type=int,
         default=25,
-        help="Taille de la grille pour le mode hybride en pixels (défaut: 25)"
+        help="Taille de la grille pour les modes hybride et mixte en pixels (défaut: 25)"
+    )
+    
+    parser.add_argument(
+        "--adaptive",
+        action="store_true",
+        help="Mode hybride: cellules adaptatives (quadtree), grandes dans les zones plates; --grid-size devient la taille minimale"
+    )
+    
+    parser.add_argument(
+        "--render-workers",
+        type=int,
+        default=1,
+        metavar="N",
+        help="Mode hybride: rendu en N bandes horizontales parallèles (défaut: 1)"
     )
     
     parser.add_argument(
@@ -130,6 +247,120 @@ def main():
         help="Description pour le preset à sauvegarder (à utiliser avec --save-preset)"
     )
     
+    parser.add_argument(
+        "--max-size",
+        type=float,
+        default=None,
+        metavar="MP",
+        help="Taille maximale de travail en mégapixels (les JPEG sont décodés directement à échelle réduite)"
+    )
+    
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        metavar="N",
+        help="Mode batch: traite N images en parallèle dans des processus séparés (0 = nombre de CPU)"
+    )
+    
+    parser.add_argument(
+        "--prefetch",
+        type=int,
+        default=0,
+        metavar="N",
+        help="Mode batch: décode les N images suivantes pendant le rendu et encode en arrière-plan"
+    )
+    
+    parser.add_argument(
+        "--memory-budget",
+        type=float,
+        default=None,
+        metavar="MP",
+        help="Mode batch parallèle: total de mégapixels traités simultanément (dimensions lues dans les en-têtes, plus grandes images en premier)"
+    )
+    
+    parser.add_argument(
+        "--shared-memory",
+        action="store_true",
+        help="Mode batch parallèle: décodage et encodage dans le processus principal, images échangées avec les workers en mémoire partagée (sans sérialisation)"
+    )
+    
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Mode batch: commence le traitement pendant le parcours du dossier (ordre du système de fichiers, sans total; ignoré avec --workers)"
+    )
+    
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Mode batch: ne traite que les images nouvelles ou modifiées depuis le dernier lot (manifeste dans le dossier de sortie)"
+    )
+    
+    parser.add_argument(
+        "--cache",
+        action="store_true",
+        help="Réutilise les rendus déjà calculés pour une image de même contenu et les mêmes paramètres (cache partagé avec le mode batch et la GUI)"
+    )
+    
+    parser.add_argument(
+        "--cache-dir",
+        type=str,
+        default=None,
+        help="Dossier du cache de résultats (défaut: ~/.polygen/cache)"
+    )
+    
+    parser.add_argument(
+        "--cache-size",
+        type=float,
+        default=DEFAULT_MAX_MB,
+        metavar="MB",
+        help=f"Taille maximale du cache, les entrées les moins récemment utilisées sont supprimées (défaut: {DEFAULT_MAX_MB})"
+    )
+    
+    parser.add_argument(
+        "--report",
+        type=str,
+        default=None,
+        metavar="PATH",
+        help="Mode batch: rapport détaillé par image et par étape (JSON, ou CSV si PATH finit par .csv)"
+    )
+    
+    parser.add_argument(
+        "--low-memory",
+        action="store_true",
+        help="Mode batch: réutilise les buffers entre images et travaille en place"
+    )
+    
+    parser.add_argument(
+        "--timings",
+        action="store_true",
+        help="Affiche la chronologie des étapes du pipeline (mode classique)"
+    )
+    
+    parser.add_argument(
+        "--auto-tune",
+        type=str,
+        metavar="NAME",
+        help="Cherche points/flou/sensibilité sur l'image d'entrée et sauvegarde le résultat comme preset"
+    )
+    
+    parser.add_argument(
+        "--target-quality",
+        type=float,
+        default=None,
+        metavar="DB",
+        help="Qualité minimale visée par --auto-tune (PSNR en dB)"
+    )
+    
+    parser.add_argument(
+        "--time-budget",
+        type=float,
+        default=None,
+        metavar="SEC",
+        help="Temps de rendu maximal visé par --auto-tune (secondes, pleine résolution)"
+    )
+    
     args = parser.parse_args()
     
     # Gestion des commandes de presets
@@ -149,6 +380,7 @@ def main():
             points=args.points,
             blur_strength=args.blur,
             edge_sensitivity=args.sensitivity,
+            edge_detector=args.edge_detector,
             enhance_colors=not args.no_enhance,
             add_outlines=not args.no_outlines,
             grid_size=args.grid_size
@@ -162,6 +394,27 @@ def main():
         
         sys.exit(0)
     
+    # Auto-réglage d'un preset
+    if args.auto_tune:
+        if not args.input or not Path(args.input).is_file():
+            print("❌ Erreur: --auto-tune requiert une image d'entrée")
+            sys.exit(1)
+        
+        try:
+            auto_tune_preset(
+                args.input,
+                args.auto_tune,
+                target_quality=args.target_quality,
+                time_budget=args.time_budget,
+                enhance_colors=not args.no_enhance,
+                add_outlines=not args.no_outlines
+            )
+        except Exception as e:
+            print(f"❌ Erreur: {e}")
+            sys.exit(1)
+        
+        sys.exit(0)
+    
     # Charger un preset
     if args.load_preset:
         preset = preset_manager.load_preset(args.load_preset)
@@ -174,6 +427,7 @@ def main():
         args.points = preset.points
         args.blur = preset.blur_strength
         args.sensitivity = preset.edge_sensitivity
+        args.edge_detector = preset.edge_detector
         args.grid_size = preset.grid_size
         args.no_enhance = not preset.enhance_colors
         args.no_outlines = not preset.add_outlines
@@ -190,12 +444,33 @@ def main():
             input_dir=args.input,
             output_dir=args.output_dir,
             hybrid=args.hybrid,
+            mixed=args.mixed,
+            detail_threshold=args.detail_threshold,
+            superpixels=args.superpixels,
+            num_regions=args.regions,
             grid_size=args.grid_size,
             num_points=args.points,
             blur_strength=args.blur,
             sensitivity=args.sensitivity,
+            edge_detector=args.edge_detector,
             enhance=not args.no_enhance,
-            outlines=not args.no_outlines
+            outlines=not args.no_outlines,
+            max_megapixels=args.max_size,
+            low_memory=args.low_memory,
+            point_source=args.point_source,
+            contour_tolerance=args.contour_tolerance,
+            adaptive_grid=args.adaptive,
+            render_workers=args.render_workers,
+            workers=args.workers,
+            prefetch=args.prefetch,
+            memory_budget_mp=args.memory_budget,
+            shared_memory=args.shared_memory,
+            streaming=args.stream,
+            incremental=args.incremental,
+            cache=args.cache,
+            cache_dir=args.cache_dir,
+            cache_max_mb=args.cache_size,
+            report=args.report
         )
         sys.exit(exit_code)
     
@@ -216,17 +491,77 @@ def main():
     if args.hybrid:
         print(f"⚙️  Mode: HYBRIDE (formes mixtes)")
         print(f"⚙️  Paramètres: grid_size={args.grid_size}px")
+    elif args.superpixels:
+        print(f"⚙️  Mode: SUPERPIXELS")
+        print(f"⚙️  Paramètres: {args.regions} régions")
+    elif args.mixed:
+        print(f"⚙️  Mode: MIXTE (triangles + formes)")
+        print(f"⚙️  Paramètres: {args.points} points, grid_size={args.grid_size}px")
     else:
         print(f"⚙️  Paramètres: {args.points} points, flou={args.blur}")
     
+    # Cache de résultats : rendu final, et maillage pour l'export SVG
+    result_cache = None
+    if args.cache:
+        result_cache = ResultCache(args.cache_dir, args.cache_size)
+        content_hash = file_digest(Path(args.input))
+        cache_key = ResultCache.key(content_hash, render_params(args))
+        if result_cache.fetch(cache_key, args.output):
+            print(f"♻️  Rendu repris du cache: {args.output}")
+            sys.exit(0)
+    
     try:
         # Mode hybride avec formes géométriques mixtes
         if args.hybrid:
             print("🎨 Génération avec formes géométriques mixtes...")
-            hybrid_gen = HybridLowPolyGenerator(args.input, enable_shape_mixing=True)
-            image = hybrid_gen.generate_hybrid(grid_size=args.grid_size)
-            
-            # Sauvegarder
+            hybrid_gen = HybridLowPolyGenerator(args.input, enable_shape_mixing=True,
+                                                max_megapixels=args.max_size)
+            if args.svg:
+                if args.svg_compact:
+                    print("⚠️  --svg-compact ignoré en mode hybride (les formes peuvent se chevaucher)")
+                count = hybrid_gen.export_svg(args.output, grid_size=args.grid_size,
+                                              adaptive=args.adaptive,
+                                              add_outlines=not args.no_outlines)
+                print(f"✅ Succès! SVG généré ({count} formes): {args.output}")
+            else:
+                image = hybrid_gen.generate_hybrid(grid_size=args.grid_size, adaptive=args.adaptive,
+                                                   workers=args.render_workers)
+                
+                # Sauvegarder
+                image.save(args.output)
+                print(f"✅ Succès! Image sauvegardée: {args.output}")
+        # Mode superpixels : une région SLIC = un polygone
+        elif args.superpixels:
+            if args.svg:
+                print("❌ Erreur: L'export SVG n'est pas disponible en mode superpixels")
+                sys.exit(1)
+            print("🎨 Génération par superpixels...")
+            superpixel_gen = SuperpixelLowPolyGenerator(
+                args.input,
+                num_regions=args.regions,
+                enhance_colors=not args.no_enhance,
+                max_megapixels=args.max_size
+            )
+            image = superpixel_gen.generate(add_outlines=not args.no_outlines)
+            image.save(args.output)
+            print(f"✅ Succès! Image sauvegardée: {args.output}")
+        # Mode mixte : triangles dans le détail, formes ailleurs
+        elif args.mixed:
+            if args.svg:
+                print("❌ Erreur: L'export SVG n'est pas disponible en mode mixte")
+                sys.exit(1)
+            print("🎨 Génération mixte (triangles + formes)...")
+            mixed_gen = MixedLowPolyGenerator(
+                args.input,
+                num_points=args.points,
+                blur_strength=args.blur,
+                enhance_colors=not args.no_enhance,
+                edge_sensitivity=args.sensitivity,
+                grid_size=args.grid_size,
+                detail_threshold=args.detail_threshold,
+                max_megapixels=args.max_size
+            )
+            image = mixed_gen.generate(add_outlines=not args.no_outlines)
             image.save(args.output)
             print(f"✅ Succès! Image sauvegardée: {args.output}")
         # Mode classique avec triangles
@@ -237,7 +572,11 @@ def main():
                 num_points=args.points,
                 blur_strength=args.blur,
                 enhance_colors=not args.no_enhance,
-                edge_sensitivity=args.sensitivity
+                edge_sensitivity=args.sensitivity,
+                max_megapixels=args.max_size,
+                point_source=args.point_source,
+                contour_tolerance=args.contour_tolerance,
+                edge_detector=args.edge_detector
             )
             
             # Export SVG ou PNG
@@ -252,22 +591,30 @@ def main():
                     smoothed_rgb = generator.enhance_color_image(smoothed_rgb)
                     smoothed = cv2.cvtColor(smoothed_rgb, cv2.COLOR_RGB2BGR)
                 
-                # Générer triangulation
-                points = generator.generate_points(use_edges=not args.no_edges)
-                tri = generator.triangulate(points)
-                
-                # Créer l'exporteur SVG
-                exporter = SVGExporter(generator.width, generator.height)
-                
-                # Ajouter les triangles
-                for triangle_indices in tri.simplices:
-                    tri_points = points[triangle_indices]
-                    color = generator.get_triangle_color(triangle_indices, points, smoothed)
-                    outline = (0, 0, 0) if not args.no_outlines else None
-                    exporter.add_triangle(tri_points, color, outline, 1)
-                
-                # Sauvegarder
-                exporter.save(args.output)
+                # Maillage en cache (même image, autre style de SVG)
+                mesh = None
+                if result_cache is not None:
+                    mesh_key = ResultCache.key(content_hash, render_params(args, mesh=True))
+                    mesh = result_cache.get_arrays(mesh_key)
+                if mesh is not None:
+                    print("♻️  Maillage repris du cache")
+                    points, simplices, colors = mesh["points"], mesh["simplices"], mesh["colors"]
+                else:
+                    # Générer triangulation
+                    points = generator.generate_points(use_edges=not args.no_edges)
+                    simplices = generator.triangulate(points).simplices
+                    
+                    # Couleurs des triangles, écrites par lots
+                    colors = np.array([generator.get_triangle_color(triangle_indices, points, smoothed)
+                                       for triangle_indices in simplices], dtype=np.int64).reshape(-1, 3)
+                    if result_cache is not None:
+                        result_cache.put_arrays(mesh_key, points=points, simplices=simplices,
+                                                colors=colors)
+                outline = (0, 0, 0) if not args.no_outlines else None
+                with SVGStreamWriter(args.output, generator.width, generator.height,
+                                     outline=outline, compact=args.svg_compact,
+                                     precision=args.svg_precision) as writer:
+                    writer.add_polygons(points[simplices], colors)
                 print(f"✅ Succès! SVG généré: {args.output}")
             else:
                 print("🎨 Génération de l'image low poly...")
@@ -276,9 +623,17 @@ def main():
                     add_outlines=not args.no_outlines
                 )
                 
-            # Sauvegarder
-            generator.save(args.output, image)
-            print(f"✅ Succès! Image sauvegardée: {args.output}")
+                if args.timings and generator.stage_graph is not None:
+                    print("⏱️  Étapes du pipeline:")
+                    print("\n".join(generator.stage_graph.format_timings()))
+                    print(f"  Chevauchement: {generator.stage_graph.overlap() * 1000:.1f} ms")
+                
+                # Sauvegarder
+                generator.save(args.output, image)
+                print(f"✅ Succès! Image sauvegardée: {args.output}")
+        
+        if result_cache is not None:
+            result_cache.put_file(cache_key, args.output)
         
     except Exception as e:
         print(f"❌ Erreur: {e}")
@@ -7,6 +7,14 @@ import numpy as np
 from scipy.spatial import Delaunay
 from PIL import Image
 import math
+from dataclasses import dataclass
+from functools import lru_cache
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+from src.low_poly import load_image
+from src.analysis import ImageAnalysis
+from src.buffer_pool import BufferPool
+from src.svg_export import SVGStreamWriter
 
 
 class PolygonType:
@@ -19,6 +27,200 @@ class PolygonType:
     PENTAGON = "pentagon"
 
 
+# Seuils de densité de contours et forme retenue pour chaque tranche
+SHAPE_DENSITY_THRESHOLDS = np.array([0.2, 0.4, 0.6, 0.8])
+SHAPES_BY_DENSITY = (
+    PolygonType.SQUARE,     # Zones lisses
+    PolygonType.RECTANGLE,
+    PolygonType.HEXAGON,    # Zone moyenne
+    PolygonType.PENTAGON,
+    PolygonType.TRIANGLE,   # Zones avec beaucoup de contours
+)
+
+
+def _block_sums(values: np.ndarray, y0: np.ndarray, x0: np.ndarray) -> np.ndarray:
+    """Sommes par blocs délimités par les débuts de lignes y0 et de colonnes x0"""
+    rows = np.add.reduceat(values, y0, axis=0, dtype=np.int64)
+    return np.add.reduceat(rows, x0, axis=1, dtype=np.int64)
+
+
+def _count_shapes(shape_indices: np.ndarray) -> Dict[str, int]:
+    """Nombre de cellules par type de forme"""
+    counts = np.bincount(shape_indices, minlength=len(SHAPES_BY_DENSITY))
+    return {shape_type: int(count) for shape_type, count in zip(SHAPES_BY_DENSITY, counts)}
+
+
+def _render_band(task: tuple) -> Tuple[int, int, np.ndarray, Dict[str, int]]:
+    """
+    Rend une bande horizontale (exécutable dans un thread ou un processus)
+    
+    Args:
+        task: (début, fin, haut du tampon, bas du tampon, largeur,
+               polygones touchant la bande, leurs couleurs,
+               indices de forme des cellules appartenant à la bande)
+    
+    Returns:
+        (début, fin, pixels de la bande, formes comptées)
+    """
+    band_y0, band_y1, buffer_y0, buffer_y1, width, polygons, colors, owned_indices = task
+    buffer = np.zeros((buffer_y1 - buffer_y0, width, 3), dtype=np.uint8)
+    shift = np.array([0, buffer_y0], dtype=np.int32)
+    HybridLowPolyGenerator.draw_polygons(buffer, [p - shift for p in polygons], colors)
+    pixels = buffer[band_y0 - buffer_y0:band_y1 - buffer_y0]
+    return band_y0, band_y1, pixels, _count_shapes(owned_indices)
+
+
+@lru_cache(maxsize=256)
+def _shape_template(shape_type: str, size: float, height: Optional[float],
+                    sides: int) -> np.ndarray:
+    """Calcule les sommets d'une forme centrée sur l'origine"""
+    if shape_type == PolygonType.TRIANGLE:
+        angles = np.array([90, 210, 330]) * np.pi / 180
+    elif shape_type == PolygonType.HEXAGON:
+        angles = [(i * 60 + 30) * np.pi / 180 for i in range(6)]
+    elif shape_type == PolygonType.PENTAGON:
+        angles = [(i * 72 - 90) * np.pi / 180 for i in range(5)]
+    elif shape_type == PolygonType.CIRCLE:
+        angles = [2 * np.pi * i / sides for i in range(sides)]
+    elif shape_type in (PolygonType.SQUARE, PolygonType.RECTANGLE):
+        half_w = size / 2
+        half_h = (size if height is None else height) / 2
+        angles = None
+        points = [[-half_w, -half_h], [half_w, -half_h], [half_w, half_h], [-half_w, half_h]]
+    else:
+        raise ValueError(f"Forme inconnue: {shape_type}")
+    
+    if angles is not None:
+        # Même calcul scalaire que la construction sommet par sommet
+        points = [[size * np.cos(angle), size * np.sin(angle)] for angle in angles]
+    
+    template = np.array(points, dtype=np.float64)
+    template.flags.writeable = False
+    return template
+
+
+@dataclass
+class CellStats:
+    """Statistiques d'une grille de cellules (une ligne/colonne par tranche)"""
+    x0: np.ndarray            # Début de chaque colonne de cellules
+    x1: np.ndarray            # Fin (exclue) de chaque colonne
+    y0: np.ndarray            # Début de chaque ligne de cellules
+    y1: np.ndarray            # Fin (exclue) de chaque ligne
+    edge_density: np.ndarray  # (lignes, colonnes) densité normalisée 0-1
+    mean_color: np.ndarray    # (lignes, colonnes, 3) couleur moyenne BGR (entiers)
+    
+    def to_layout(self, grid_size: int) -> "CellLayout":
+        """Aplatit la grille en cellules dans l'ordre de parcours (lignes puis colonnes)"""
+        rows, cols = self.edge_density.shape
+        return CellLayout(
+            x0=np.tile(self.x0, rows), x1=np.tile(self.x1, rows),
+            y0=np.repeat(self.y0, cols), y1=np.repeat(self.y1, cols),
+            size=np.full(rows * cols, grid_size / 2),
+            edge_density=self.edge_density.ravel(),
+            mean_color=self.mean_color.reshape(-1, 3)
+        )
+
+
+class CellStatsPyramid:
+    """
+    Statistiques de cellules pour n'importe quelle taille de grille
+    
+    Les contours et couleurs sont réduits une fois en blocs de base_cell
+    pixels, puis cumulés dans une table de sommes (image intégrale). Une
+    grille de taille multiple de base_cell se lit alors en quatre accès
+    par cellule, sans repasser sur les pixels. Les sommes sont stockées en
+    uint32 : le débordement est modulaire et les différences restent
+    exactes tant qu'une cellule fait moins de 16 millions de pixels.
+    """
+    
+    def __init__(self, edges: np.ndarray, smoothed_image: np.ndarray, base_cell: int = 1):
+        """
+        Construit la table
+        
+        Args:
+            edges: Carte de contours (non nul = contour)
+            smoothed_image: Image lissée BGR
+            base_cell: Taille des blocs de base (pixels)
+        """
+        self.height, self.width = edges.shape[:2]
+        self.base_cell = base_cell
+        by0 = np.arange(0, self.height, base_cell)
+        bx0 = np.arange(0, self.width, base_cell)
+        self.rows, self.cols = len(by0), len(bx0)
+        
+        # Canaux : contours, B, G, R
+        blocks = np.dstack([_block_sums(edges > 0, by0, bx0),
+                            _block_sums(smoothed_image, by0, bx0)]).astype(np.uint32)
+        self.table = np.zeros((self.rows + 1, self.cols + 1, 4), dtype=np.uint32)
+        np.cumsum(blocks, axis=0, out=blocks)
+        np.cumsum(blocks, axis=1, out=self.table[1:, 1:])
+    
+    def supports(self, grid_size: int) -> bool:
+        """Vrai si la grille se lit exactement dans la table"""
+        return grid_size % self.base_cell == 0
+    
+    def stats(self, grid_size: int) -> CellStats:
+        """
+        Statistiques d'une grille, identiques à analyze_cells
+        
+        Args:
+            grid_size: Taille des cellules (multiple de base_cell)
+            
+        Returns:
+            CellStats de la grille
+        """
+        if not self.supports(grid_size):
+            raise ValueError(f"Grille {grid_size}px non multiple de {self.base_cell}px")
+        step = grid_size // self.base_cell
+        r0 = np.arange(0, self.rows, step)
+        c0 = np.arange(0, self.cols, step)
+        r1 = np.minimum(r0 + step, self.rows)
+        c1 = np.minimum(c0 + step, self.cols)
+        
+        t = self.table
+        sums = (t[r1][:, c1] - t[r0][:, c1] - t[r1][:, c0] + t[r0][:, c0]).astype(np.int64)
+        
+        y0, x0 = r0 * self.base_cell, c0 * self.base_cell
+        y1 = np.minimum(y0 + grid_size, self.height)
+        x1 = np.minimum(x0 + grid_size, self.width)
+        areas = np.outer(y1 - y0, x1 - x0)
+        
+        edge_density = np.minimum(1.0, sums[:, :, 0] / areas * 3)
+        mean_color = (sums[:, :, 1:] / areas[:, :, None]).astype(int)
+        return CellStats(x0=x0, x1=x1, y0=y0, y1=y1,
+                         edge_density=edge_density, mean_color=mean_color)
+
+
+@dataclass
+class CellLayout:
+    """Cellules à dessiner, une entrée par cellule dans l'ordre de dessin"""
+    x0: np.ndarray            # Bords des cellules (pixels, fin exclue)
+    x1: np.ndarray
+    y0: np.ndarray
+    y1: np.ndarray
+    size: np.ndarray          # Rayon de la forme de chaque cellule
+    edge_density: np.ndarray  # Densité de contours normalisée 0-1
+    mean_color: np.ndarray    # (N, 3) couleur moyenne BGR (entiers)
+    
+    def __len__(self) -> int:
+        return len(self.x0)
+    
+    @property
+    def centers(self) -> np.ndarray:
+        """Centres [x, y] des cellules, array (N, 2)"""
+        return np.stack([(self.x0 + self.x1) // 2, (self.y0 + self.y1) // 2], axis=1)
+    
+    def subset(self, selection: np.ndarray) -> "CellLayout":
+        """Cellules sélectionnées (masque booléen ou indices), dans le même ordre"""
+        return CellLayout(
+            x0=self.x0[selection], x1=self.x1[selection],
+            y0=self.y0[selection], y1=self.y1[selection],
+            size=self.size[selection],
+            edge_density=self.edge_density[selection],
+            mean_color=self.mean_color[selection]
+        )
+
+
 class AdvancedShapeGenerator:
     """Génère des formes géométriques variées pour le low poly"""
     
@@ -26,80 +228,74 @@ class AdvancedShapeGenerator:
         self.width = width
         self.height = height
     
+    @staticmethod
+    def shape_template(shape_type: str, size: float, height: Optional[float] = None,
+                       sides: int = 16) -> np.ndarray:
+        """
+        Sommets d'une forme centrée sur l'origine (mis en cache)
+        
+        Args:
+            shape_type: Type de polygone (PolygonType)
+            size: Rayon de la forme (côté pour carré, largeur pour rectangle)
+            height: Hauteur du rectangle (par défaut: size)
+            sides: Nombre de côtés du cercle
+            
+        Returns:
+            Array (k, 2) float64 en lecture seule
+        """
+        return _shape_template(shape_type, float(size),
+                               None if height is None else float(height), sides)
+    
+    @staticmethod
+    def create_shapes(shape_type: str, centers: np.ndarray, size: float,
+                      height: Optional[float] = None, sides: int = 16) -> np.ndarray:
+        """
+        Crée la même forme autour de plusieurs centres en une opération
+        
+        Args:
+            shape_type: Type de polygone (PolygonType)
+            centers: Array (N, 2) de centres [x, y]
+            size: Rayon de la forme (côté pour carré, largeur pour rectangle)
+            height: Hauteur du rectangle (par défaut: size)
+            sides: Nombre de côtés du cercle
+            
+        Returns:
+            Array (N, k, 2) int32 des polygones
+        """
+        template = AdvancedShapeGenerator.shape_template(shape_type, size, height, sides)
+        centers = np.asarray(centers).reshape(-1, 1, 2)
+        return (centers + template).astype(np.int32)
+    
     @staticmethod
     def create_triangle(center: tuple, size: float) -> np.ndarray:
         """Crée un triangle équilatéral"""
-        cx, cy = center
-        angles = np.array([90, 210, 330]) * np.pi / 180
-        points = []
-        for angle in angles:
-            x = cx + size * np.cos(angle)
-            y = cy + size * np.sin(angle)
-            points.append([x, y])
-        return np.array(points, dtype=np.int32)
+        return AdvancedShapeGenerator.create_shapes(PolygonType.TRIANGLE, [center], size)[0]
     
     @staticmethod
     def create_square(center: tuple, size: float) -> np.ndarray:
         """Crée un carré"""
-        cx, cy = center
-        half_size = size / 2
-        points = [
-            [cx - half_size, cy - half_size],
-            [cx + half_size, cy - half_size],
-            [cx + half_size, cy + half_size],
-            [cx - half_size, cy + half_size]
-        ]
-        return np.array(points, dtype=np.int32)
+        return AdvancedShapeGenerator.create_shapes(PolygonType.SQUARE, [center], size)[0]
     
     @staticmethod
     def create_rectangle(center: tuple, width: float, height: float) -> np.ndarray:
         """Crée un rectangle"""
-        cx, cy = center
-        half_w = width / 2
-        half_h = height / 2
-        points = [
-            [cx - half_w, cy - half_h],
-            [cx + half_w, cy - half_h],
-            [cx + half_w, cy + half_h],
-            [cx - half_w, cy + half_h]
-        ]
-        return np.array(points, dtype=np.int32)
+        return AdvancedShapeGenerator.create_shapes(PolygonType.RECTANGLE, [center], width, height)[0]
     
     @staticmethod
     def create_circle(center: tuple, radius: float, sides: int = 16) -> np.ndarray:
         """Crée un cercle (polygone régulier)"""
-        cx, cy = center
-        points = []
-        for i in range(sides):
-            angle = 2 * np.pi * i / sides
-            x = cx + radius * np.cos(angle)
-            y = cy + radius * np.sin(angle)
-            points.append([x, y])
-        return np.array(points, dtype=np.int32)
+        return AdvancedShapeGenerator.create_shapes(PolygonType.CIRCLE, [center], radius,
+                                                    sides=sides)[0]
     
     @staticmethod
     def create_hexagon(center: tuple, size: float) -> np.ndarray:
         """Crée un hexagone régulier"""
-        cx, cy = center
-        points = []
-        for i in range(6):
-            angle = (i * 60 + 30) * np.pi / 180
-            x = cx + size * np.cos(angle)
-            y = cy + size * np.sin(angle)
-            points.append([x, y])
-        return np.array(points, dtype=np.int32)
+        return AdvancedShapeGenerator.create_shapes(PolygonType.HEXAGON, [center], size)[0]
     
     @staticmethod
     def create_pentagon(center: tuple, size: float) -> np.ndarray:
         """Crée un pentagone régulier"""
-        cx, cy = center
-        points = []
-        for i in range(5):
-            angle = (i * 72 - 90) * np.pi / 180
-            x = cx + size * np.cos(angle)
-            y = cy + size * np.sin(angle)
-            points.append([x, y])
-        return np.array(points, dtype=np.int32)
+        return AdvancedShapeGenerator.create_shapes(PolygonType.PENTAGON, [center], size)[0]
     
     @staticmethod
     def choose_best_shape(edge_density: float) -> str:
@@ -122,6 +318,19 @@ class AdvancedShapeGenerator:
             return PolygonType.PENTAGON
         else:
             return PolygonType.TRIANGLE  # Zones avec beaucoup de contours
+    
+    @staticmethod
+    def choose_best_shapes(edge_density: np.ndarray) -> np.ndarray:
+        """
+        Version vectorisée de choose_best_shape
+        
+        Args:
+            edge_density: Tableau de densités de contours (0-1)
+            
+        Returns:
+            Indices dans SHAPES_BY_DENSITY, de même forme que edge_density
+        """
+        return np.searchsorted(SHAPE_DENSITY_THRESHOLDS, edge_density, side="right")
 
 
 class HybridLowPolyGenerator:
@@ -130,27 +339,165 @@ class HybridLowPolyGenerator:
     pour des résultats optimisés selon les zones de l'image
     """
     
-    def __init__(self, image_path: str, enable_shape_mixing: bool = True):
+    def __init__(self, image_path: str, enable_shape_mixing: bool = True,
+                 max_megapixels: Optional[float] = None,
+                 buffer_pool: Optional[BufferPool] = None,
+                 image: Optional[np.ndarray] = None,
+                 edges: Optional[np.ndarray] = None,
+                 analysis: Optional[ImageAnalysis] = None):
         """
         Initialise le générateur hybride
         
         Args:
             image_path: Chemin vers l'image
             enable_shape_mixing: Si True, mélange les formes, sinon seulement triangles
+            max_megapixels: Taille maximale de travail en mégapixels (None = pleine résolution)
+            buffer_pool: Pool de buffers réutilisés entre images (mode mémoire réduite)
+            image: Image BGR déjà décodée (si fournie, image_path n'est pas relu)
+            edges: Carte de contours déjà calculée (partagée avec un autre moteur)
+            analysis: Analyse partagée avec d'autres moteurs (fournit aussi l'image)
         """
-        self.image = cv2.imread(image_path)
-        self.image_rgb = cv2.cvtColor(self.image, cv2.COLOR_BGR2RGB)
+        if image is None and analysis is not None:
+            image = analysis.image
+        self.image = image if image is not None else load_image(image_path, max_megapixels)
+        if self.image is None:
+            raise ValueError(f"Impossible de charger l'image: {image_path}")
+        self.analysis = analysis if analysis is not None else ImageAnalysis(self.image, buffer_pool)
+        self.image_path = image_path
         self.height, self.width = self.image.shape[:2]
         self.enable_shape_mixing = enable_shape_mixing
+        self.buffer_pool = buffer_pool
         self.shape_gen = AdvancedShapeGenerator(self.width, self.height)
+        self._edges: Optional[np.ndarray] = edges
+        self.last_layout: Optional[CellLayout] = None
+        self.shapes_used: Dict[str, int] = {}
+        self.primitives: Dict[str, int] = {}
+        self._pyramid: Optional[CellStatsPyramid] = None
+        self._pyramid_source: Optional[np.ndarray] = None
+        self._last_grid: Optional[Tuple[int, int]] = None  # (id de l'image lissée, grille)
+    
+    @property
+    def image_rgb(self) -> np.ndarray:
+        """Image en RGB (calculée à la demande, non conservée)"""
+        return cv2.cvtColor(self.image, cv2.COLOR_BGR2RGB)
     
     def detect_edges(self) -> np.ndarray:
-        """Détecte les contours"""
-        gray = cv2.cvtColor(self.image, cv2.COLOR_BGR2GRAY)
-        clahe = cv2.createCLAHE(clipLimit=2.0, tileGridSize=(8, 8))
-        gray_enhanced = clahe.apply(gray)
-        edges = cv2.Canny(gray_enhanced, 50, 150)
-        return edges
+        """Détecte les contours (CLAHE + Canny 50/150 de l'analyse partagée)"""
+        return self.analysis.edges(50, 150)
+    
+    def edge_map(self) -> np.ndarray:
+        """Carte de contours, calculée une seule fois par image"""
+        if self._edges is None:
+            self._edges = self.detect_edges()
+        return self._edges
+    
+    def analyze_cells(self, grid_size: int, smoothed_image: np.ndarray) -> CellStats:
+        """
+        Calcule densité de contours et couleur moyenne de toutes les cellules
+        
+        Une seule réduction par blocs (np.add.reduceat) sur les lignes puis
+        les colonnes, au lieu d'un masque plein cadre par cellule. Les
+        cellules du bord droit/bas sont tronquées comme dans la grille.
+        
+        Args:
+            grid_size: Taille des cellules (pixels)
+            smoothed_image: Image lissée BGR pour les couleurs
+            
+        Returns:
+            CellStats de la grille
+        """
+        y0 = np.arange(0, self.height, grid_size)
+        x0 = np.arange(0, self.width, grid_size)
+        y1 = np.minimum(y0 + grid_size, self.height)
+        x1 = np.minimum(x0 + grid_size, self.width)
+        areas = np.outer(y1 - y0, x1 - x0)
+        
+        edge_counts = _block_sums(self.edge_map() > 0, y0, x0)
+        edge_density = np.minimum(1.0, edge_counts / areas * 3)  # Normaliser
+        
+        color_sums = _block_sums(smoothed_image, y0, x0)
+        mean_color = (color_sums / areas[:, :, None]).astype(int)
+        
+        return CellStats(x0=x0, x1=x1, y0=y0, y1=y1,
+                         edge_density=edge_density, mean_color=mean_color)
+    
+    def quadtree_layout(self, smoothed_image: np.ndarray, min_cell: int, levels: int = 3,
+                        edge_threshold: float = 0.2, color_threshold: float = 12.0) -> CellLayout:
+        """
+        Découpe adaptative en quadtree
+        
+        Les cellules partent de min_cell * 2**levels pixels et sont divisées
+        en quatre tant que leur densité de contours atteint edge_threshold ou
+        que l'écart-type de leur luminance dépasse color_threshold, jusqu'à
+        min_cell. Les statistiques sont réduites une fois en blocs de
+        min_cell pixels, puis chaque niveau les lit dans une table de sommes
+        cumulées (image intégrale) des blocs.
+        
+        Args:
+            smoothed_image: Image lissée BGR
+            min_cell: Taille minimale des cellules (pixels)
+            levels: Nombre de subdivisions possibles
+            edge_threshold: Densité de contours (0-1) à partir de laquelle on divise
+            color_threshold: Écart-type de luminance au-delà duquel on divise
+            
+        Returns:
+            CellLayout des feuilles, dans l'ordre de parcours
+        """
+        by0 = np.arange(0, self.height, min_cell)
+        bx0 = np.arange(0, self.width, min_cell)
+        rows, cols = len(by0), len(bx0)
+        
+        gray = cv2.cvtColor(smoothed_image, cv2.COLOR_BGR2GRAY)
+        ones = np.ones((self.height, self.width), dtype=np.uint8)
+        # Canaux : aire, contours, somme et somme des carrés de luminance, B, G, R
+        blocks = np.dstack([
+            _block_sums(ones, by0, bx0),
+            _block_sums(self.edge_map() > 0, by0, bx0),
+            _block_sums(gray, by0, bx0),
+            _block_sums(gray.astype(np.uint16) ** 2, by0, bx0),
+            _block_sums(smoothed_image, by0, bx0),
+        ])
+        table = np.zeros((rows + 1, cols + 1, blocks.shape[2]), dtype=np.int64)
+        table[1:, 1:] = blocks.cumsum(axis=0).cumsum(axis=1)
+        
+        span = 2 ** levels
+        r0, c0 = [g.ravel() for g in np.meshgrid(np.arange(0, rows, span),
+                                                 np.arange(0, cols, span), indexing="ij")]
+        leaves = []
+        while len(r0):
+            r1 = np.minimum(r0 + span, rows)
+            c1 = np.minimum(c0 + span, cols)
+            stats = table[r1, c1] - table[r0, c1] - table[r1, c0] + table[r0, c0]
+            area = stats[:, 0].astype(np.float64)
+            density = np.minimum(1.0, stats[:, 1] / area * 3)
+            mean_gray = stats[:, 2] / area
+            std_gray = np.sqrt(np.maximum(stats[:, 3] / area - mean_gray ** 2, 0))
+            
+            split = (density >= edge_threshold) | (std_gray > color_threshold)
+            if span == 1:
+                split[:] = False
+            leaf = ~split
+            leaves.append((r0[leaf], c0[leaf], r1[leaf], c1[leaf], np.full(leaf.sum(), span),
+                           density[leaf], stats[leaf, 4:] / area[leaf, None]))
+            
+            # Quatre enfants par cellule divisée (ceux qui sortent de l'image sont ignorés)
+            span //= 2
+            r0, c0 = r0[split], c0[split]
+            r0, c0 = (np.concatenate([r0, r0, r0 + span, r0 + span]),
+                      np.concatenate([c0, c0 + span, c0, c0 + span]))
+            inside = (r0 < rows) & (c0 < cols)
+            r0, c0 = r0[inside], c0[inside]
+        
+        r0, c0, r1, c1, spans, density, colors = [np.concatenate(parts) for parts in zip(*leaves)]
+        y0, x0 = r0 * min_cell, c0 * min_cell
+        order = np.lexsort((x0, y0))
+        return CellLayout(
+            x0=x0[order], x1=np.minimum(c1 * min_cell, self.width)[order],
+            y0=y0[order], y1=np.minimum(r1 * min_cell, self.height)[order],
+            size=(spans * min_cell / 2)[order],
+            edge_density=density[order],
+            mean_color=colors[order].astype(int)
+        )
     
     def analyze_region_edges(self, region_mask: np.ndarray) -> float:
         """
@@ -162,7 +509,7 @@ class HybridLowPolyGenerator:
         Returns:
             Densité de contours (0-1)
         """
-        edges = self.detect_edges()
+        edges = self.edge_map()
         region_edges = edges[region_mask > 0]
         
         if len(region_edges) == 0:
@@ -176,23 +523,226 @@ class HybridLowPolyGenerator:
         edge_density = self.analyze_region_edges(region_mask)
         return self.shape_gen.choose_best_shape(edge_density)
     
-    def generate_hybrid(self, grid_size: int = 30, smoothed_image: np.ndarray = None) -> Image.Image:
+    def build_cell_polygons(self, centers: np.ndarray, sizes, shape_indices: np.ndarray) -> List[np.ndarray]:
+        """
+        Construit les polygones de toutes les cellules
+        
+        Les cellules sont regroupées par (forme, taille) : chaque groupe est
+        obtenu en translatant un gabarit en une seule opération NumPy.
+        
+        Args:
+            centers: Array (N, 2) des centres [x, y]
+            sizes: Rayon des formes (scalaire ou array (N,))
+            shape_indices: Indices dans SHAPES_BY_DENSITY, array (N,)
+            
+        Returns:
+            Liste de N polygones int32, dans l'ordre des cellules
+        """
+        sizes = np.broadcast_to(np.asarray(sizes, dtype=np.float64), (len(centers),))
+        polygons: List[Optional[np.ndarray]] = [None] * len(centers)
+        groups = np.stack([shape_indices.astype(np.float64), sizes], axis=1)
+        for shape_index, size in np.unique(groups, axis=0):
+            members = np.flatnonzero((shape_indices == shape_index) & (sizes == size))
+            shape_type = SHAPES_BY_DENSITY[int(shape_index)]
+            if shape_type == PolygonType.RECTANGLE:
+                group = self.shape_gen.create_shapes(shape_type, centers[members], size, size * 0.7)
+            elif shape_type == PolygonType.PENTAGON:
+                # Les cellules « pentagone » ont toujours été dessinées en cercle
+                group = self.shape_gen.create_shapes(PolygonType.CIRCLE, centers[members], size)
+            else:
+                group = self.shape_gen.create_shapes(shape_type, centers[members], size)
+            for member, polygon in zip(members.tolist(), group):
+                polygons[member] = polygon
+        return polygons
+    
+    @staticmethod
+    def draw_polygons(output: np.ndarray, polygons: List[np.ndarray], colors: np.ndarray,
+                      outline_color: tuple = (0, 0, 0), outline_thickness: int = 1):
+        """
+        Remplit les polygones dans l'ordre puis trace tous les contours
+        
+        Le remplissage reste un appel par polygone (couleurs différentes) ;
+        les contours, tous de la même couleur, sont tracés en un seul appel
+        polylines par-dessus l'ensemble des remplissages.
+        
+        Args:
+            output: Image BGR de destination
+            polygons: Liste de polygones int32
+            colors: Array (N, 3) des couleurs BGR
+            outline_color: Couleur des contours
+            outline_thickness: Épaisseur des contours (0 = pas de contours)
+        """
+        for polygon, color in zip(polygons, colors.tolist()):
+            cv2.fillPoly(output, [polygon], color)
+        if outline_thickness > 0 and polygons:
+            cv2.polylines(output, polygons, True, outline_color, outline_thickness)
+    
+    def shape_indices_for(self, layout: CellLayout) -> np.ndarray:
+        """Indices de forme (dans SHAPES_BY_DENSITY) de chaque cellule"""
+        if self.enable_shape_mixing:
+            return self.shape_gen.choose_best_shapes(layout.edge_density)
+        return np.full(len(layout), SHAPES_BY_DENSITY.index(PolygonType.TRIANGLE))
+    
+    def render_layout(self, output: np.ndarray, layout: CellLayout, shape_indices: np.ndarray,
+                      workers: int = 1, backend: str = "thread") -> Dict[str, int]:
+        """
+        Dessine une forme par cellule, centrée dans la cellule
+        
+        Avec workers > 1, l'image est découpée en bandes horizontales rendues
+        en parallèle, chacune dans sa propre tranche de output. Une bande
+        redessine aussi les formes voisines qui débordent sur ses lignes,
+        dans le même ordre, sur un tampon assez haut pour qu'aucune de ces
+        formes ne soit découpée : le résultat est identique au rendu
+        séquentiel.
+        
+        Args:
+            output: Image BGR de destination
+            layout: Cellules à dessiner
+            shape_indices: Indices de forme de chaque cellule
+            workers: Nombre de bandes traitées en parallèle (1 = séquentiel)
+            backend: "thread" ou "process"
+            
+        Returns:
+            Nombre de cellules par type de forme (fusionné sur les bandes)
+        """
+        polygons = self.build_cell_polygons(layout.centers, layout.size, shape_indices)
+        if workers <= 1 or len(layout) == 0:
+            self.draw_polygons(output, polygons, layout.mean_color)
+            return _count_shapes(shape_indices)
+        
+        # Étendue verticale de chaque forme (contour compris)
+        centers_y = layout.centers[:, 1]
+        reach = np.ceil(layout.size).astype(int) + 2
+        shape_top, shape_bottom = centers_y - reach, centers_y + reach
+        halo = 2 * int(reach.max())
+        
+        # Plusieurs bandes par worker pour équilibrer la charge
+        num_bands = min(workers * 4, self.height)
+        edges = np.linspace(0, self.height, num_bands + 1).astype(int)
+        tasks = []
+        for band_y0, band_y1 in zip(edges[:-1].tolist(), edges[1:].tolist()):
+            if band_y1 <= band_y0:
+                continue
+            members = np.flatnonzero((shape_bottom >= band_y0) & (shape_top < band_y1))
+            owned = (layout.y0 >= band_y0) & (layout.y0 < band_y1)
+            tasks.append((band_y0, band_y1, max(0, band_y0 - halo), min(self.height, band_y1 + halo),
+                          self.width, [polygons[i] for i in members.tolist()],
+                          layout.mean_color[members], shape_indices[owned]))
+        
+        executor_class = ProcessPoolExecutor if backend == "process" else ThreadPoolExecutor
+        shapes_used: Dict[str, int] = {}
+        with executor_class(max_workers=workers) as executor:
+            for band_y0, band_y1, pixels, counts in executor.map(_render_band, tasks):
+                output[band_y0:band_y1] = pixels
+                for shape_type, count in counts.items():
+                    shapes_used[shape_type] = shapes_used.get(shape_type, 0) + count
+        return shapes_used
+    
+    def smoothed_image(self) -> np.ndarray:
+        """Image lissée utilisée par défaut pour les couleurs (calculée une fois)"""
+        return self.analysis.blurred(15)
+    
+    def stats_pyramid(self, smoothed_image: np.ndarray = None,
+                      max_base_cells: int = 4_000_000) -> CellStatsPyramid:
+        """
+        Table de statistiques multi-grilles (mise en cache par image lissée)
+        
+        Les blocs de base font 1 pixel tant que l'image compte moins de
+        max_base_cells pixels ; au-delà ils grossissent pour borner la
+        mémoire, et seules les grilles multiples de cette taille s'y lisent.
+        
+        Args:
+            smoothed_image: Image lissée BGR (par défaut: smoothed_image())
+            max_base_cells: Nombre maximal de blocs de base
+            
+        Returns:
+            CellStatsPyramid
+        """
+        if smoothed_image is None:
+            smoothed_image = self.smoothed_image()
+        if self._pyramid is None or self._pyramid_source is not smoothed_image:
+            base_cell = max(1, math.ceil(math.sqrt(self.width * self.height / max_base_cells)))
+            self._pyramid = CellStatsPyramid(self.edge_map(), smoothed_image, base_cell)
+            self._pyramid_source = smoothed_image
+        return self._pyramid
+    
+    def cell_stats(self, grid_size: int, smoothed_image: np.ndarray) -> CellStats:
+        """
+        Statistiques de grille, lues dans la table multi-grilles si possible
+        
+        La table est construite dès qu'une deuxième taille de grille est
+        demandée pour la même image lissée (curseur de la GUI, comparaisons) ;
+        un rendu unique garde la réduction directe, moins coûteuse.
+        
+        Args:
+            grid_size: Taille des cellules (pixels)
+            smoothed_image: Image lissée BGR
+            
+        Returns:
+            CellStats de la grille
+        """
+        key = (id(smoothed_image), grid_size)
+        sweeping = self._last_grid is not None and self._last_grid[0] == key[0] and self._last_grid != key
+        self._last_grid = key
+        
+        if sweeping or self._pyramid_source is smoothed_image:
+            pyramid = self.stats_pyramid(smoothed_image)
+            if pyramid.supports(grid_size):
+                return pyramid.stats(grid_size)
+        return self.analyze_cells(grid_size, smoothed_image)
+    
+    def cell_layout(self, grid_size: int, smoothed_image: np.ndarray, adaptive: bool = False,
+                    adaptive_levels: int = 3) -> CellLayout:
+        """
+        Cellules à dessiner : grille fixe ou quadtree adaptatif
+        
+        Args:
+            grid_size: Taille des cellules (taille minimale en mode adaptatif)
+            smoothed_image: Image lissée BGR
+            adaptive: Si True, découpe en quadtree
+            adaptive_levels: Subdivisions possibles (cellules jusqu'à grid_size * 2**levels)
+            
+        Returns:
+            CellLayout
+        """
+        if adaptive:
+            return self.quadtree_layout(smoothed_image, grid_size, levels=adaptive_levels)
+        return self.cell_stats(grid_size, smoothed_image).to_layout(grid_size)
+    
+    def generate_hybrid(self, grid_size: int = 30, smoothed_image: np.ndarray = None,
+                        adaptive: bool = False, adaptive_levels: int = 3,
+                        workers: int = 1, backend: str = "thread") -> Image.Image:
         """
         Génère une image low poly avec formes géométriques mixtes
         
         Args:
             grid_size: Taille des cellules de grille (pixels)
             smoothed_image: Image pré-lissée (optionnel)
+            adaptive: Si True, les zones plates reçoivent de grandes cellules
+                      (quadtree) et grid_size devient la taille minimale
+            adaptive_levels: Subdivisions possibles en mode adaptatif
+            workers: Bandes horizontales rendues en parallèle (1 = séquentiel)
+            backend: Pool utilisé pour les bandes ("thread" ou "process")
             
         Returns:
             Image PIL
         """
+        pool = self.buffer_pool
         if smoothed_image is None:
-            smoothed_image = cv2.GaussianBlur(self.image, (15, 15), 0)
+            smoothed_image = self.smoothed_image()
+        
+        if pool is not None:
+            output = pool.zeros("output", smoothed_image.shape)
+        else:
+            output = np.zeros_like(smoothed_image)
         
-        output = np.zeros_like(smoothed_image)
+        # Statistiques de toutes les cellules en une passe
+        layout = self.cell_layout(grid_size, smoothed_image, adaptive, adaptive_levels)
+        
+        # Choix de forme vectorisé (indices dans SHAPES_BY_DENSITY)
+        shape_indices = self.shape_indices_for(layout)
+        self.last_layout = layout
         
-        # Parcourir l'image par grille
         shapes_used = {
             PolygonType.TRIANGLE: 0,
             PolygonType.SQUARE: 0,
@@ -201,55 +751,15 @@ class HybridLowPolyGenerator:
             PolygonType.PENTAGON: 0,
             PolygonType.CIRCLE: 0,
         }
-        
-        for y in range(0, self.height, grid_size):
-            for x in range(0, self.width, grid_size):
-                # Définir les limites de la cellule
-                x_end = min(x + grid_size, self.width)
-                y_end = min(y + grid_size, self.height)
-                
-                # Créer un masque de la région
-                region_mask = np.zeros((self.height, self.width), dtype=np.uint8)
-                region_mask[y:y_end, x:x_end] = 255
-                
-                # Déterminer la meilleure forme
-                if self.enable_shape_mixing:
-                    shape_type = self.get_best_shape_for_region(region_mask)
-                else:
-                    shape_type = PolygonType.TRIANGLE
-                
-                shapes_used[shape_type] += 1
-                
-                # Calculer couleur moyenne de la région
-                region_colors = smoothed_image[y:y_end, x:x_end]
-                if len(region_colors) > 0:
-                    mean_color = np.mean(region_colors.reshape(-1, 3), axis=0).astype(int)
-                else:
-                    mean_color = [128, 128, 128]
-                
-                mean_color = tuple(int(c) for c in mean_color)
-                
-                # Créer la forme
-                center = ((x + x_end) // 2, (y + y_end) // 2)
-                size = grid_size / 2
-                
-                if shape_type == PolygonType.TRIANGLE:
-                    polygon = self.shape_gen.create_triangle(center, size)
-                elif shape_type == PolygonType.SQUARE:
-                    polygon = self.shape_gen.create_square(center, size)
-                elif shape_type == PolygonType.RECTANGLE:
-                    polygon = self.shape_gen.create_rectangle(center, size, size * 0.7)
-                elif shape_type == PolygonType.HEXAGON:
-                    polygon = self.shape_gen.create_hexagon(center, size)
-                else:  # CIRCLE
-                    polygon = self.shape_gen.create_circle(center, size)
-                
-                # Dessiner la forme
-                cv2.drawContours(output, [polygon], 0, mean_color, -1)
-                cv2.drawContours(output, [polygon], 0, (0, 0, 0), 1)
+        band_counts = self.render_layout(output, layout, shape_indices,
+                                         workers=workers, backend=backend)
+        for shape_type, count in band_counts.items():
+            shapes_used[shape_type] += count
+        self.shapes_used = shapes_used
         
         # Rapport des formes utilisées
         total_shapes = sum(shapes_used.values())
+        self.primitives = {"cellules": total_shapes}
         if total_shapes > 0:
             print("\n📊 Formes géométriques utilisées:")
             for shape_type, count in sorted(shapes_used.items()):
@@ -257,8 +767,42 @@ class HybridLowPolyGenerator:
                     percentage = (count / total_shapes) * 100
                     print(f"  {shape_type:12} : {count:4} cellules ({percentage:5.1f}%)")
         
-        output_rgb = cv2.cvtColor(output, cv2.COLOR_BGR2RGB)
+        output_rgb = cv2.cvtColor(output, cv2.COLOR_BGR2RGB, dst=output)
         return Image.fromarray(output_rgb)
+    
+    def export_svg(self, output_path: str, grid_size: int = 30,
+                   smoothed_image: np.ndarray = None, adaptive: bool = False,
+                   adaptive_levels: int = 3, add_outlines: bool = True) -> int:
+        """
+        Exporte le rendu hybride en SVG vectoriel
+        
+        Mêmes cellules, formes et couleurs que generate_hybrid, écrites
+        au fil de l'eau : le document se redimensionne sans nouveau rendu.
+        
+        Args:
+            output_path: Chemin du fichier SVG
+            grid_size: Taille des cellules de grille (pixels)
+            smoothed_image: Image pré-lissée (optionnel)
+            adaptive: Cellules adaptatives (quadtree)
+            adaptive_levels: Subdivisions possibles en mode adaptatif
+            add_outlines: Contours noirs autour des formes
+            
+        Returns:
+            Nombre de formes écrites
+        """
+        if smoothed_image is None:
+            smoothed_image = self.smoothed_image()
+        
+        layout = self.cell_layout(grid_size, smoothed_image, adaptive, adaptive_levels)
+        shape_indices = self.shape_indices_for(layout)
+        self.last_layout = layout
+        polygons = self.build_cell_polygons(layout.centers, layout.size, shape_indices)
+        
+        outline = (0, 0, 0) if add_outlines else None
+        with SVGStreamWriter(output_path, self.width, self.height, outline=outline,
+                             linejoin="round") as writer:
+            writer.add_polygons(polygons, layout.mean_color)
+        return writer.count
 
 
 def test_hybrid_generation():
@@ -0,0 +1,143 @@
+"""
+Analyse partagée d'une image - Niveaux de gris, CLAHE, contours et flous
+calculés une fois et réutilisés par tous les moteurs
+"""
+import threading
+from typing import Any, Callable, Dict, Hashable, Optional
+
+import cv2
+import numpy as np
+
+from src.buffer_pool import BufferPool, pool_get
+
+
+class ImageAnalysis:
+    """
+    Cache paresseux des étapes d'analyse d'une image décodée
+
+    Chaque résultat est calculé à la première demande puis conservé :
+    un changement de mode dans la GUI, ou un moteur qui en combine
+    plusieurs, n'analyse l'image qu'une fois. Les tableaux renvoyés sont
+    partagés et ne doivent pas être modifiés en place.
+
+    Les étapes parallèles du pipeline peuvent l'interroger en même temps :
+    deux demandes du même résultat attendent un seul calcul, deux
+    résultats différents se calculent en parallèle.
+    """
+
+    def __init__(self, image: np.ndarray, buffer_pool: Optional[BufferPool] = None):
+        """
+        Initialise l'analyse
+
+        Args:
+            image: Image BGR décodée
+            buffer_pool: Pool de buffers (les résultats sont alors valides
+                         jusqu'à l'analyse d'une autre image de même taille)
+        """
+        self.image = image
+        self.height, self.width = image.shape[:2]
+        self.buffer_pool = buffer_pool
+        self._cache: Dict[Hashable, Any] = {}
+        self._key_locks: Dict[Hashable, threading.Lock] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _cached(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """Résultat en cache, ou calculé une seule fois même en concurrence"""
+        with self._lock:
+            if key in self._cache:
+                self.hits += 1
+                return self._cache[key]
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+        with key_lock:
+            with self._lock:
+                if key in self._cache:
+                    self.hits += 1
+                    return self._cache[key]
+            value = compute()
+            with self._lock:
+                self._cache[key] = value
+                self.misses += 1
+            return value
+
+    def _buffer(self, name: str, channels: int = 1) -> Optional[np.ndarray]:
+        """Buffer du pool à la taille de l'image (None sans pool)"""
+        shape = (self.height, self.width) if channels == 1 else (self.height, self.width, channels)
+        return pool_get(self.buffer_pool, name, shape)
+
+    def gray(self) -> np.ndarray:
+        """Image en niveaux de gris"""
+        return self._cached("gray", lambda: cv2.cvtColor(
+            self.image, cv2.COLOR_BGR2GRAY, dst=self._buffer("gray")))
+
+    def clahe(self) -> np.ndarray:
+        """Niveaux de gris égalisés localement (CLAHE)"""
+        def compute():
+            clahe = cv2.createCLAHE(clipLimit=2.0, tileGridSize=(8, 8))
+            return clahe.apply(self.gray(), dst=self._buffer("gray_enhanced"))
+        return self._cached("clahe", compute)
+
+    def edges(self, low_threshold: int, high_threshold: int, dilate: bool = False,
+              equalize: bool = True) -> np.ndarray:
+        """
+        Carte de contours Canny
+
+        Args:
+            low_threshold: Seuil bas de Canny
+            high_threshold: Seuil haut de Canny
+            dilate: Épaissit légèrement les contours (noyau elliptique 2x2)
+            equalize: Canny sur l'image CLAHE (sinon directement sur les niveaux de gris)
+
+        Returns:
+            Carte de contours (0 ou 255)
+        """
+        name = (f"edges_{low_threshold}_{high_threshold}" + ("_dilated" if dilate else "")
+                + ("" if equalize else "_raw"))
+
+        def compute():
+            source = self.clahe() if equalize else self.gray()
+            edges = cv2.Canny(source, low_threshold, high_threshold,
+                              edges=self._buffer("canny" if dilate else name))
+            if dilate:
+                kernel = cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (2, 2))
+                edges = cv2.dilate(edges, kernel, dst=self._buffer(name), iterations=1)
+            return edges
+        return self._cached(("edges", low_threshold, high_threshold, dilate, equalize), compute)
+
+    def gradient_edges(self, threshold: int) -> np.ndarray:
+        """
+        Contours par seuil sur la norme L1 du gradient de Sobel
+
+        Sans CLAHE ni suppression des non-maxima : les contours sont plus
+        épais qu'avec Canny, mais le calcul se limite à deux filtres 3x3.
+
+        Args:
+            threshold: Seuil sur |gx| + |gy| (saturé à 255)
+
+        Returns:
+            Carte de contours (0 ou 255)
+        """
+        def compute():
+            gray = self.gray()
+            grad_x = cv2.convertScaleAbs(cv2.Sobel(gray, cv2.CV_16S, 1, 0))
+            grad_y = cv2.convertScaleAbs(cv2.Sobel(gray, cv2.CV_16S, 0, 1))
+            magnitude = cv2.add(grad_x, grad_y, dst=grad_x)
+            _, edges = cv2.threshold(magnitude, threshold - 1, 255, cv2.THRESH_BINARY,
+                                     dst=self._buffer(f"gradient_{threshold}"))
+            return edges
+        return self._cached(("gradient", threshold), compute)
+
+    def blurred(self, kernel_size: int) -> np.ndarray:
+        """
+        Flou gaussien de l'image BGR
+
+        Args:
+            kernel_size: Taille (impaire) du noyau
+
+        Returns:
+            Image floutée BGR
+        """
+        return self._cached(("blur", kernel_size), lambda: cv2.GaussianBlur(
+            self.image, (kernel_size, kernel_size), 0,
+            dst=self._buffer(f"blur_{kernel_size}", 3)))
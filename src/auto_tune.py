@@ -0,0 +1,255 @@
+"""
+Auto-réglage des paramètres - Recherche points / flou / sensibilité
+pour atteindre une qualité cible ou respecter un budget de temps
+"""
+import itertools
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import cv2
+import numpy as np
+
+from src.analysis import ImageAnalysis
+from src.low_poly import LowPolyGenerator, load_image, read_image_size
+from src.preset_manager import Preset, PresetManager, get_preset_manager
+
+
+@dataclass
+class TuneTrial:
+    """Résultat de l'évaluation d'une configuration sur le proxy"""
+    points: int
+    blur_strength: int
+    edge_sensitivity: int
+    quality: float          # PSNR (dB) du rendu par rapport au proxy
+    proxy_time: float       # Temps de rendu sur le proxy (s)
+    estimated_time: float   # Temps extrapolé à la pleine résolution (s)
+
+
+@dataclass
+class TuneResult:
+    """Résultat de l'auto-réglage"""
+    best: TuneTrial
+    trials: List[TuneTrial] = field(default_factory=list)
+    target_met: bool = True
+    proxy_size: Tuple[int, int] = (0, 0)
+    full_size: Tuple[int, int] = (0, 0)
+
+
+class AutoTuner:
+    """
+    Cherche les paramètres classiques (points, flou, sensibilité) qui
+    atteignent une qualité cible ou tiennent dans un budget de temps
+
+    Chaque candidat est rendu sur un proxy réduit de l'image. Tous les
+    essais partagent une ImageAnalysis du proxy : niveaux de gris, CLAHE,
+    flous et cartes de contours ne sont calculés qu'une fois par valeur ;
+    l'amélioration des couleurs est mise en cache par valeur de flou.
+    """
+
+    DEFAULT_POINTS = (500, 800, 1000, 1400, 1800)
+    DEFAULT_BLURS = (12, 18, 25)
+    DEFAULT_SENSITIVITIES = (1, 2, 3)
+
+    def __init__(self, image_path: str, proxy_megapixels: float = 0.15,
+                 enhance_colors: bool = True, seed: int = 0):
+        """
+        Initialise l'auto-réglage
+
+        Args:
+            image_path: Chemin vers l'image de référence
+            proxy_megapixels: Taille du proxy d'évaluation en mégapixels
+            enhance_colors: Amélioration des couleurs pendant l'évaluation
+            seed: Graine aléatoire pour des essais comparables entre eux
+        """
+        # Le proxy est décodé directement à échelle réduite quand c'est possible
+        self.proxy = load_image(image_path, proxy_megapixels)
+        if self.proxy is None:
+            raise ValueError(f"Impossible de charger l'image: {image_path}")
+
+        self.image_path = image_path
+        self.enhance_colors = enhance_colors
+        self.seed = seed
+        self.proxy_height, self.proxy_width = self.proxy.shape[:2]
+        self.analysis = ImageAnalysis(self.proxy)
+        self.full_width, self.full_height = (read_image_size(image_path)
+                                             or (self.proxy_width, self.proxy_height))
+        self.area_ratio = (self.full_width * self.full_height) / (self.proxy_width * self.proxy_height)
+
+        # Référence de qualité : le proxy avec la même amélioration des couleurs
+        # que le rendu, pour ne pas pénaliser la saturation voulue
+        self.reference = self.proxy
+        if enhance_colors:
+            reference_rgb = self._generator(1, 1, 1).enhance_color_image(
+                cv2.cvtColor(self.proxy, cv2.COLOR_BGR2RGB))
+            self.reference = cv2.cvtColor(reference_rgb, cv2.COLOR_RGB2BGR)
+
+        # Flous améliorés réutilisés entre les essais
+        self._smoothed_cache: Dict[int, np.ndarray] = {}
+
+    def _generator(self, points: int, blur: int, sensitivity: int) -> LowPolyGenerator:
+        """Crée un générateur travaillant sur le proxy"""
+        return LowPolyGenerator(
+            self.image_path,
+            num_points=points,
+            blur_strength=blur,
+            enhance_colors=self.enhance_colors,
+            edge_sensitivity=sensitivity,
+            analysis=self.analysis
+        )
+
+    def _smoothed(self, generator: LowPolyGenerator) -> np.ndarray:
+        """Image lissée (et améliorée) du proxy, mise en cache par force de flou"""
+        key = generator.blur_strength
+        if key not in self._smoothed_cache:
+            smoothed = generator.smooth_image()
+            if self.enhance_colors:
+                smoothed_rgb = cv2.cvtColor(smoothed, cv2.COLOR_BGR2RGB)
+                smoothed_rgb = generator.enhance_color_image(smoothed_rgb)
+                smoothed = cv2.cvtColor(smoothed_rgb, cv2.COLOR_RGB2BGR)
+            self._smoothed_cache[key] = smoothed
+        return self._smoothed_cache[key]
+
+    def evaluate(self, points: int, blur: int, sensitivity: int) -> TuneTrial:
+        """
+        Évalue une configuration sur le proxy
+
+        Args:
+            points: Nombre de points
+            blur: Force du flou
+            sensitivity: Sensibilité des contours
+
+        Returns:
+            TuneTrial avec la qualité et le temps estimé
+        """
+        generator = self._generator(points, blur, sensitivity)
+        smoothed = self._smoothed(generator)
+        edges = generator.detect_edges()
+
+        np.random.seed(self.seed)
+        start_time = time.time()
+        rendered = generator.generate(use_edge_detection=True, add_outlines=False,
+                                      smoothed=smoothed, edges=edges)
+        proxy_time = time.time() - start_time
+
+        # La qualité est mesurée sans contours noirs : elle reflète la fidélité
+        # des couleurs et des formes, pas le style
+        rendered_bgr = cv2.cvtColor(np.asarray(rendered), cv2.COLOR_RGB2BGR)
+        quality = cv2.PSNR(self.reference, rendered_bgr)
+
+        return TuneTrial(
+            points=points,
+            blur_strength=generator.blur_strength,
+            edge_sensitivity=generator.edge_sensitivity,
+            quality=quality,
+            proxy_time=proxy_time,
+            estimated_time=proxy_time * self.area_ratio
+        )
+
+    def tune(self, target_quality: Optional[float] = None,
+             time_budget: Optional[float] = None,
+             points: Sequence[int] = DEFAULT_POINTS,
+             blurs: Sequence[int] = DEFAULT_BLURS,
+             sensitivities: Sequence[int] = DEFAULT_SENSITIVITIES,
+             verbose: bool = True) -> TuneResult:
+        """
+        Parcourt la grille de paramètres et choisit le meilleur candidat
+
+        - qualité cible seule : le candidat le plus rapide qui l'atteint
+        - budget seul : la meilleure qualité dans le budget
+        - les deux : le plus rapide qui atteint la qualité dans le budget
+        - aucun : la meilleure qualité
+
+        Args:
+            target_quality: PSNR minimal visé (dB)
+            time_budget: Temps maximal estimé à pleine résolution (s)
+            points: Valeurs de points à essayer
+            blurs: Valeurs de flou à essayer
+            sensitivities: Valeurs de sensibilité à essayer
+            verbose: Affiche chaque essai
+
+        Returns:
+            TuneResult avec le meilleur essai et l'historique
+        """
+        trials = []
+        for blur, sensitivity, num_points in itertools.product(blurs, sensitivities, points):
+            trial = self.evaluate(num_points, blur, sensitivity)
+            trials.append(trial)
+            if verbose:
+                print(f"  pts={trial.points:5} blur={trial.blur_strength:2} sens={trial.edge_sensitivity} "
+                      f"→ {trial.quality:5.2f} dB, ~{trial.estimated_time:.2f}s")
+
+        candidates = trials
+        if target_quality is not None:
+            candidates = [t for t in candidates if t.quality >= target_quality]
+        if time_budget is not None:
+            candidates = [t for t in candidates if t.estimated_time <= time_budget]
+
+        target_met = bool(candidates)
+        if target_met:
+            if target_quality is not None:
+                best = min(candidates, key=lambda t: (t.estimated_time, -t.quality))
+            else:
+                best = max(candidates, key=lambda t: (t.quality, -t.estimated_time))
+        elif time_budget is not None:
+            # Rien ne tient : se rabattre sur le plus rapide
+            best = min(trials, key=lambda t: t.estimated_time)
+        else:
+            best = max(trials, key=lambda t: t.quality)
+
+        return TuneResult(
+            best=best,
+            trials=trials,
+            target_met=target_met,
+            proxy_size=(self.proxy_width, self.proxy_height),
+            full_size=(self.full_width, self.full_height)
+        )
+
+
+def auto_tune_preset(image_path: str, preset_name: str,
+                     target_quality: Optional[float] = None,
+                     time_budget: Optional[float] = None,
+                     proxy_megapixels: float = 0.15,
+                     enhance_colors: bool = True,
+                     add_outlines: bool = True,
+                     manager: Optional[PresetManager] = None) -> TuneResult:
+    """
+    Lance l'auto-réglage et sauvegarde le gagnant comme preset
+
+    Args:
+        image_path: Image de référence
+        preset_name: Nom du preset à créer
+        target_quality: PSNR minimal visé (dB)
+        time_budget: Temps maximal estimé (s)
+        proxy_megapixels: Taille du proxy d'évaluation
+        enhance_colors: Amélioration des couleurs
+        add_outlines: Contours dans le preset sauvegardé
+        manager: Gestionnaire de presets (par défaut: instance globale)
+
+    Returns:
+        TuneResult
+    """
+    tuner = AutoTuner(image_path, proxy_megapixels=proxy_megapixels,
+                      enhance_colors=enhance_colors)
+    print(f"🔎 Auto-réglage sur proxy {tuner.proxy_width}x{tuner.proxy_height} "
+          f"(image {tuner.full_width}x{tuner.full_height})")
+    result = tuner.tune(target_quality=target_quality, time_budget=time_budget)
+
+    best = result.best
+    if not result.target_met:
+        print("⚠️  Aucune configuration n'atteint la cible, meilleur compromis retenu")
+
+    preset = Preset(
+        name=preset_name,
+        description=f"Auto-réglé: {best.quality:.1f} dB, ~{best.estimated_time:.1f}s",
+        mode="classic",
+        points=best.points,
+        blur_strength=best.blur_strength,
+        edge_sensitivity=best.edge_sensitivity,
+        enhance_colors=enhance_colors,
+        add_outlines=add_outlines
+    )
+    (manager or get_preset_manager()).save_preset(preset)
+    print(f"✅ Preset '{preset_name}': pts={best.points} blur={best.blur_strength} "
+          f"sens={best.edge_sensitivity}")
+    return result
@@ -0,0 +1,150 @@
+"""
+Manifeste des traitements par lots - Mémorise les images déjà traitées
+pour ne relancer que les nouvelles ou celles qui ont changé
+"""
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Dict, Optional
+
+# Incrémenté quand le rendu change à paramètres égaux : tout est retraité
+MANIFEST_VERSION = 1
+
+
+def file_digest(path: Path, chunk_size: int = 1 << 20) -> str:
+    """
+    Empreinte SHA-256 du contenu d'un fichier (lu par blocs)
+
+    Args:
+        path: Chemin du fichier
+        chunk_size: Taille des blocs lus
+
+    Returns:
+        Empreinte hexadécimale
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def params_digest(params: Dict) -> str:
+    """
+    Empreinte des paramètres effectifs d'un rendu
+
+    Args:
+        params: Paramètres sérialisables en JSON
+
+    Returns:
+        Empreinte hexadécimale (16 caractères)
+    """
+    payload = json.dumps({"version": MANIFEST_VERSION, **params}, sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+class BatchManifest:
+    """
+    Manifeste JSON des images traitées, rangé dans le dossier de sortie
+
+    Chaque image (chemin relatif au dossier d'entrée) garde sa taille, sa
+    date de modification, l'empreinte de son contenu, celle des paramètres
+    du rendu et le fichier produit. Une image est à jour si ses paramètres
+    sont inchangés, que sa sortie existe et que taille et date sont les
+    mêmes ; une date différente seule déclenche une comparaison du contenu
+    (fichier recopié ou touché) avant de retraiter.
+    """
+
+    FILENAME = ".polygen_manifest.json"
+
+    def __init__(self, output_dir: str, params_hash: str, save_every: int = 100):
+        """
+        Charge le manifeste du dossier de sortie (vide s'il n'existe pas)
+
+        Args:
+            output_dir: Dossier de sortie du lot
+            params_hash: Empreinte des paramètres du lot courant (params_digest)
+            save_every: Enregistrements entre deux sauvegardes sur disque
+        """
+        self.path = Path(output_dir) / self.FILENAME
+        self.params_hash = params_hash
+        self.save_every = save_every
+        self.entries: Dict[str, Dict] = {}
+        self._unsaved = 0
+        if self.path.exists():
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    self.entries = json.load(f).get("images", {})
+            except (json.JSONDecodeError, AttributeError, OSError) as e:
+                print(f"⚠️  Manifeste illisible, tout sera retraité: {e}")
+
+    def is_up_to_date(self, key: str, image_path: Path) -> bool:
+        """
+        Indique si le rendu enregistré d'une image est encore valable
+
+        Args:
+            key: Clé de l'image (chemin relatif au dossier d'entrée)
+            image_path: Chemin de l'image
+
+        Returns:
+            True si l'image peut être ignorée
+        """
+        entry = self.entries.get(key)
+        if entry is None or entry.get("params") != self.params_hash:
+            return False
+        if not Path(entry.get("output", "")).is_file():
+            return False
+
+        stat = image_path.stat()
+        if stat.st_size != entry.get("size"):
+            return False
+        if stat.st_mtime_ns == entry.get("mtime_ns"):
+            return True
+
+        # Même taille, date différente : comparer le contenu
+        if file_digest(image_path) != entry.get("sha256"):
+            return False
+        entry["mtime_ns"] = stat.st_mtime_ns
+        self._mark_changed()
+        return True
+
+    def output_of(self, key: str) -> str:
+        """Fichier de sortie enregistré pour une image"""
+        return self.entries[key]["output"]
+
+    def record(self, key: str, image_path: Path, output_file: str,
+               content_hash: Optional[str] = None):
+        """
+        Enregistre une image traitée avec succès
+
+        Args:
+            key: Clé de l'image (chemin relatif au dossier d'entrée)
+            image_path: Chemin de l'image
+            output_file: Fichier produit
+            content_hash: Empreinte du contenu si déjà calculée
+        """
+        stat = image_path.stat()
+        self.entries[key] = {
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "sha256": content_hash or file_digest(image_path),
+            "params": self.params_hash,
+            "output": output_file,
+        }
+        self._mark_changed()
+
+    def _mark_changed(self):
+        """Compte une modification et sauvegarde régulièrement"""
+        self._unsaved += 1
+        if self._unsaved >= self.save_every:
+            self.save()
+
+    def save(self):
+        """Écrit le manifeste (remplacement atomique du fichier)"""
+        temp_path = self.path.with_suffix(".tmp")
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump({"version": MANIFEST_VERSION, "images": self.entries}, f, indent=2,
+                      ensure_ascii=False)
+        os.replace(temp_path, self.path)
+        self._unsaved = 0
@@ -3,12 +3,93 @@ Module de traitement par lots (batch processing)
 Permet de traiter plusieurs images en une seule commande
 """
 import os
+import sys
+import threading
+from collections import deque
+from concurrent.futures import (FIRST_COMPLETED, BrokenExecutor, Future, ProcessPoolExecutor,
+                                ThreadPoolExecutor, wait)
 from pathlib import Path
-from typing import Dict, List, Optional, Callable
-from dataclasses import dataclass
+from typing import Dict, Iterable, Iterator, List, Optional, Callable, Tuple
+from dataclasses import dataclass, field
 import time
-from src.low_poly import LowPolyGenerator
+import cv2
+import numpy as np
+from PIL import Image
+from src.low_poly import EdgeDetector, LowPolyGenerator, PointSource, load_image, read_image_size
 from src.advanced_shapes import HybridLowPolyGenerator
+from src.mixed_engine import MixedLowPolyGenerator
+from src.superpixel_engine import SuperpixelLowPolyGenerator
+from src.buffer_pool import BufferPool
+from src.shared_frames import FrameRef, OutputBufferPool, SharedFramePool, attach
+from src.batch_manifest import BatchManifest, file_digest, params_digest
+from src.batch_report import write_report
+from src.batch_scheduler import MegapixelScheduler, image_megapixels
+from src.result_cache import DEFAULT_MAX_MB, ResultCache
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+# Plus haut pic relevé avant une remise à zéro par reset_peak_rss()
+_peak_before_reset = 0
+_peak_lock = threading.Lock()
+
+
+def peak_rss_bytes(children: bool = False) -> Optional[int]:
+    """
+    Pic de mémoire résidente (RSS) du processus courant
+    
+    Args:
+        children: Pic du plus gros processus enfant terminé (workers) à la place
+    
+    Returns:
+        Taille en octets, ou None si la plateforme ne la fournit pas
+    """
+    if resource is None:
+        return None
+    who = resource.RUSAGE_CHILDREN if children else resource.RUSAGE_SELF
+    peak = resource.getrusage(who).ru_maxrss
+    # ru_maxrss est en Ko sous Linux, en octets sous macOS
+    peak = peak if sys.platform == "darwin" else peak * 1024
+    if not children:
+        with _peak_lock:
+            peak = max(peak, _peak_before_reset)
+    return peak
+
+
+def _rss_high_water() -> Optional[int]:
+    """Pic RSS depuis la dernière remise à zéro (VmHWM, Linux), None ailleurs"""
+    try:
+        with open("/proc/self/status", "r") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return None
+
+
+def reset_peak_rss() -> bool:
+    """
+    Ramène le pic RSS du processus à sa mémoire actuelle (Linux)
+    
+    Le pic atteint jusque-là reste compté par peak_rss_bytes().
+    
+    Returns:
+        True si le pic a été remis à zéro (sinon la plateforme ne le permet pas)
+    """
+    global _peak_before_reset
+    peak = peak_rss_bytes()
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+    except OSError:
+        return False
+    with _peak_lock:
+        _peak_before_reset = max(_peak_before_reset, peak or 0)
+    return True
 
 
 @dataclass
@@ -19,12 +100,37 @@ class BatchConfig:
     num_points: int = 1000
     blur_strength: int = 18
     edge_sensitivity: int = 2
+    edge_detector: str = EdgeDetector.FULL  # Niveau de détection de contours (mode classique)
     enhance_colors: bool = True
     add_outlines: bool = True
     hybrid_mode: bool = False
+    mixed_mode: bool = False  # Triangles dans les zones détaillées, formes ailleurs
+    detail_threshold: float = 0.5  # Densité de contours des cellules triangulées (mode mixte)
+    superpixel_mode: bool = False  # Une région SLIC = un polygone
+    num_regions: int = 400  # Nombre de régions visé (mode superpixels)
     grid_size: int = 25
+    adaptive_grid: bool = False  # Quadtree adaptatif en mode hybride (grid_size = taille minimale)
+    render_workers: int = 1  # Bandes rendues en parallèle en mode hybride
     file_extensions: tuple = (".jpg", ".jpeg", ".png", ".bmp")
-    parallel: bool = False  # Possibilité future pour traitement parallèle
+    max_megapixels: Optional[float] = None  # Plafond de résolution au chargement
+    low_memory: bool = False  # Réutilise les buffers entre images de même taille
+    point_source: str = PointSource.RANDOM  # Placement des points de contour (mode classique)
+    contour_tolerance: float = 2.0  # Simplification des contours (PointSource.CONTOURS)
+    parallel: bool = False  # Images traitées dans un pool de processus
+    workers: Optional[int] = None  # Processus du mode parallèle (None = nombre de CPU)
+    chunksize: int = 1  # Images envoyées ensemble à un worker
+    worker_cv_threads: int = 1  # Threads OpenCV par worker du mode parallèle (0 = défaut d'OpenCV)
+    memory_budget_mp: Optional[float] = None  # Mégapixels en cours de traitement au plus (mode parallèle)
+    largest_first: bool = True  # Mode parallèle : plus grandes images envoyées en premier
+    prefetch: int = 0  # Images décodées à l'avance / écritures en attente (0 = sans pipeline)
+    io_workers: int = 2  # Threads de lecture et d'écriture du pipeline (prefetch)
+    shared_memory: bool = False  # Mode parallèle : décodage et encodage ici, rendu dans les workers
+    incremental: bool = False  # Ignore les images déjà traitées avec les mêmes paramètres
+    streaming: bool = False  # Traite les images au fil de la découverte (hors mode parallèle)
+    cache: bool = False  # Réutilise les rendus du cache partagé (contenu + paramètres)
+    cache_dir: Optional[str] = None  # Dossier du cache (None = ~/.polygen/cache)
+    cache_max_mb: float = DEFAULT_MAX_MB  # Taille maximale du cache
+    measure_peak_rss: bool = False  # Pic mémoire de chaque rendu (rapport, Linux)
 
 
 @dataclass
@@ -37,6 +143,181 @@ class ProcessResult:
     processing_time: float = 0.0
     file_size_input: int = 0
     file_size_output: int = 0
+    skipped: bool = False  # Déjà à jour d'après le manifeste (mode incrémental)
+    content_hash: Optional[str] = None  # Empreinte de l'image (mode incrémental ou cache)
+    cache_hit: Optional[bool] = None  # Rendu repris du cache (None = cache désactivé)
+    width: int = 0  # Dimensions de travail (après plafonnement max_megapixels)
+    height: int = 0
+    primitives: Dict[str, int] = field(default_factory=dict)  # Triangles, cellules, régions...
+    stage_times: Dict[str, float] = field(default_factory=dict)  # Durée de chaque étape (s)
+    render_steps: Dict[str, float] = field(default_factory=dict)  # Étapes internes du rendu (s)
+    # Pic mémoire pendant le rendu (octets, Linux) : mesuré si demandé, hors
+    # pipeline, quand le rendu est seul à travailler dans son processus
+    peak_rss: Optional[int] = None
+    
+    @property
+    def megapixels(self) -> float:
+        """Taille de travail en mégapixels"""
+        return self.width * self.height / 1e6
+
+
+def effective_params(config: BatchConfig) -> Dict:
+    """
+    Paramètres qui déterminent le rendu dans le mode configuré
+    
+    Clé commune au manifeste et au cache de résultats : la CLI et la GUI
+    la calculent aussi pour retrouver les rendus d'un lot. Les options sans
+    effet sur le résultat (parallélisme, buffers, dossiers) et celles des
+    autres modes en sont exclues.
+    
+    Args:
+        config: Configuration du rendu
+    
+    Returns:
+        Dictionnaire sérialisable en JSON
+    """
+    params = {"max_megapixels": config.max_megapixels}
+    if config.hybrid_mode:
+        params.update(mode="hybrid", grid_size=config.grid_size,
+                      adaptive_grid=config.adaptive_grid)
+    elif config.superpixel_mode:
+        params.update(mode="superpixels", num_regions=config.num_regions,
+                      enhance_colors=config.enhance_colors, add_outlines=config.add_outlines)
+    elif config.mixed_mode:
+        params.update(mode="mixed", num_points=config.num_points,
+                      blur_strength=config.blur_strength, enhance_colors=config.enhance_colors,
+                      edge_sensitivity=config.edge_sensitivity, grid_size=config.grid_size,
+                      detail_threshold=config.detail_threshold, add_outlines=config.add_outlines)
+    else:
+        params.update(mode="classic", num_points=config.num_points,
+                      blur_strength=config.blur_strength, enhance_colors=config.enhance_colors,
+                      edge_sensitivity=config.edge_sensitivity, edge_detector=config.edge_detector,
+                      point_source=config.point_source, contour_tolerance=config.contour_tolerance,
+                      add_outlines=config.add_outlines)
+    return params
+
+
+# Processeur du worker courant en mode parallèle (un par processus)
+_worker_processor: Optional["BatchProcessor"] = None
+# Sortie du worker : seul le processus principal affiche la progression
+_worker_stdout = None
+
+
+def _init_worker(config: BatchConfig):
+    """Prépare un worker du pool : processeur (et pool de buffers) réutilisé pour ses images"""
+    global _worker_processor, _worker_stdout
+    # Les workers se partagent déjà les cœurs : sans limite, chacun lancerait
+    # un thread OpenCV par CPU
+    if config.worker_cv_threads > 0:
+        cv2.setNumThreads(config.worker_cv_threads)
+    _worker_processor = BatchProcessor(config)
+    _worker_processor.measure_peak = config.measure_peak_rss
+    if _worker_stdout is None:
+        _worker_stdout = open(os.devnull, "w")
+    sys.stdout = _worker_stdout
+
+
+def _process_chunk(image_paths: List[Path]) -> List["ProcessResult"]:
+    """Traite un lot d'images dans un worker du pool"""
+    return [_worker_processor._process_single_image(image_path) for image_path in image_paths]
+
+
+def _render_shared(image_path: Path, result: "ProcessResult", frame: FrameRef,
+                   output: FrameRef) -> "ProcessResult":
+    """
+    Rendu dans un worker d'une image décodée par le processus principal
+    
+    L'image est lue et le rendu écrit directement dans les blocs partagés :
+    seuls les chemins, les références de blocs et le résultat transitent
+    par le pool.
+    """
+    image = attach(frame)
+    rendered = attach(output)
+    pool = OutputBufferPool(rendered, _worker_processor.buffer_pool)
+    try:
+        output_image = _worker_processor._timed(result, "render", _worker_processor._render,
+                                                image_path, image, result, pool)
+        if not pool.output_used:  # Moteur sans buffer "output" : copier le rendu
+            np.copyto(rendered, np.asarray(output_image))
+    except Exception as e:
+        return _worker_processor._failed(result, e)
+    return result
+
+
+class _WorkerPool:
+    """
+    Pool de processus du mode parallèle, recréé quand un worker meurt
+    
+    Un worker tué (mémoire, signal) casse tout le ProcessPoolExecutor :
+    les tâches en cours échouent avec BrokenExecutor, comme tous les envois
+    suivants. result() relance alors l'exception et le pool suivant est
+    créé au prochain submit() ; à l'appelant de renvoyer les tâches
+    interrompues.
+    """
+    
+    def __init__(self, config: BatchConfig, workers: int,
+                 quiesce: Optional[Callable[[], None]] = None):
+        """
+        Initialise le pool et lance ses workers
+        
+        Args:
+            config: Configuration transmise aux workers
+            workers: Nombre de processus
+            quiesce: Appelée avant de recréer le pool, pour attendre que les
+                     autres threads ne soient plus dans OpenCV
+        """
+        self.config = config
+        self.workers = workers
+        self.quiesce = quiesce
+        self.restarts = 0
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._owners: Dict[Future, ProcessPoolExecutor] = {}
+        self._start()
+    
+    def _start(self):
+        """Crée le pool et lance ses workers tout de suite"""
+        self._executor = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                             initargs=(self.config,))
+        # Forké pendant un décodage, un worker hériterait d'un verrou pris (OpenCV)
+        # et bloquerait : les workers démarrent avant les threads de lecture
+        self._executor.submit(os.getpid)
+    
+    def submit(self, func: Callable, *args) -> Future:
+        """Envoie une tâche, dans un pool neuf si le précédent est cassé"""
+        if self._executor is None:
+            self.restarts += 1
+            print("⚠️  Worker interrompu: pool de processus relancé")
+            if self.quiesce is not None:
+                self.quiesce()
+            self._start()
+        try:
+            future = self._executor.submit(func, *args)
+        except BrokenExecutor as e:  # Cassé depuis le dernier résultat lu
+            future = Future()
+            future.set_exception(e)
+        self._owners[future] = self._executor
+        return future
+    
+    def result(self, future: Future):
+        """
+        Résultat d'une tâche terminée
+        
+        Raises:
+            BrokenExecutor: Un worker est mort pendant la tâche ou avant son départ
+        """
+        executor = self._owners.pop(future)
+        try:
+            return future.result()
+        except BrokenExecutor:
+            if executor is self._executor:
+                executor.shutdown()
+                self._executor = None
+            raise
+    
+    def shutdown(self):
+        """Attend la fin des workers"""
+        if self._executor is not None:
+            self._executor.shutdown()
 
 
 class BatchProcessor:
@@ -51,6 +332,16 @@ class BatchProcessor:
         """
         self.config = config
         self.results: List[ProcessResult] = []
+        self.buffer_pool = BufferPool() if config.low_memory else None
+        self.result_cache = ResultCache(config.cache_dir, config.cache_max_mb) if config.cache else None
+        self.peak_rss_before: Optional[int] = None
+        self.peak_rss_after: Optional[int] = None
+        self.peak_rss_workers: Optional[int] = None
+        self.peak_in_flight_mp: Optional[float] = None
+        # Pic mémoire relevé par rendu : seulement quand rien d'autre ne tourne dans le processus
+        self.measure_peak = False
+        self.wall_time = 0.0
+        self.manifest: Optional[BatchManifest] = None
         self._validate_config()
     
     def _validate_config(self):
@@ -66,26 +357,50 @@ class BatchProcessor:
         output_path = Path(self.config.output_dir)
         output_path.mkdir(parents=True, exist_ok=True)
     
-    def find_images(self) -> List[Path]:
+    def iter_images(self, sort: bool = True) -> Iterator[Path]:
         """
-        Trouve toutes les images dans le dossier d'entrée
+        Parcourt le dossier d'entrée en une passe et renvoie les images au fil de l'eau
         
-        Returns:
-            Liste des chemins d'images
+        Les extensions sont comparées sans tenir compte de la casse. Les liens
+        symboliques vers des dossiers ne sont pas suivis et les dossiers
+        illisibles sont ignorés, comme avec Path.rglob.
+        
+        Args:
+            sort: Trie chaque dossier par nom (même ordre qu'un tri global
+                  des chemins) ; sinon ordre du système de fichiers, sans
+                  attendre la fin de la lecture d'un dossier
+        
+        Yields:
+            Chemins des images
         """
-        input_path = Path(self.config.input_dir)
-        images = []
+        extensions = {ext.lower() for ext in self.config.file_extensions}
         
-        for ext in self.config.file_extensions:
-            # Recherche récursive
-            images.extend(input_path.rglob(f"*{ext}"))
-            images.extend(input_path.rglob(f"*{ext.upper()}"))
+        def walk(directory: str) -> Iterator[Path]:
+            try:
+                with os.scandir(directory) as scan:
+                    entries = sorted(scan, key=lambda entry: entry.name) if sort else scan
+                    for entry in entries:
+                        try:
+                            if entry.is_dir(follow_symlinks=False):
+                                yield from walk(entry.path)
+                            elif (os.path.splitext(entry.name)[1].lower() in extensions
+                                  and entry.is_file()):
+                                yield Path(entry.path)
+                        except OSError:
+                            continue
+            except (PermissionError, FileNotFoundError, NotADirectoryError):
+                return
         
-        # Retirer les doublons
-        images = list(set(images))
-        images.sort()
+        return walk(self.config.input_dir)
+    
+    def find_images(self) -> List[Path]:
+        """
+        Trouve toutes les images dans le dossier d'entrée
         
-        return images
+        Returns:
+            Liste triée des chemins d'images
+        """
+        return list(self.iter_images())
     
     def process_batch(self, progress_callback: Optional[Callable[[int, int, str], None]] = None) -> List[ProcessResult]:
         """
@@ -93,57 +408,490 @@ class BatchProcessor:
         
         Args:
             progress_callback: Fonction optionnelle pour rapporter la progression
-                              signature: (current: int, total: int, message: str)
+                              signature: (current: int, total: int, message: str),
+                              total vaut 0 en mode streaming
         
         Returns:
             Liste des résultats de traitement
         """
-        images = self.find_images()
-        total = len(images)
-        
-        if total == 0:
-            print("⚠️  Aucune image trouvée dans le dossier d'entrée")
-            return []
+        # Le mode parallèle ordonne les images par taille : il lui faut la liste complète
+        streaming = self.config.streaming and not self.config.parallel
+        if streaming:
+            images: Iterable[Path] = self.iter_images(sort=False)
+        else:
+            images = self.find_images()
+            if not images:
+                print("⚠️  Aucune image trouvée dans le dossier d'entrée")
+                return []
         
         print(f"\n📦 Traitement par lots")
         print(f"📂 Dossier entrée: {self.config.input_dir}")
         print(f"📂 Dossier sortie: {self.config.output_dir}")
-        print(f"🖼️  Images trouvées: {total}")
+        if streaming:
+            print("🖼️  Images traitées au fil de la découverte")
+        else:
+            print(f"🖼️  Images trouvées: {len(images)}")
         if self.config.hybrid_mode:
             print(f"🎨 Mode: HYBRIDE (grid_size={self.config.grid_size}px)")
+        elif self.config.superpixel_mode:
+            print(f"🎨 Mode: SUPERPIXELS (régions={self.config.num_regions})")
+        elif self.config.mixed_mode:
+            print(f"🎨 Mode: MIXTE (points={self.config.num_points}, grid_size={self.config.grid_size}px)")
         else:
             print(f"🎨 Mode: CLASSIQUE (points={self.config.num_points}, blur={self.config.blur_strength})")
+        if self.config.parallel and self.config.shared_memory:
+            print(f"⚡ Mode parallèle: {self._worker_count()} processus de rendu, "
+                  f"décodage et encodage ici, images en mémoire partagée")
+        elif self.config.parallel:
+            print(f"⚡ Mode parallèle: {self._worker_count()} processus, "
+                  f"{max(1, self.config.chunksize)} image(s) par envoi")
+        if self.config.parallel and self.config.hybrid_mode and self.config.render_workers > 1:
+            threads = self._worker_count() * self.config.render_workers
+            if threads > (os.cpu_count() or 1):
+                print(f"⚠️  {threads} threads de rendu pour {os.cpu_count()} CPU: "
+                      f"réduire --render-workers ou --workers")
+        elif self.config.prefetch > 0:
+            print(f"🔁 Pipeline: {self.config.prefetch} image(s) décodée(s) à l'avance, "
+                  f"encodage en arrière-plan")
+        if self.config.low_memory:
+            print("🧠 Mode mémoire réduite: buffers réutilisés entre images")
+        if self.result_cache is not None:
+            print(f"♻️  Cache de résultats: {self.result_cache.root}")
+        self.peak_rss_before = peak_rss_bytes()
+        if self.peak_rss_before is not None:
+            print(f"📈 Pic mémoire (RSS) avant: {self._format_size(self.peak_rss_before)}")
+        
+        start_time = time.time()
+        pending = images
+        skipped: Dict[int, ProcessResult] = {}
+        if self.config.incremental:
+            self.manifest = BatchManifest(self.config.output_dir, params_digest(self.effective_params()))
+            pending = self._skip_up_to_date(images, skipped)
+            if not streaming:
+                pending = list(pending)
+                print(f"⏭️  Mode incrémental: {len(skipped)} image(s) à jour, {len(pending)} à traiter")
         print()
         
         self.results = []
+        # Total inconnu (0) tant que la découverte n'est pas terminée
+        count = 0 if streaming else len(pending)
         
-        for index, image_path in enumerate(images, 1):
-            try:
+        if self.config.parallel and self.config.shared_memory and pending:
+            self._process_shared(pending, progress_callback)
+        elif self.config.parallel and pending:
+            self._process_parallel(pending, progress_callback)
+        elif self.config.prefetch > 0:
+            self._process_pipelined(pending, progress_callback)
+        else:
+            self.measure_peak = self.config.measure_peak_rss
+            for index, image_path in enumerate(pending, 1):
                 if progress_callback:
-                    progress_callback(index, total, f"Traitement: {image_path.name}")
+                    progress_callback(index, count, f"Traitement: {image_path.name}")
                 
                 result = self._process_single_image(image_path)
                 self.results.append(result)
-                
-                # Afficher le statut
-                status = "✅" if result.success else "❌"
-                print(f"{status} [{index:3d}/{total}] {image_path.name}")
-                if not result.success:
-                    print(f"      Erreur: {result.error_message}")
-                
-            except Exception as e:
-                result = ProcessResult(
-                    input_file=str(image_path),
-                    output_file="",
-                    success=False,
-                    error_message=str(e)
-                )
-                self.results.append(result)
-                print(f"❌ [{index:3d}/{total}] {image_path.name}")
-                print(f"      Erreur: {str(e)[:100]}")
+                self._image_done(index, count, result)
+        
+        if streaming and not self.results and not skipped:
+            print("⚠️  Aucune image trouvée dans le dossier d'entrée")
+        if skipped:
+            # Replacer les images ignorées à leur rang d'entrée
+            processed = iter(self.results)
+            self.results = [skipped[index] if index in skipped else next(processed)
+                            for index in range(len(self.results) + len(skipped))]
+        if self.manifest is not None:
+            self.manifest.save()
         
+        self.wall_time = time.time() - start_time
+        self.peak_rss_after = peak_rss_bytes()
         return self.results
     
+    def _skip_up_to_date(self, images: Iterable[Path],
+                         skipped: Dict[int, ProcessResult]) -> Iterator[Path]:
+        """
+        Filtre les images à jour d'après le manifeste
+        
+        Args:
+            images: Images du dossier d'entrée
+            skipped: Reçoit le résultat des images ignorées, par rang d'entrée
+        
+        Yields:
+            Images à traiter
+        """
+        for index, image_path in enumerate(images):
+            key = self._manifest_key(image_path)
+            if self.manifest.is_up_to_date(key, image_path):
+                skipped[index] = ProcessResult(input_file=str(image_path),
+                                               output_file=self.manifest.output_of(key),
+                                               success=True, skipped=True)
+            else:
+                yield image_path
+    
+    def _worker_count(self) -> int:
+        """Nombre de processus du mode parallèle"""
+        return self.config.workers or os.cpu_count() or 1
+    
+    def _process_parallel(self, images: List[Path],
+                          progress_callback: Optional[Callable[[int, int, str], None]] = None):
+        """
+        Traite les images dans un pool de processus
+        
+        Les dimensions sont lues dans les en-têtes (sans décodage) pour
+        envoyer les plus grandes images en premier et, avec
+        memory_budget_mp, ne pas dépasser ce total de mégapixels en cours
+        (MegapixelScheduler). Les images partent par lots de chunksize ;
+        chaque résultat est rangé à l'indice de son image, self.results
+        garde donc l'ordre d'entrée quel que soit l'ordre de fin. La
+        progression suit l'ordre de fin. Si un worker meurt, le pool est
+        relancé et les images des lots interrompus repassent une à une :
+        seule celle qui fait encore tomber son worker échoue.
+        
+        Args:
+            images: Images à traiter
+            progress_callback: Fonction de progression (current, total, message)
+        """
+        total = len(images)
+        chunksize = max(1, self.config.chunksize)
+        results: List[Optional[ProcessResult]] = [None] * total
+        done = 0
+        
+        order = list(range(total))
+        sizes = [0.0] * total
+        if self.config.largest_first or self.config.memory_budget_mp:
+            sizes = [image_megapixels(str(image_path), self.config.max_megapixels)
+                     for image_path in images]
+            if self.config.largest_first:
+                order.sort(key=lambda index: -sizes[index])
+        # Un worker traite son lot image par image : coût = plus grande image du lot
+        chunks = [order[start:start + chunksize] for start in range(0, total, chunksize)]
+        scheduler = MegapixelScheduler([max(sizes[index] for index in chunk) for chunk in chunks],
+                                       self.config.memory_budget_mp, self.config.largest_first)
+        workers = self._worker_count()
+        if scheduler.budget is not None:
+            print(f"📐 Budget mémoire: {scheduler.budget:g} MP en cours au plus "
+                  f"({sum(sizes):.1f} MP au total)")
+        
+        pool = _WorkerPool(self.config, workers)
+        # Lot en cours → tâche du scheduler (None pour une image relancée seule) et ses images
+        running: Dict[Future, Tuple[Optional[int], List[int]]] = {}
+        # Images d'un lot interrompu par la mort d'un worker : relancées une
+        # par une, seules dans le pool, un nouveau plantage désigne la fautive
+        retries: deque = deque()
+        try:
+            while len(scheduler) or running or retries:
+                if retries:
+                    if not running:
+                        index = retries.popleft()
+                        running[pool.submit(_process_chunk, [images[index]])] = (None, [index])
+                else:
+                    # Une tâche par worker : les tâches envoyées sont celles en cours
+                    while len(running) < workers:
+                        job = scheduler.take()
+                        if job is None:
+                            break
+                        paths = [images[index] for index in chunks[job]]
+                        running[pool.submit(_process_chunk, paths)] = (job, chunks[job])
+                
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    job, chunk = running.pop(future)
+                    if job is not None:
+                        scheduler.release(job)
+                    try:
+                        chunk_results = pool.result(future)
+                    except Exception as e:  # Worker interrompu (mémoire, signal)
+                        if isinstance(e, BrokenExecutor) and job is not None:
+                            retries.extend(chunk)
+                            continue
+                        chunk_results = [ProcessResult(input_file=str(images[index]), output_file="",
+                                                       success=False, error_message=str(e))
+                                         for index in chunk]
+                    
+                    for index, result in zip(chunk, chunk_results):
+                        done += 1
+                        results[index] = result
+                        if progress_callback:
+                            progress_callback(done, total, f"Traité: {images[index].name}")
+                        self._image_done(done, total, result)
+        finally:
+            pool.shutdown()
+        
+        self.results = results
+        self.peak_in_flight_mp = scheduler.peak
+        self.peak_rss_workers = self._workers_peak()
+    
+    def _process_shared(self, images: List[Path],
+                        progress_callback: Optional[Callable[[int, int, str], None]] = None):
+        """
+        Traite les images en pool de processus, avec échanges en mémoire partagée
+        
+        Des threads de lecture décodent les images et les copient dans des
+        blocs partagés ; les workers rendent directement dans un second
+        bloc ; des threads d'écriture l'encodent (PIL en fait une copie,
+        son mode RGB ne peut pas s'appuyer sur un buffer externe). Rien de
+        plus gros qu'une référence de bloc n'est sérialisé, et les blocs
+        sont recyclés d'une image à l'autre (SharedFramePool). Au plus
+        max(prefetch, workers) images attendent un worker, en plus de
+        celles en cours ; ordre d'envoi et budget mémoire suivent
+        MegapixelScheduler comme en mode parallèle, et la mort d'un worker
+        est traitée de la même façon (pool relancé, rendus interrompus
+        renvoyés un par un avec leurs blocs).
+        
+        Args:
+            images: Images à traiter
+            progress_callback: Fonction de progression (current, total, message)
+        """
+        total = len(images)
+        results: List[Optional[ProcessResult]] = [None] * total
+        done = 0
+        
+        sizes = [0.0] * total
+        if self.config.largest_first or self.config.memory_budget_mp:
+            sizes = [image_megapixels(str(image_path), self.config.max_megapixels)
+                     for image_path in images]
+        scheduler = MegapixelScheduler(sizes, self.config.memory_budget_mp,
+                                       self.config.largest_first)
+        workers = self._worker_count()
+        io_workers = max(1, self.config.io_workers)
+        limit = workers + max(self.config.prefetch, workers)
+        frames = SharedFramePool(max_free=2 * limit)
+        
+        # Étape en cours de chaque image : future → (étape, indice)
+        stages: Dict[Future, Tuple[str, int]] = {}
+        refs: Dict[int, Tuple[FrameRef, ...]] = {}  # Blocs réservés par image
+        decoded: Dict[int, ProcessResult] = {}  # Résultat en cours des images décodées
+        ready: deque = deque()  # Images décodées en attente d'envoi aux workers
+        # Rendus interrompus par la mort d'un worker, relancés un par un
+        retries: deque = deque()
+        
+        def finish(index: int, result: ProcessResult):
+            nonlocal done
+            decoded.pop(index, None)
+            for ref in refs.pop(index, ()):
+                frames.release(ref)
+            scheduler.release(index)
+            done += 1
+            results[index] = result
+            if progress_callback:
+                progress_callback(done, total, f"Traité: {images[index].name}")
+            self._image_done(done, total, result)
+        
+        def quiesce():
+            # Pool recréé pendant que les threads de lecture et d'écriture tournent :
+            # attendre leurs images en cours, aucun ne doit être dans OpenCV au fork
+            wait([future for future, (stage, _) in stages.items() if stage in ("read", "write")])
+        
+        def render(index: int, stage: str):
+            stages[pool.submit(_render_shared, images[index], decoded[index],
+                               *refs[index])] = (stage, index)
+        
+        pool = _WorkerPool(self.config, workers, quiesce)
+        try:
+            with ThreadPoolExecutor(io_workers, thread_name_prefix="batch-read") as readers, \
+                    ThreadPoolExecutor(io_workers, thread_name_prefix="batch-write") as writers:
+                while len(scheduler) or stages or ready or retries:
+                    while scheduler.running < limit:
+                        index = scheduler.take()
+                        if index is None:
+                            break
+                        stages[readers.submit(self._read_shared, images[index], frames)] = ("read", index)
+                    
+                    # Rendus relancés seuls dans le pool : un nouveau plantage désigne le fautif
+                    rendering = [stage for stage, _ in stages.values() if stage in ("render", "retry")]
+                    if retries:
+                        if not rendering:
+                            render(retries.popleft(), "retry")
+                    elif "retry" not in rendering:
+                        while ready:
+                            render(ready.popleft(), "render")
+                    
+                    finished, _ = wait(stages, return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        stage, index = stages.pop(future)
+                        if stage == "read":
+                            frame, result = future.result()
+                            if frame is None:  # Échec ou rendu repris du cache
+                                finish(index, result)
+                                continue
+                            refs[index] = (frame, frames.acquire(frame.shape))
+                            decoded[index] = result
+                            ready.append(index)
+                        elif stage in ("render", "retry"):
+                            try:
+                                result = pool.result(future)
+                            except Exception as e:  # Worker interrompu (mémoire, signal)
+                                if isinstance(e, BrokenExecutor) and stage == "render":
+                                    retries.append(index)  # Blocs gardés : renvoi sans relecture
+                                    continue
+                                result = self._failed(decoded[index], e)
+                            frame, output = refs[index]
+                            if not result.success:
+                                finish(index, result)
+                                continue
+                            frames.release(frame)
+                            refs[index] = (output,)
+                            stages[writers.submit(self._write_shared, images[index], output,
+                                                  result, frames)] = ("write", index)
+                        else:
+                            finish(index, future.result())
+        finally:
+            pool.shutdown()
+            frames.close()
+        
+        self.results = results
+        self.peak_in_flight_mp = scheduler.peak
+        self.peak_rss_workers = self._workers_peak()
+    
+    def _read_shared(self, image_path: Path,
+                     frames: SharedFramePool) -> Tuple[Optional[FrameRef], ProcessResult]:
+        """Lecture, décodage et copie en mémoire partagée (thread de lecture)"""
+        image, result = self._read_stage(image_path)
+        if image is None:
+            return None, result
+        try:
+            return self._timed(result, "share", frames.put, image), result
+        except Exception as e:
+            return None, self._failed(result, e)
+    
+    def _write_shared(self, image_path: Path, output: FrameRef, result: ProcessResult,
+                      frames: SharedFramePool) -> ProcessResult:
+        """Encodage du rendu lu dans son bloc partagé (thread d'écriture)"""
+        output_image = Image.fromarray(frames.view(output))  # Copie : le bloc peut être libéré
+        return self._write_stage(image_path, output_image, result)
+    
+    def _workers_peak(self) -> Optional[int]:
+        """
+        Pic mémoire du plus gros worker
+        
+        Un worker terminé ne rapporte que son pic depuis le dernier rendu
+        (remise à zéro par image) : les pics mesurés pendant les rendus
+        complètent la mesure.
+        """
+        peaks = [r.peak_rss for r in self.results if r.peak_rss is not None]
+        exited = peak_rss_bytes(children=True)
+        if exited is not None:
+            peaks.append(exited)
+        return max(peaks, default=None)
+    
+    def _image_done(self, index: int, total: int, result: "ProcessResult"):
+        """Affiche le statut d'une image traitée et l'inscrit au manifeste"""
+        status = "✅" if result.success else "❌"
+        position = f"{index:3d}/{total}" if total else f"{index:3d}"
+        print(f"{status} [{position}] {Path(result.input_file).name}")
+        if not result.success:
+            print(f"      Erreur: {str(result.error_message)[:100]}")
+        elif self.manifest is not None:
+            image_path = Path(result.input_file)
+            self.manifest.record(self._manifest_key(image_path), image_path, result.output_file,
+                                 result.content_hash)
+    
+    def _manifest_key(self, image_path: Path) -> str:
+        """Clé d'une image dans le manifeste : chemin relatif au dossier d'entrée"""
+        return image_path.relative_to(self.config.input_dir).as_posix()
+    
+    def _fetch_cached(self, content_hash: Optional[str], output_file: str) -> bool:
+        """Copie le rendu en cache vers output_file s'il existe"""
+        if self.result_cache is None:
+            return False
+        return self.result_cache.fetch(ResultCache.key(content_hash, self.effective_params()),
+                                       output_file)
+    
+    def _store_cached(self, content_hash: Optional[str], output_file: str):
+        """Ajoute un rendu au cache (sans effet si le cache est désactivé)"""
+        if self.result_cache is not None:
+            self.result_cache.put_file(ResultCache.key(content_hash, self.effective_params()),
+                                       output_file)
+    
+    def effective_params(self) -> Dict:
+        """Paramètres qui déterminent le rendu (voir effective_params)"""
+        return effective_params(self.config)
+    
+    def _output_path(self, image_path: Path) -> Path:
+        """Chemin du rendu d'une image dans le dossier de sortie"""
+        return Path(self.config.output_dir) / (image_path.stem + "_polygen.png")
+    
+    def _render(self, image_path: Path, image: Optional[np.ndarray] = None,
+                result: Optional["ProcessResult"] = None,
+                buffer_pool: Optional[BufferPool] = None) -> Image.Image:
+        """
+        Génère le rendu d'une image selon le mode configuré
+        
+        Args:
+            image_path: Chemin vers l'image
+            image: Image BGR déjà décodée (sinon le générateur la lit)
+            result: Reçoit le nombre de primitives et la durée des étapes internes
+            buffer_pool: Pool de buffers à utiliser à la place de celui du processeur
+        
+        Returns:
+            Image PIL du rendu
+        """
+        input_file_str = str(image_path)
+        if buffer_pool is None:
+            buffer_pool = self.buffer_pool
+        measure_peak = result is not None and self.measure_peak and reset_peak_rss()
+        if self.config.hybrid_mode:
+            generator = HybridLowPolyGenerator(
+                input_file_str,
+                enable_shape_mixing=True,
+                max_megapixels=self.config.max_megapixels,
+                buffer_pool=buffer_pool,
+                image=image
+            )
+            output_image = generator.generate_hybrid(grid_size=self.config.grid_size,
+                                                     adaptive=self.config.adaptive_grid,
+                                                     workers=self.config.render_workers)
+        elif self.config.superpixel_mode:
+            generator = SuperpixelLowPolyGenerator(
+                input_file_str,
+                num_regions=self.config.num_regions,
+                enhance_colors=self.config.enhance_colors,
+                max_megapixels=self.config.max_megapixels,
+                buffer_pool=buffer_pool,
+                image=image
+            )
+            output_image = generator.generate(add_outlines=self.config.add_outlines)
+        elif self.config.mixed_mode:
+            generator = MixedLowPolyGenerator(
+                input_file_str,
+                num_points=self.config.num_points,
+                blur_strength=self.config.blur_strength,
+                enhance_colors=self.config.enhance_colors,
+                edge_sensitivity=self.config.edge_sensitivity,
+                grid_size=self.config.grid_size,
+                detail_threshold=self.config.detail_threshold,
+                max_megapixels=self.config.max_megapixels,
+                buffer_pool=buffer_pool,
+                image=image
+            )
+            output_image = generator.generate(add_outlines=self.config.add_outlines)
+        else:
+            generator = LowPolyGenerator(
+                input_file_str,
+                num_points=self.config.num_points,
+                blur_strength=self.config.blur_strength,
+                enhance_colors=self.config.enhance_colors,
+                edge_sensitivity=self.config.edge_sensitivity,
+                max_megapixels=self.config.max_megapixels,
+                buffer_pool=buffer_pool,
+                point_source=self.config.point_source,
+                contour_tolerance=self.config.contour_tolerance,
+                edge_detector=self.config.edge_detector,
+                image=image
+            )
+            output_image = generator.generate(
+                use_edge_detection=True,
+                add_outlines=self.config.add_outlines
+            )
+        
+        if result is not None:
+            result.primitives = dict(generator.primitives)
+            if getattr(generator, "stage_timings", None):
+                result.render_steps = {name: timing.duration
+                                       for name, timing in generator.stage_timings.items()}
+            if measure_peak:
+                result.peak_rss = _rss_high_water()
+        return output_image
+    
     def _process_single_image(self, image_path: Path) -> ProcessResult:
         """
         Traite une seule image
@@ -154,69 +902,169 @@ class BatchProcessor:
         Returns:
             ProcessResult avec les détails du traitement
         """
-        start_time = time.time()
-        input_file_str = str(image_path)
-        
+        image, result = self._read_stage(image_path)
+        if image is not None:
+            try:
+                output_image = self._timed(result, "render", self._render, image_path, image, result)
+            except Exception as e:
+                return self._failed(result, e)
+            result = self._write_stage(image_path, output_image, result)
+        return result
+    
+    def _timed(self, result: ProcessResult, stage: str, func: Callable, *args):
+        """Appelle func en ajoutant sa durée à l'étape stage du résultat"""
+        start_time = time.perf_counter()
         try:
-            # Déterminer le nom de fichier de sortie
-            output_filename = image_path.stem + "_polygen.png"
-            output_path = Path(self.config.output_dir) / output_filename
-            output_file_str = str(output_path)
+            return func(*args)
+        finally:
+            elapsed = time.perf_counter() - start_time
+            result.stage_times[stage] = result.stage_times.get(stage, 0.0) + elapsed
+            result.processing_time += elapsed
+    
+    @staticmethod
+    def _failed(result: ProcessResult, error: Exception) -> ProcessResult:
+        """Marque un résultat en échec"""
+        result.success = False
+        result.output_file = ""
+        result.error_message = str(error)
+        return result
+    
+    def _process_pipelined(self, images: Iterable[Path],
+                           progress_callback: Optional[Callable[[int, int, str], None]] = None):
+        """
+        Traite les images en trois étapes recouvertes
+        
+        Des threads de lecture décodent les `prefetch` images suivantes
+        pendant le rendu de l'image courante, et des threads d'écriture
+        encodent et sauvegardent les rendus précédents. Les deux files sont
+        bornées à `prefetch` images : la mémoire reste limitée même si le
+        disque est plus lent que le calcul. Les résultats gardent l'ordre
+        d'entrée.
+        
+        Args:
+            images: Images à traiter (liste, ou itérateur lu au fil de l'eau)
+            progress_callback: Fonction de progression (current, total, message ;
+                               total = 0 pour un itérateur)
+        """
+        total = len(images) if isinstance(images, list) else 0
+        depth = max(1, self.config.prefetch)
+        io_workers = max(1, self.config.io_workers)
+        upcoming = iter(images)
+        
+        with ThreadPoolExecutor(io_workers, thread_name_prefix="batch-read") as readers, \
+                ThreadPoolExecutor(io_workers, thread_name_prefix="batch-write") as writers:
+            reads = deque()
+            writes = deque()
             
-            # Récupérer les tailles de fichiers
-            file_size_input = image_path.stat().st_size
+            def schedule_read():
+                image_path = next(upcoming, None)
+                if image_path is not None:
+                    reads.append((image_path, readers.submit(self._read_stage, image_path)))
             
-            # Traitement
-            if self.config.hybrid_mode:
-                generator = HybridLowPolyGenerator(
-                    input_file_str,
-                    enable_shape_mixing=True
-                )
-                output_image = generator.generate_hybrid(grid_size=self.config.grid_size)
-            else:
-                generator = LowPolyGenerator(
-                    input_file_str,
-                    num_points=self.config.num_points,
-                    blur_strength=self.config.blur_strength,
-                    enhance_colors=self.config.enhance_colors,
-                    edge_sensitivity=self.config.edge_sensitivity
-                )
-                output_image = generator.generate(
-                    use_edge_detection=True,
-                    add_outlines=self.config.add_outlines
-                )
+            def collect_write():
+                result = writes.popleft().result()
+                self.results.append(result)
+                self._image_done(len(self.results), total, result)
             
-            # Sauvegarder
-            output_image.save(output_file_str)
-            file_size_output = Path(output_file_str).stat().st_size
+            for _ in range(depth):
+                schedule_read()
             
-            processing_time = time.time() - start_time
+            index = 0
+            while reads:
+                index += 1
+                image_path, read = reads.popleft()
+                schedule_read()
+                if progress_callback:
+                    progress_callback(index, total, f"Traitement: {image_path.name}")
+                
+                writes.append(self._compute_stage(image_path, read, writers))
+                while len(writes) > depth:
+                    collect_write()
             
-            return ProcessResult(
-                input_file=input_file_str,
-                output_file=output_file_str,
-                success=True,
-                processing_time=processing_time,
-                file_size_input=file_size_input,
-                file_size_output=file_size_output
-            )
+            while writes:
+                collect_write()
+    
+    def _read_stage(self, image_path: Path) -> Tuple[Optional[np.ndarray], ProcessResult]:
+        """
+        Lecture et décodage (thread de lecture en mode pipeline)
         
+        Returns:
+            (image, résultat en cours) ; image vaut None si le rendu a été
+            repris du cache (copié directement en sortie) ou en cas d'échec
+        """
+        result = ProcessResult(input_file=str(image_path),
+                               output_file=str(self._output_path(image_path)), success=True)
+        try:
+            result.file_size_input = image_path.stat().st_size
+            if self.config.incremental or self.result_cache is not None:
+                result.content_hash = self._timed(result, "hash", file_digest, image_path)
+            if self.result_cache is not None:
+                result.cache_hit = self._timed(result, "cache", self._fetch_cached,
+                                               result.content_hash, result.output_file)
+                if result.cache_hit:
+                    result.width, result.height = read_image_size(result.output_file) or (0, 0)
+                    result.file_size_output = Path(result.output_file).stat().st_size
+                    return None, result
+            image = self._timed(result, "decode", load_image, str(image_path),
+                                self.config.max_megapixels)
+            if image is None:
+                raise ValueError(f"Impossible de charger l'image: {image_path}")
         except Exception as e:
-            processing_time = time.time() - start_time
-            return ProcessResult(
-                input_file=input_file_str,
-                output_file="",
-                success=False,
-                error_message=str(e),
-                processing_time=processing_time
-            )
+            return None, self._failed(result, e)
+        result.height, result.width = image.shape[:2]
+        return image, result
+    
+    def _compute_stage(self, image_path: Path, read: Future, writers: ThreadPoolExecutor) -> Future:
+        """
+        Rendu d'une image décodée, puis écriture confiée aux threads d'écriture
+        
+        Returns:
+            Future du ProcessResult (déjà résolu si l'image vient du cache ou en cas d'erreur)
+        """
+        image, result = read.result()
+        if image is not None:
+            try:
+                # Image PIL RGB : copie des pixels, le buffer de sortie du pool peut resservir
+                output_image = self._timed(result, "render", self._render, image_path, image, result)
+                return writers.submit(self._write_stage, image_path, output_image, result)
+            except Exception as e:
+                self._failed(result, e)
+        done = Future()
+        done.set_result(result)
+        return done
+    
+    def _write_stage(self, image_path: Path, output_image: Image.Image,
+                     result: ProcessResult) -> ProcessResult:
+        """Encodage et sauvegarde du rendu (thread d'écriture en mode pipeline)"""
+        try:
+            self._timed(result, "encode", output_image.save, result.output_file)
+            if self.result_cache is not None:
+                self._timed(result, "cache", self._store_cached, result.content_hash,
+                            result.output_file)
+            result.file_size_output = Path(result.output_file).stat().st_size
+        except Exception as e:
+            return self._failed(result, e)
+        return result
+    
+    def write_report(self, path: str) -> List[str]:
+        """
+        Écrit le rapport détaillé du lot (JSON, ou CSV si path finit par .csv)
+        
+        Args:
+            path: Fichier de sortie
+        
+        Returns:
+            Fichiers écrits
+        """
+        return write_report(self, path)
     
     def print_summary(self):
         """Affiche un résumé des résultats"""
         if not self.results:
             return
         
-        successful = sum(1 for r in self.results if r.success)
+        skipped = sum(1 for r in self.results if r.skipped)
+        successful = sum(1 for r in self.results if r.success and not r.skipped)
         failed = sum(1 for r in self.results if not r.success)
         total = len(self.results)
         total_time = sum(r.processing_time for r in self.results)
@@ -229,15 +1077,36 @@ class BatchProcessor:
         print(f"Total des images:       {total}")
         print(f"Réussies:              ✅ {successful}")
         print(f"Échouées:              ❌ {failed}")
-        print(f"Taux de réussite:      {(successful/total)*100:.1f}%")
+        if skipped:
+            print(f"Déjà à jour:           ⏭️  {skipped}")
+        print(f"Taux de réussite:      {((successful + skipped)/total)*100:.1f}%")
         print(f"\nTemps total:           {total_time:.2f}s")
         print(f"Temps moyen/image:     {total_time/total:.2f}s")
+        if self.wall_time > 0:
+            print(f"Durée réelle:          {self.wall_time:.2f}s ({total / self.wall_time:.2f} images/s)")
         if total > 0:
             print(f"\nTaille entrée totale:  {self._format_size(total_input_size)}")
             print(f"Taille sortie totale:  {self._format_size(total_output_size)}")
             if total_input_size > 0:
                 compression = ((total_input_size - total_output_size) / total_input_size) * 100
                 print(f"Compression:           {compression:+.1f}%")
+        cache_results = [r.cache_hit for r in self.results if r.cache_hit is not None]
+        if cache_results:
+            hits = sum(cache_results)
+            print(f"\nCache réutilisé:       ♻️  {hits}/{len(cache_results)} "
+                  f"({hits / len(cache_results) * 100:.1f}%), {len(cache_results) - hits} calculé(s)")
+            if self.result_cache is not None:
+                print(f"Taille du cache:       {self._format_size(self.result_cache.size_on_disk())} "
+                      f"(max {self._format_size(self.result_cache.max_bytes)})")
+        if self.peak_rss_before is not None and self.peak_rss_after is not None:
+            print(f"\nPic mémoire avant:     {self._format_size(self.peak_rss_before)}")
+            print(f"Pic mémoire après:     {self._format_size(self.peak_rss_after)}")
+        if self.peak_rss_workers is not None:
+            print(f"Pic mémoire worker:    {self._format_size(self.peak_rss_workers)}")
+        if self.peak_in_flight_mp is not None:
+            budget = self.config.memory_budget_mp
+            print(f"Pic en cours:          {self.peak_in_flight_mp:.1f} MP"
+                  + (f" (budget {budget:g} MP)" if budget else ""))
         print("="*70 + "\n")
     
     @staticmethod
@@ -254,12 +1123,33 @@ def batch_process_cli(
     input_dir: str,
     output_dir: str,
     hybrid: bool = False,
+    mixed: bool = False,
+    detail_threshold: float = 0.5,
+    superpixels: bool = False,
+    num_regions: int = 400,
     grid_size: int = 25,
     num_points: int = 1000,
     blur_strength: int = 18,
     sensitivity: int = 2,
+    edge_detector: str = EdgeDetector.FULL,
     enhance: bool = True,
-    outlines: bool = True
+    outlines: bool = True,
+    max_megapixels: Optional[float] = None,
+    low_memory: bool = False,
+    point_source: str = PointSource.RANDOM,
+    contour_tolerance: float = 2.0,
+    adaptive_grid: bool = False,
+    render_workers: int = 1,
+    workers: int = 1,
+    prefetch: int = 0,
+    memory_budget_mp: Optional[float] = None,
+    shared_memory: bool = False,
+    streaming: bool = False,
+    incremental: bool = False,
+    cache: bool = False,
+    cache_dir: Optional[str] = None,
+    cache_max_mb: float = DEFAULT_MAX_MB,
+    report: Optional[str] = None
 ) -> int:
     """
     Fonction CLI wrapper pour le traitement par lots
@@ -268,12 +1158,33 @@ def batch_process_cli(
         input_dir: Dossier d'entrée
         output_dir: Dossier de sortie
         hybrid: Utiliser le mode hybride
+        mixed: Utiliser le moteur mixte (triangles + formes)
+        detail_threshold: Densité de contours des cellules triangulées (mode mixte)
+        superpixels: Utiliser le moteur superpixels
+        num_regions: Nombre de régions visé (mode superpixels)
         grid_size: Taille de grille (mode hybride)
         num_points: Nombre de points (mode classique)
         blur_strength: Force du flou (mode classique)
         sensitivity: Sensibilité des contours (mode classique)
+        edge_detector: Niveau de détection de contours (mode classique)
         enhance: Améliorer les couleurs (mode classique)
         outlines: Afficher les contours (mode classique)
+        max_megapixels: Plafond de résolution au chargement (mégapixels)
+        low_memory: Réutiliser les buffers entre images (mode mémoire réduite)
+        point_source: Placement des points de contour (mode classique)
+        contour_tolerance: Simplification des contours en pixels (mode classique)
+        adaptive_grid: Quadtree adaptatif (mode hybride)
+        render_workers: Bandes rendues en parallèle (mode hybride)
+        workers: Processus traitant les images en parallèle (0 = nombre de CPU)
+        prefetch: Images décodées à l'avance, encodage en arrière-plan (0 = désactivé)
+        memory_budget_mp: Mégapixels traités simultanément au plus (mode parallèle)
+        shared_memory: Décoder et encoder ici, images échangées en mémoire partagée (mode parallèle)
+        streaming: Traiter les images au fil de la découverte du dossier
+        incremental: Ne traiter que les images nouvelles ou modifiées (manifeste)
+        cache: Réutiliser les rendus du cache partagé
+        cache_dir: Dossier du cache (None = ~/.polygen/cache)
+        cache_max_mb: Taille maximale du cache en mégaoctets
+        report: Fichier du rapport détaillé (JSON, ou CSV si .csv)
     
     Returns:
         Code de retour (0 = succès, 1 = erreur)
@@ -283,17 +1194,42 @@ def batch_process_cli(
             input_dir=input_dir,
             output_dir=output_dir,
             hybrid_mode=hybrid,
+            mixed_mode=mixed,
+            detail_threshold=detail_threshold,
+            superpixel_mode=superpixels,
+            num_regions=num_regions,
             grid_size=grid_size,
             num_points=num_points,
             blur_strength=blur_strength,
             edge_sensitivity=sensitivity,
+            edge_detector=edge_detector,
             enhance_colors=enhance,
-            add_outlines=outlines
+            add_outlines=outlines,
+            max_megapixels=max_megapixels,
+            low_memory=low_memory,
+            point_source=point_source,
+            contour_tolerance=contour_tolerance,
+            adaptive_grid=adaptive_grid,
+            render_workers=render_workers,
+            parallel=workers != 1,
+            workers=workers or None,
+            prefetch=prefetch,
+            memory_budget_mp=memory_budget_mp,
+            shared_memory=shared_memory,
+            streaming=streaming,
+            incremental=incremental,
+            cache=cache,
+            cache_dir=cache_dir,
+            cache_max_mb=cache_max_mb,
+            measure_peak_rss=bool(report)
         )
         
         processor = BatchProcessor(config)
         results = processor.process_batch()
         processor.print_summary()
+        if report:
+            for path in processor.write_report(report):
+                print(f"📄 Rapport: {path}")
         
         # Retourner 0 si au moins une image a été traitée avec succès
         successful = sum(1 for r in results if r.success)
@@ -0,0 +1,197 @@
+"""
+Rapport de traitement par lots - Mesures par image et agrégats (débit,
+percentiles de latence) en JSON ou CSV, pour suivre les régressions
+"""
+import csv
+import json
+import os
+import platform
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, List, Optional
+
+import numpy as np
+
+from src import __version__
+
+if TYPE_CHECKING:
+    from src.batch_processor import BatchProcessor, ProcessResult
+
+# Incrémenté quand la structure du rapport change
+REPORT_VERSION = 2
+PERCENTILES = (50, 90, 95, 99)
+
+
+def image_record(result: "ProcessResult") -> Dict:
+    """
+    Mesures d'une image
+
+    Args:
+        result: Résultat du traitement
+
+    Returns:
+        Dictionnaire sérialisable en JSON
+    """
+    return {
+        "input": result.input_file,
+        "output": result.output_file,
+        "success": result.success,
+        "error": result.error_message,
+        "skipped": result.skipped,
+        "cache_hit": result.cache_hit,
+        "width": result.width,
+        "height": result.height,
+        "megapixels": round(result.megapixels, 4),
+        "primitives": dict(result.primitives),
+        "time_s": round(result.processing_time, 6),
+        "stages_s": {stage: round(elapsed, 6) for stage, elapsed in result.stage_times.items()},
+        # Détail de l'étape "render", à ne pas ajouter aux étapes
+        "render_steps_s": {step: round(elapsed, 6) for step, elapsed in result.render_steps.items()},
+        "peak_rss_bytes": result.peak_rss,
+        "input_bytes": result.file_size_input,
+        "output_bytes": result.file_size_output,
+    }
+
+
+def latency_stats(latencies: List[float]) -> Dict[str, Optional[float]]:
+    """Moyenne, percentiles et maximum d'une série de durées (secondes)"""
+    if not latencies:
+        return {"mean": None, **{f"p{q}": None for q in PERCENTILES}, "max": None}
+    values = np.asarray(latencies)
+    stats = {"mean": float(values.mean())}
+    stats.update({f"p{q}": float(value)
+                  for q, value in zip(PERCENTILES, np.percentile(values, PERCENTILES))})
+    stats["max"] = float(values.max())
+    return {name: round(value, 6) for name, value in stats.items()}
+
+
+def build_report(processor: "BatchProcessor") -> Dict:
+    """
+    Rapport complet d'un lot traité
+
+    Le débit et les latences ne comptent que les images réellement
+    traitées (les images à jour du mode incrémental en sont exclues, les
+    rendus repris du cache y figurent).
+
+    Args:
+        processor: Processeur après process_batch()
+
+    Returns:
+        Dictionnaire sérialisable en JSON
+    """
+    results = processor.results
+    processed = [r for r in results if r.success and not r.skipped]
+    wall_time = processor.wall_time
+    megapixels = sum(r.megapixels for r in processed)
+
+    stage_totals: Dict[str, float] = {}
+    render_step_totals: Dict[str, float] = {}
+    for result in results:
+        for stage, elapsed in result.stage_times.items():
+            stage_totals[stage] = stage_totals.get(stage, 0.0) + elapsed
+        for step, elapsed in result.render_steps.items():
+            render_step_totals[step] = render_step_totals.get(step, 0.0) + elapsed
+    primitives: Dict[str, int] = {}
+    for result in processed:
+        for name, count in result.primitives.items():
+            primitives[name] = primitives.get(name, 0) + count
+
+    config = processor.config
+    return {
+        "version": REPORT_VERSION,
+        "polygen_version": __version__,
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "host": {"python": platform.python_version(), "platform": platform.platform(),
+                 "cpu_count": os.cpu_count()},
+        "params": processor.effective_params(),
+        "execution": {
+            "parallel": config.parallel,
+            "workers": processor._worker_count() if config.parallel else 1,
+            "prefetch": config.prefetch,
+            "low_memory": config.low_memory,
+            "incremental": config.incremental,
+            "cache": config.cache,
+            "memory_budget_mp": config.memory_budget_mp,
+            "shared_memory": config.shared_memory,
+        },
+        "summary": {
+            "images": len(results),
+            "processed": len(processed),
+            "failed": sum(1 for r in results if not r.success),
+            "skipped": sum(1 for r in results if r.skipped),
+            "cache_hits": sum(1 for r in results if r.cache_hit),
+            "wall_time_s": round(wall_time, 6),
+            "images_per_s": round(len(processed) / wall_time, 4) if wall_time > 0 else None,
+            "megapixels": round(megapixels, 4),
+            "megapixels_per_s": round(megapixels / wall_time, 4) if wall_time > 0 else None,
+            "latency_s": latency_stats([r.processing_time for r in processed]),
+            "stage_totals_s": {stage: round(elapsed, 6) for stage, elapsed in stage_totals.items()},
+            "render_step_totals_s": {step: round(elapsed, 6)
+                                     for step, elapsed in render_step_totals.items()},
+            "primitives": primitives,
+            "input_bytes": sum(r.file_size_input for r in results),
+            "output_bytes": sum(r.file_size_output for r in results),
+            "peak_rss_bytes": processor.peak_rss_after,
+            "peak_rss_workers_bytes": processor.peak_rss_workers,
+        },
+        "images": [image_record(result) for result in results],
+    }
+
+
+def _flatten(record: Dict, prefix: str = "") -> Dict:
+    """Aplatit les dictionnaires imbriqués (clés "stages_s.decode", ...)"""
+    flat = {}
+    for key, value in record.items():
+        if isinstance(value, dict):
+            flat.update(_flatten(value, f"{prefix}{key}."))
+        else:
+            flat[f"{prefix}{key}"] = value
+    return flat
+
+
+def write_report(processor: "BatchProcessor", path: str) -> List[str]:
+    """
+    Écrit le rapport d'un lot
+
+    Un chemin en .csv produit une ligne par image (étapes et primitives
+    en colonnes "stages_s.<étape>", "render_steps_s.<étape>",
+    "primitives.<type>") et les agrégats dans <nom>_summary.csv ; toute
+    autre extension produit un seul fichier JSON.
+
+    Args:
+        processor: Processeur après process_batch()
+        path: Fichier de sortie
+
+    Returns:
+        Fichiers écrits
+    """
+    report = build_report(processor)
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    if path.suffix.lower() != ".csv":
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        return [str(path)]
+
+    # Colonnes dans l'ordre de image_record, sous-clés dans l'ordre d'apparition
+    columns: List[str] = []
+    for key, value in (report["images"][0].items() if report["images"] else ()):
+        if not isinstance(value, dict):
+            columns.append(key)
+            continue
+        for image in report["images"]:
+            columns.extend(f"{key}.{sub}" for sub in image[key] if f"{key}.{sub}" not in columns)
+    rows = [_flatten(image) for image in report["images"]]
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=columns)
+        writer.writeheader()
+        writer.writerows(rows)
+
+    summary_path = path.with_name(f"{path.stem}_summary.csv")
+    summary = _flatten({key: value for key, value in report.items() if key != "images"})
+    with open(summary_path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["metric", "value"])
+        writer.writerows(summary.items())
+    return [str(path), str(summary_path)]
@@ -0,0 +1,101 @@
+"""
+Ordonnancement des lots parallèles - Borne les mégapixels en cours de
+traitement et envoie les plus grandes images en premier
+"""
+import bisect
+from typing import List, Optional, Sequence
+
+from src.low_poly import read_image_size
+
+
+def image_megapixels(image_path: str, max_megapixels: Optional[float] = None) -> float:
+    """
+    Taille de travail d'une image, lue dans son en-tête sans la décoder
+
+    Args:
+        image_path: Chemin de l'image
+        max_megapixels: Plafond appliqué au chargement (None = pleine résolution)
+
+    Returns:
+        Mégapixels après plafonnement (0 si l'en-tête est illisible)
+    """
+    size = read_image_size(image_path)
+    if size is None:
+        return 0.0
+    megapixels = size[0] * size[1] / 1e6
+    if max_megapixels and max_megapixels > 0:
+        megapixels = min(megapixels, max_megapixels)
+    return megapixels
+
+
+class MegapixelScheduler:
+    """
+    File de tâches sous un budget de mégapixels simultanés
+
+    take() renvoie la plus grande tâche en attente qui tient dans le budget
+    restant : les grandes images partent dès qu'il y a de la place, les
+    petites comblent l'espace libre, et le lot ne finit pas sur une grande
+    image lancée en dernier. Une tâche plus grande que le budget entier
+    passe seule, quand plus rien n'est en cours.
+    """
+
+    def __init__(self, costs: Sequence[float], budget: Optional[float] = None,
+                 largest_first: bool = True):
+        """
+        Initialise la file
+
+        Args:
+            costs: Coût (mégapixels) de chaque tâche, indexée par sa position
+            budget: Mégapixels en cours au plus (None = sans limite)
+            largest_first: Plus grandes tâches d'abord (sinon ordre d'entrée)
+        """
+        self.costs = list(costs)
+        self.budget = budget if budget and budget > 0 else None
+        order = range(len(self.costs))
+        if largest_first:
+            order = sorted(order, key=lambda job: -self.costs[job])
+        # File triée par coût décroissant (ou d'entrée) ; _keys sert à la recherche
+        self._pending: List[int] = list(order)
+        self._keys: List[float] = [-self.costs[job] for job in self._pending]
+        self._sorted = largest_first
+        self.running = 0
+        self.in_flight = 0.0
+        self.peak = 0.0
+
+    def __len__(self) -> int:
+        """Nombre de tâches en attente"""
+        return len(self._pending)
+
+    def take(self) -> Optional[int]:
+        """
+        Tâche suivante, réservée sur le budget
+
+        Returns:
+            Indice de la tâche, ou None si aucune ne tient dans le budget
+            restant (ou s'il n'y en a plus)
+        """
+        if not self._pending:
+            return None
+        if self.budget is None or self.running == 0:
+            position = 0
+        elif self._sorted:
+            # Première tâche (la plus grande) dont le coût tient dans le reste
+            position = bisect.bisect_left(self._keys, self.in_flight - self.budget)
+            if position == len(self._pending):
+                return None
+        elif self.costs[self._pending[0]] <= self.budget - self.in_flight:
+            position = 0
+        else:
+            return None
+
+        job = self._pending.pop(position)
+        del self._keys[position]
+        self.running += 1
+        self.in_flight += self.costs[job]
+        self.peak = max(self.peak, self.in_flight)
+        return job
+
+    def release(self, job: int):
+        """Libère le budget d'une tâche terminée"""
+        self.running -= 1
+        self.in_flight = max(0.0, self.in_flight - self.costs[job]) if self.running else 0.0
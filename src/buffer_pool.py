@@ -0,0 +1,83 @@
+"""
+Pool de buffers réutilisables - Évite de réallouer les tableaux
+intermédiaires (flou, HSV, contours, sortie) pour chaque image d'un lot
+"""
+import threading
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+
+class BufferPool:
+    """
+    Buffers préalloués indexés par (nom, forme, type)
+
+    Deux images consécutives de même taille réutilisent les mêmes tableaux.
+    Un buffer renvoyé par get() n'est valide que jusqu'au prochain get()
+    du même nom : l'appelant doit copier ce qu'il veut conserver.
+    Les étapes parallèles du pipeline peuvent l'interroger en même temps.
+    """
+
+    def __init__(self, max_buffers: int = 32):
+        """
+        Initialise le pool
+
+        Args:
+            max_buffers: Nombre maximal de buffers conservés (les plus anciens sont libérés)
+        """
+        self.max_buffers = max_buffers
+        self._buffers: Dict[Tuple[str, Tuple[int, ...], str], np.ndarray] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, name: str, shape: Tuple[int, ...], dtype=np.uint8) -> np.ndarray:
+        """
+        Obtient un buffer (contenu non initialisé)
+
+        Args:
+            name: Rôle du buffer (ex: "smoothed", "edges")
+            shape: Forme du tableau
+            dtype: Type des éléments
+
+        Returns:
+            Tableau NumPy réutilisable
+        """
+        key = (name, tuple(shape), np.dtype(dtype).str)
+        with self._lock:
+            buffer = self._buffers.pop(key, None)
+            if buffer is None:
+                self.misses += 1
+                # Une nouvelle taille pour ce rôle remplace l'ancienne
+                for old_key in [k for k in self._buffers if k[0] == name]:
+                    del self._buffers[old_key]
+                buffer = np.empty(shape, dtype=dtype)
+            else:
+                self.hits += 1
+            # Réinsérer en fin pour garder l'ordre d'utilisation
+            self._buffers[key] = buffer
+            while len(self._buffers) > self.max_buffers:
+                del self._buffers[next(iter(self._buffers))]
+            return buffer
+
+    def zeros(self, name: str, shape: Tuple[int, ...], dtype=np.uint8) -> np.ndarray:
+        """Obtient un buffer remis à zéro"""
+        buffer = self.get(name, shape, dtype)
+        buffer.fill(0)
+        return buffer
+
+    def clear(self):
+        """Libère tous les buffers"""
+        with self._lock:
+            self._buffers.clear()
+
+    @property
+    def nbytes(self) -> int:
+        """Mémoire totale retenue par le pool"""
+        return sum(b.nbytes for b in self._buffers.values())
+
+
+def pool_get(pool: Optional[BufferPool], name: str, shape: Tuple[int, ...],
+             dtype=np.uint8) -> Optional[np.ndarray]:
+    """Buffer du pool, ou None sans pool (les fonctions OpenCV allouent alors)"""
+    return pool.get(name, shape, dtype) if pool is not None else None
@@ -7,13 +7,117 @@ import numpy as np
 from scipy.spatial import Delaunay
 from PIL import Image
 import os
+import math
+from typing import Dict, Optional, Tuple
+from src.analysis import ImageAnalysis
+from src.buffer_pool import BufferPool, pool_get
+from src.pipeline import StageGraph, StageTiming
+
+
+# Extensions décodables directement à échelle réduite par libjpeg
+REDUCED_DECODE_EXTENSIONS = (".jpg", ".jpeg", ".jpe")
+
+# Facteurs de réduction disponibles à la lecture (du plus fort au plus faible)
+_REDUCED_FLAGS = (
+    (8, cv2.IMREAD_REDUCED_COLOR_8),
+    (4, cv2.IMREAD_REDUCED_COLOR_4),
+    (2, cv2.IMREAD_REDUCED_COLOR_2),
+)
+
+# Tables de correspondance de l'amélioration des couleurs (HSV)
+# Mêmes calculs float32 que l'ancienne conversion de l'image entière,
+# appliqués une seule fois aux 256 valeurs possibles
+_LEVELS = np.arange(256, dtype=np.float32)
+ENHANCE_LUT = np.stack([
+    np.arange(256, dtype=np.uint8),                          # H inchangé
+    np.clip(_LEVELS * 1.3, 0, 255).astype(np.uint8),         # S +30%
+    np.clip(_LEVELS * 1.1, 0, 255).astype(np.uint8),         # V +10%
+], axis=-1).reshape(1, 256, 3)
+
+
+def read_image_size(image_path: str) -> Optional[Tuple[int, int]]:
+    """
+    Lit les dimensions d'une image depuis son en-tête, sans la décoder
+    
+    Args:
+        image_path: Chemin de l'image
+        
+    Returns:
+        Tuple (largeur, hauteur) ou None si l'en-tête est illisible
+    """
+    try:
+        with Image.open(image_path) as img:
+            return img.size
+    except Exception:
+        return None
+
+
+def load_image(image_path: str, max_megapixels: Optional[float] = None) -> Optional[np.ndarray]:
+    """
+    Charge une image en BGR, plafonnée à max_megapixels
+    
+    Les JPEG sont décodés directement à 1/2, 1/4 ou 1/8 de leur taille
+    (en restant au-dessus du plafond), puis le reste de la réduction est
+    fait en une seule passe avec interpolation par aire.
+    
+    Args:
+        image_path: Chemin de l'image
+        max_megapixels: Taille maximale en mégapixels (None = pleine résolution)
+        
+    Returns:
+        Image BGR ou None si le fichier ne peut pas être lu
+    """
+    if not max_megapixels or max_megapixels <= 0:
+        return cv2.imread(image_path)
+    
+    max_pixels = max_megapixels * 1e6
+    flag = cv2.IMREAD_COLOR
+    size = read_image_size(image_path)
+    if size and os.path.splitext(image_path)[1].lower() in REDUCED_DECODE_EXTENSIONS:
+        width, height = size
+        for factor, reduced_flag in _REDUCED_FLAGS:
+            if (width // factor) * (height // factor) >= max_pixels:
+                flag = reduced_flag
+                break
+    
+    image = cv2.imread(image_path, flag)
+    if image is None:
+        return None
+    
+    height, width = image.shape[:2]
+    if width * height > max_pixels:
+        scale = math.sqrt(max_pixels / (width * height))
+        new_size = (max(1, int(width * scale)), max(1, int(height * scale)))
+        image = cv2.resize(image, new_size, interpolation=cv2.INTER_AREA)
+    return image
+
+
+class PointSource:
+    """Sources des sommets placés sur les contours"""
+    RANDOM = "random"       # Pixels de contour tirés au hasard
+    CONTOURS = "contours"   # Sommets des contours simplifiés (findContours + approxPolyDP)
+
+
+class EdgeDetector:
+    """Niveaux de détection de contours, du plus rapide au plus précis"""
+    SOBEL = "sobel"  # Seuil sur le gradient de Sobel
+    CANNY = "canny"  # Canny + dilatation, sans CLAHE
+    FULL = "full"    # CLAHE + Canny + dilatation
 
 
 class LowPolyGenerator:
     """Classe principale pour convertir une image en style low poly cartoon"""
     
     def __init__(self, image_path: str, num_points: int = 1000, blur_strength: int = 15,
-                 enhance_colors: bool = True, edge_sensitivity: int = 2):
+                 enhance_colors: bool = True, edge_sensitivity: int = 2,
+                 image: Optional[np.ndarray] = None,
+                 max_megapixels: Optional[float] = None,
+                 buffer_pool: Optional[BufferPool] = None,
+                 point_source: str = PointSource.RANDOM,
+                 contour_tolerance: float = 2.0,
+                 stage_workers: int = 2,
+                 analysis: Optional[ImageAnalysis] = None,
+                 edge_detector: str = EdgeDetector.FULL):
         """
         Initialise le générateur low poly
         
@@ -23,47 +127,74 @@ class LowPolyGenerator:
             blur_strength: Force du flou pour lisser l'image (doit être impair)
             enhance_colors: Si True, augmente la saturation et le contraste
             edge_sensitivity: Sensibilité de détection des contours (1-5)
+            image: Image BGR déjà décodée (si fournie, image_path n'est pas relu)
+            max_megapixels: Taille maximale de travail en mégapixels (None = pleine résolution)
+            buffer_pool: Pool de buffers réutilisés entre images (mode mémoire réduite)
+            point_source: Placement des points de contour (PointSource.RANDOM ou CONTOURS)
+            contour_tolerance: Écart maximal (pixels) lors de la simplification des contours
+            stage_workers: Threads pour les étapes indépendantes du pipeline (1 = séquentiel)
+            analysis: Analyse partagée avec d'autres moteurs (fournit aussi l'image)
+            edge_detector: Niveau de détection de contours (EdgeDetector)
         """
+        if point_source not in (PointSource.RANDOM, PointSource.CONTOURS):
+            raise ValueError(f"Source de points inconnue: {point_source}")
+        if edge_detector not in (EdgeDetector.SOBEL, EdgeDetector.CANNY, EdgeDetector.FULL):
+            raise ValueError(f"Détecteur de contours inconnu: {edge_detector}")
+        
         self.image_path = image_path
         self.num_points = num_points
         self.blur_strength = blur_strength if blur_strength % 2 == 1 else blur_strength + 1
         self.enhance_colors = enhance_colors
         self.edge_sensitivity = max(1, min(5, edge_sensitivity))
+        self.buffer_pool = buffer_pool
+        self.point_source = point_source
+        self.contour_tolerance = contour_tolerance
+        self.edge_detector = edge_detector
+        self.stage_workers = stage_workers
+        self.stage_graph: Optional[StageGraph] = None
+        self.stage_timings: Dict[str, StageTiming] = {}
+        self.primitives: Dict[str, int] = {}
         
         # Charger l'image
-        self.image = cv2.imread(image_path)
+        if image is None and analysis is not None:
+            image = analysis.image
+        self.image = image if image is not None else load_image(image_path, max_megapixels)
         if self.image is None:
             raise ValueError(f"Impossible de charger l'image: {image_path}")
         
-        self.image_rgb = cv2.cvtColor(self.image, cv2.COLOR_BGR2RGB)
         self.height, self.width = self.image.shape[:2]
+        self.analysis = analysis if analysis is not None else ImageAnalysis(self.image, buffer_pool)
+    
+    @property
+    def image_rgb(self) -> np.ndarray:
+        """Image en RGB (calculée à la demande, non conservée)"""
+        return cv2.cvtColor(self.image, cv2.COLOR_BGR2RGB)
+    
+    def _buffer(self, name: str, shape: Tuple[int, ...], dtype=np.uint8) -> Optional[np.ndarray]:
+        """Buffer réutilisable du pool (None sans pool)"""
+        return pool_get(self.buffer_pool, name, shape, dtype)
         
     def detect_edges(self) -> np.ndarray:
         """
         Détecte les contours de l'image avec une meilleure sensibilité
-        Utilise une combinaison de techniques pour une meilleure détection
+        
+        Selon edge_detector :
+        - FULL : CLAHE pour le contraste local, Canny, légère dilatation
+        - CANNY : même chaîne sans CLAHE (le plus coûteux sur les grandes images)
+        - SOBEL : seuil sur le gradient, au seuil haut de Canny
+        Les résultats sont mis en cache par l'analyse partagée.
         
         Returns:
             Image des contours détectés
         """
-        gray = cv2.cvtColor(self.image, cv2.COLOR_BGR2GRAY)
-        
-        # Appliquer CLAHE (Contrast Limited Adaptive Histogram Equalization)
-        # pour améliorer le contraste local
-        clahe = cv2.createCLAHE(clipLimit=2.0, tileGridSize=(8, 8))
-        gray_enhanced = clahe.apply(gray)
-        
         # Adapter les seuils Canny selon la sensibilité
         low_threshold = max(30, 100 - (self.edge_sensitivity * 15))
         high_threshold = min(200, 200 - (self.edge_sensitivity * 20))
         
-        edges = cv2.Canny(gray_enhanced, low_threshold, high_threshold)
-        
-        # Appliquer une dilatation légère pour épaissir les contours
-        kernel = cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (2, 2))
-        edges = cv2.dilate(edges, kernel, iterations=1)
-        
-        return edges
+        if self.edge_detector == EdgeDetector.SOBEL:
+            return self.analysis.gradient_edges(high_threshold)
+        return self.analysis.edges(low_threshold, high_threshold, dilate=True,
+                                   equalize=self.edge_detector == EdgeDetector.FULL)
     
     def enhance_color_image(self, image_rgb: np.ndarray) -> np.ndarray:
         """
@@ -75,29 +206,34 @@ class LowPolyGenerator:
         Returns:
             Image améliorée
         """
-        # Convertir en HSV pour manipuler la saturation
-        hsv = cv2.cvtColor(cv2.cvtColor(image_rgb, cv2.COLOR_RGB2BGR), cv2.COLOR_BGR2HSV).astype(np.float32)
-        
-        # Augmenter la saturation (canal S)
-        hsv[:, :, 1] = np.clip(hsv[:, :, 1] * 1.3, 0, 255)
-        
-        # Augmenter légèrement la luminosité (canal V)
-        hsv[:, :, 2] = np.clip(hsv[:, :, 2] * 1.1, 0, 255)
-        
-        # Convertir back to RGB
-        hsv = hsv.astype(np.uint8)
-        enhanced_bgr = cv2.cvtColor(hsv, cv2.COLOR_HSV2BGR)
-        enhanced_rgb = cv2.cvtColor(enhanced_bgr, cv2.COLOR_BGR2RGB)
+        enhanced_bgr = self._enhance_bgr(cv2.cvtColor(image_rgb, cv2.COLOR_RGB2BGR))
+        return cv2.cvtColor(enhanced_bgr, cv2.COLOR_BGR2RGB)
+    
+    def _enhance_bgr(self, image_bgr: np.ndarray, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Améliore saturation (+30%) et luminosité (+10%) d'une image BGR
         
-        return enhanced_rgb
+        Args:
+            image_bgr: Image en BGR
+            out: Buffer de sortie (peut être image_bgr pour travailler en place)
+            
+        Returns:
+            Image améliorée en BGR
+        """
+        # Convertir en HSV et appliquer les tables S/V en place
+        hsv = cv2.cvtColor(image_bgr, cv2.COLOR_BGR2HSV,
+                           dst=self._buffer("hsv", image_bgr.shape))
+        cv2.LUT(hsv, ENHANCE_LUT, dst=hsv)
+        return cv2.cvtColor(hsv, cv2.COLOR_HSV2BGR, dst=out)
     
-    def generate_points(self, use_edges: bool = True) -> np.ndarray:
+    def generate_points(self, use_edges: bool = True, edges: Optional[np.ndarray] = None) -> np.ndarray:
         """
         Génère les points pour la triangulation
         Combine points aléatoires et points basés sur les contours
         
         Args:
             use_edges: Si True, priorise les points sur les contours
+            edges: Carte de contours pré-calculée (optionnel)
             
         Returns:
             Array de points [x, y]
@@ -114,10 +250,17 @@ class LowPolyGenerator:
         
         if use_edges:
             # Déterminer les contours
-            edges = self.detect_edges()
+            if edges is None:
+                edges = self.detect_edges()
             
-            # Trouver les pixels de contour
-            edge_points = np.argwhere(edges > 0)  # Returns [y, x]
+            if self.point_source == PointSource.CONTOURS:
+                # Sommets des contours simplifiés : les points suivent les bords
+                max_contour_points = int(self.num_points * 0.6)
+                points.extend(self.extract_contour_points(edges, max_contour_points).tolist())
+                edge_points = []
+            else:
+                # Trouver les pixels de contour
+                edge_points = np.argwhere(edges > 0)  # Returns [y, x]
             
             # Garder ~40% des points détectés sur les contours (augmenté de 30%)
             if len(edge_points) > 0:
@@ -137,6 +280,39 @@ class LowPolyGenerator:
         
         return np.array(points, dtype=np.float32)
     
+    def extract_contour_points(self, edges: np.ndarray, max_points: int) -> np.ndarray:
+        """
+        Extrait les sommets des contours simplifiés de la carte de contours
+        
+        Les contours sont simplifiés avec approxPolyDP (tolérance
+        contour_tolerance) ; si leurs sommets dépassent le budget, un
+        sous-ensemble est tiré sur l'ensemble des contours.
+        
+        Args:
+            edges: Carte de contours (uint8)
+            max_points: Nombre maximal de sommets
+            
+        Returns:
+            Array de points [x, y] (float32)
+        """
+        contours, _ = cv2.findContours(edges, cv2.RETR_LIST, cv2.CHAIN_APPROX_SIMPLE)
+        
+        # Ignorer les fragments plus courts que quelques tolérances (bruit)
+        min_length = 4 * self.contour_tolerance
+        polylines = [cv2.approxPolyDP(c, self.contour_tolerance, False).reshape(-1, 2)
+                     for c in contours if cv2.arcLength(c, False) >= min_length]
+        if not polylines:
+            return np.empty((0, 2), dtype=np.float32)
+        
+        # Les deux bords d'un contour épais partagent des sommets
+        vertices = np.unique(np.concatenate(polylines), axis=0)
+        
+        # Au-delà du budget, garder un sous-ensemble réparti sur tous les contours
+        if len(vertices) > max_points:
+            keep = np.random.choice(len(vertices), max_points, replace=False)
+            vertices = vertices[keep]
+        return vertices.astype(np.float32)
+    
     def triangulate(self, points: np.ndarray) -> Delaunay:
         """
         Crée une triangulation de Delaunay à partir des points
@@ -165,12 +341,19 @@ class LowPolyGenerator:
         # Obtenir les coordonnées du triangle
         tri_points = points[triangle_indices].astype(np.int32)
         
+        # Limiter le masque au rectangle englobant du triangle
+        x0, y0 = np.maximum(tri_points.min(axis=0), 0)
+        x1 = min(int(tri_points[:, 0].max()) + 1, self.width)
+        y1 = min(int(tri_points[:, 1].max()) + 1, self.height)
+        if x1 <= x0 or y1 <= y0:
+            return (128, 128, 128)
+        
         # Créer un masque du triangle
-        mask = np.zeros((self.height, self.width), dtype=np.uint8)
-        cv2.drawContours(mask, [tri_points], 0, 255, -1)
+        mask = np.zeros((y1 - y0, x1 - x0), dtype=np.uint8)
+        cv2.drawContours(mask, [tri_points], 0, 255, -1, offset=(-int(x0), -int(y0)))
         
         # Calculer la couleur moyenne dans le triangle
-        colors = base_image[mask > 0]
+        colors = base_image[y0:y1, x0:x1][mask > 0]
         if len(colors) > 0:
             mean_color = np.mean(colors, axis=0).astype(int)
             # Retourner en tuple pour OpenCV
@@ -183,42 +366,38 @@ class LowPolyGenerator:
         Applique un flou gaussien pour lisser les couleurs
         
         Returns:
-            Image lissée en BGR
+            Image lissée en BGR (partagée : ne pas modifier en place)
         """
-        return cv2.GaussianBlur(self.image, 
-                               (self.blur_strength, self.blur_strength), 0)
+        return self.analysis.blurred(self.blur_strength)
     
-    def generate(self, use_edge_detection: bool = True, add_outlines: bool = True) -> Image.Image:
+    def render_triangles(self, points: np.ndarray, tri: Delaunay, smoothed: np.ndarray,
+                         add_outlines: bool = True, simplices: Optional[np.ndarray] = None,
+                         output: Optional[np.ndarray] = None) -> np.ndarray:
         """
-        Génère l'image low poly cartoon
+        Dessine la triangulation colorée
         
         Args:
-            use_edge_detection: Si True, détecte les contours pour améliorer les détails
+            points: Array de points [x, y]
+            tri: Triangulation de Delaunay
+            smoothed: Image lissée en BGR pour le calcul des couleurs
             add_outlines: Si True, dessine les contours des triangles
+            simplices: Sous-ensemble des triangles à dessiner (défaut: tous)
+            output: Image BGR sur laquelle dessiner (défaut: nouvelle image noire)
             
         Returns:
-            Image PIL de l'image low poly
+            Image BGR du rendu
         """
-        # Lisser l'image pour réduire le bruit
-        smoothed = self.smooth_image()
-        
-        # Améliorer les couleurs si demandé
-        if self.enhance_colors:
-            smoothed_rgb = cv2.cvtColor(smoothed, cv2.COLOR_BGR2RGB)
-            smoothed_rgb = self.enhance_color_image(smoothed_rgb)
-            smoothed = cv2.cvtColor(smoothed_rgb, cv2.COLOR_RGB2BGR)
-        
-        # Générer les points
-        points = self.generate_points(use_edges=use_edge_detection)
-        
-        # Triangulation
-        tri = self.triangulate(points)
-        
         # Créer l'image de sortie
-        output = np.zeros_like(smoothed)
+        if output is None:
+            if self.buffer_pool is not None:
+                output = self.buffer_pool.zeros("output", smoothed.shape)
+            else:
+                output = np.zeros_like(smoothed)
+        if simplices is None:
+            simplices = tri.simplices
         
         # Dessiner chaque triangle
-        for triangle_indices in tri.simplices:
+        for triangle_indices in simplices:
             # Obtenir les points du triangle
             tri_points = points[triangle_indices].astype(np.int32)
             
@@ -232,8 +411,69 @@ class LowPolyGenerator:
             if add_outlines:
                 cv2.drawContours(output, [tri_points], 0, (0, 0, 0), 2)
         
-        # Convertir en image PIL
-        output_rgb = cv2.cvtColor(output, cv2.COLOR_BGR2RGB)
+        return output
+    
+    def generate(self, use_edge_detection: bool = True, add_outlines: bool = True,
+                 smoothed: Optional[np.ndarray] = None,
+                 edges: Optional[np.ndarray] = None) -> Image.Image:
+        """
+        Génère l'image low poly cartoon
+        
+        Les deux branches indépendantes (flou → couleurs, et contours →
+        points → triangulation) sont exécutées en parallèle quand
+        stage_workers > 1 ; la durée de chaque étape est conservée dans
+        self.stage_timings.
+        
+        Args:
+            use_edge_detection: Si True, détecte les contours pour améliorer les détails
+            add_outlines: Si True, dessine les contours des triangles
+            smoothed: Image lissée (et améliorée) pré-calculée en BGR (optionnel)
+            edges: Carte de contours pré-calculée (optionnel)
+            
+        Returns:
+            Image PIL de l'image low poly
+        """
+        graph = StageGraph()
+        
+        # Branche couleurs : lisser l'image pour réduire le bruit, puis
+        # améliorer les couleurs si demandé
+        if smoothed is None:
+            graph.add("smooth", self.smooth_image)
+            if self.enhance_colors:
+                # Le flou appartient à l'analyse partagée : l'amélioration
+                # écrit dans son propre buffer
+                graph.add("enhance",
+                          lambda img: self._enhance_bgr(img, out=self._buffer("enhanced", img.shape)),
+                          deps=["smooth"])
+            color_stage = "enhance" if self.enhance_colors else "smooth"
+        else:
+            graph.add("smooth", lambda: smoothed)
+            color_stage = "smooth"
+        
+        # Branche géométrie : contours → points → triangulation
+        point_deps = []
+        if use_edge_detection and edges is None:
+            graph.add("edges", self.detect_edges)
+            point_deps = ["edges"]
+        graph.add("points",
+                  lambda *found: self.generate_points(use_edges=use_edge_detection,
+                                                      edges=found[0] if found else edges),
+                  deps=point_deps)
+        graph.add("triangulate", self.triangulate, deps=["points"])
+        
+        # Rendu : attend les deux branches
+        graph.add("render",
+                  lambda img, points, tri: self.render_triangles(points, tri, img, add_outlines),
+                  deps=[color_stage, "points", "triangulate"])
+        
+        results = graph.run(workers=self.stage_workers)
+        self.stage_graph = graph
+        self.stage_timings = graph.timings
+        self.primitives = {"triangles": len(results["triangulate"].simplices)}
+        output = results["render"]
+        
+        # Convertir en image PIL (Image.fromarray copie les données RGB)
+        output_rgb = cv2.cvtColor(output, cv2.COLOR_BGR2RGB, dst=output)
         output_pil = Image.fromarray(output_rgb)
         return output_pil
     
@@ -255,7 +495,10 @@ class LowPolyGenerator:
 
 def process_image(input_path: str, output_path: str, num_points: int = 1000, 
                  blur_strength: int = 15, add_outlines: bool = True,
-                 enhance_colors: bool = True, edge_sensitivity: int = 2) -> None:
+                 enhance_colors: bool = True, edge_sensitivity: int = 2,
+                 max_megapixels: Optional[float] = None,
+                 point_source: str = PointSource.RANDOM,
+                 contour_tolerance: float = 2.0) -> None:
     """
     Fonction utilitaire pour traiter une image en low poly
     
@@ -267,8 +510,14 @@ def process_image(input_path: str, output_path: str, num_points: int = 1000,
         add_outlines: Ajouter les contours des triangles
         enhance_colors: Augmenter la saturation et le contraste
         edge_sensitivity: Sensibilité de détection des contours (1-5)
+        max_megapixels: Taille maximale de travail en mégapixels
+        point_source: Placement des points de contour (PointSource)
+        contour_tolerance: Simplification des contours en pixels (PointSource.CONTOURS)
     """
     generator = LowPolyGenerator(input_path, num_points, blur_strength, 
-                                enhance_colors, edge_sensitivity)
+                                enhance_colors, edge_sensitivity,
+                                max_megapixels=max_megapixels,
+                                point_source=point_source,
+                                contour_tolerance=contour_tolerance)
     image = generator.generate(use_edge_detection=True, add_outlines=add_outlines)
     generator.save(output_path, image)
@@ -0,0 +1,216 @@
+"""
+Moteur mixte - Formes hybrides dans les zones plates et triangulation
+de Delaunay réservée aux zones détaillées
+"""
+from typing import Dict, Optional
+
+import cv2
+import numpy as np
+from PIL import Image
+
+from src.advanced_shapes import CellLayout, HybridLowPolyGenerator
+from src.analysis import ImageAnalysis
+from src.buffer_pool import BufferPool
+from src.low_poly import LowPolyGenerator
+
+
+class MixedLowPolyGenerator:
+    """
+    Combine les deux moteurs sur une même image
+
+    Une seule carte de contours découpe l'image en cellules (quadtree par
+    défaut) : les cellules peu denses reçoivent une forme hybride, les
+    cellules de taille minimale riches en contours sont triangulées. Le
+    budget de points est proportionnel à la surface détaillée, ce qui
+    garde la densité de triangles du mode classique là où elle compte et
+    remplace le reste par une forme par cellule.
+    """
+
+    def __init__(self, image_path: str, num_points: int = 1000, blur_strength: int = 18,
+                 enhance_colors: bool = True, edge_sensitivity: int = 2,
+                 grid_size: int = 25, detail_threshold: float = 0.5,
+                 adaptive: bool = True, adaptive_levels: int = 3,
+                 max_megapixels: Optional[float] = None,
+                 buffer_pool: Optional[BufferPool] = None,
+                 image: Optional[np.ndarray] = None,
+                 analysis: Optional[ImageAnalysis] = None):
+        """
+        Initialise le moteur mixte
+
+        Args:
+            image_path: Chemin vers l'image
+            num_points: Points qu'aurait le mode classique sur toute l'image
+            blur_strength: Force du flou
+            enhance_colors: Amélioration des couleurs
+            edge_sensitivity: Sensibilité des contours (1-5)
+            grid_size: Taille des cellules (taille minimale en mode adaptatif)
+            detail_threshold: Densité de contours (0-1) à partir de laquelle une cellule est triangulée
+            adaptive: Cellules plates regroupées en quadtree (grandes formes dans les zones unies)
+            adaptive_levels: Subdivisions possibles en mode adaptatif
+            max_megapixels: Taille maximale de travail en mégapixels (None = pleine résolution)
+            buffer_pool: Pool de buffers réutilisés entre images (mode mémoire réduite)
+            image: Image BGR déjà décodée (si fournie, image_path n'est pas relu)
+            analysis: Analyse partagée avec d'autres moteurs (fournit aussi l'image)
+        """
+        self.classic = LowPolyGenerator(
+            image_path,
+            num_points=num_points,
+            blur_strength=blur_strength,
+            enhance_colors=enhance_colors,
+            edge_sensitivity=edge_sensitivity,
+            image=image,
+            max_megapixels=max_megapixels,
+            buffer_pool=buffer_pool,
+            analysis=analysis
+        )
+        self.image_path = image_path
+        self.image = self.classic.image
+        self.analysis = self.classic.analysis
+        self.height, self.width = self.image.shape[:2]
+        self.num_points = num_points
+        self.grid_size = grid_size
+        self.detail_threshold = detail_threshold
+        self.adaptive = adaptive
+        self.adaptive_levels = adaptive_levels
+        self.buffer_pool = buffer_pool
+        self.primitives: Dict[str, int] = {}
+
+    def detail_points(self, detail_layout: CellLayout, detail: np.ndarray,
+                      edges: np.ndarray) -> np.ndarray:
+        """
+        Points de triangulation limités aux cellules détaillées
+
+        Les coins de grille en bordure de la zone détaillée ancrent la
+        triangulation sur les cellules ; le budget restant est réparti
+        entre pixels de contour et points aléatoires, comme en mode classique.
+
+        Args:
+            detail_layout: Cellules détaillées
+            detail: Masque (lignes, colonnes) des cellules détaillées sur la grille de grid_size
+            edges: Carte de contours
+
+        Returns:
+            Array de points [x, y]
+        """
+        grid = self.grid_size
+
+        # Coins touchant à la fois une cellule détaillée et une cellule plate
+        # (ou le bord de l'image)
+        padded = np.pad(detail, 1)
+        touching = np.stack([padded[:-1, :-1], padded[:-1, 1:], padded[1:, :-1], padded[1:, 1:]])
+        boundary = touching.any(axis=0) & ~touching.all(axis=0)
+        corner_rows, corner_cols = np.nonzero(boundary)
+        corners = np.stack([np.minimum(corner_cols * grid, self.width - 1),
+                            np.minimum(corner_rows * grid, self.height - 1)], axis=1)
+
+        widths = detail_layout.x1 - detail_layout.x0
+        heights = detail_layout.y1 - detail_layout.y0
+        budget = int(self.num_points * np.sum(widths * heights) / (self.width * self.height))
+
+        # Pixels de contour situés dans une cellule détaillée
+        edge_points = np.argwhere(edges > 0)  # [y, x]
+        edge_points = edge_points[detail[edge_points[:, 0] // grid, edge_points[:, 1] // grid]]
+        sensitivity = self.classic.edge_sensitivity
+        edge_ratio = min(0.4, max(0.2, 0.4 - (sensitivity - 1) * 0.05))
+        num_edge_points = min(int(budget * edge_ratio), len(edge_points))
+        edge_sample = edge_points[np.random.choice(len(edge_points), num_edge_points, replace=False)]
+
+        # Points aléatoires dans des cellules détaillées tirées au hasard
+        num_random = max(0, budget - num_edge_points)
+        cells = np.random.randint(0, len(detail_layout), num_random)
+        offsets = np.random.rand(num_random, 2)
+        random_points = np.stack([detail_layout.x0[cells] + offsets[:, 0] * widths[cells],
+                                  detail_layout.y0[cells] + offsets[:, 1] * heights[cells]], axis=1)
+
+        return np.concatenate([corners, edge_sample[:, ::-1], random_points]).astype(np.float32)
+
+    def paint_background(self, output: np.ndarray, layout: CellLayout):
+        """
+        Remplit chaque cellule de sa couleur moyenne
+
+        Les cellules sont peintes sur la grille de grid_size (une valeur
+        par cellule minimale) puis agrandies en une opération.
+
+        Args:
+            output: Image BGR de destination
+            layout: Toutes les cellules
+        """
+        grid = self.grid_size
+        rows, cols = -(-self.height // grid), -(-self.width // grid)
+        colors = np.zeros((rows, cols, 3), dtype=np.uint8)
+        r0, c0 = layout.y0 // grid, layout.x0 // grid
+        r1, c1 = -(-layout.y1 // grid), -(-layout.x1 // grid)
+
+        single = (r1 - r0 == 1) & (c1 - c0 == 1)
+        colors[r0[single], c0[single]] = layout.mean_color[single]
+        for index in np.flatnonzero(~single).tolist():
+            colors[r0[index]:r1[index], c0[index]:c1[index]] = layout.mean_color[index]
+
+        background = np.repeat(np.repeat(colors, grid, axis=0), grid, axis=1)
+        output[:] = background[:self.height, :self.width]
+
+    def generate(self, add_outlines: bool = True) -> Image.Image:
+        """
+        Génère l'image : triangles dans le détail, formes ailleurs
+
+        Args:
+            add_outlines: Contours noirs autour des triangles et des formes
+
+        Returns:
+            Image PIL
+        """
+        classic = self.classic
+
+        # Couleurs et contours communs aux deux moteurs
+        smoothed = classic.smooth_image()
+        if classic.enhance_colors:
+            smoothed = classic._enhance_bgr(smoothed, out=classic._buffer("enhanced", smoothed.shape))
+        edges = classic.detect_edges()
+
+        hybrid = HybridLowPolyGenerator(self.image_path, edges=edges, analysis=self.analysis)
+        layout = hybrid.cell_layout(self.grid_size, smoothed, self.adaptive, self.adaptive_levels)
+
+        # Cellules triangulées : taille minimale et riches en contours
+        is_detail = ((layout.edge_density >= self.detail_threshold)
+                     & (layout.size == self.grid_size / 2))
+        detail = np.zeros((-(-self.height // self.grid_size), -(-self.width // self.grid_size)),
+                          dtype=bool)
+        detail_layout = layout.subset(is_detail)
+        detail[detail_layout.y0 // self.grid_size, detail_layout.x0 // self.grid_size] = True
+
+        if self.buffer_pool is not None:
+            output = self.buffer_pool.get("output", smoothed.shape)
+        else:
+            output = np.empty_like(smoothed)
+
+        # Fond : couleur moyenne de chaque cellule. Il remplit l'espace entre
+        # les formes et les interstices que la triangulation (non contrainte)
+        # laisse le long des bords de la zone détaillée
+        self.paint_background(output, layout)
+
+        num_triangles = 0
+        if detail.any():
+            points = self.detail_points(detail_layout, detail, edges)
+            if len(points) >= 3:
+                tri = classic.triangulate(points)
+                # Garder les triangles dont le centre tombe dans une cellule détaillée
+                centroids = points[tri.simplices].mean(axis=1).astype(int)
+                kept = tri.simplices[detail[centroids[:, 1] // self.grid_size,
+                                            centroids[:, 0] // self.grid_size]]
+                classic.render_triangles(points, tri, smoothed, add_outlines,
+                                         simplices=kept, output=output)
+                num_triangles = len(kept)
+
+        # Une forme par cellule plate, dessinée par-dessus
+        flat_layout = layout.subset(~is_detail)
+        shape_indices = hybrid.shape_indices_for(flat_layout)
+        polygons = hybrid.build_cell_polygons(flat_layout.centers, flat_layout.size, shape_indices)
+        hybrid.draw_polygons(output, polygons, flat_layout.mean_color,
+                             outline_thickness=1 if add_outlines else 0)
+
+        self.primitives = {"triangles": num_triangles, "formes": len(flat_layout)}
+        print(f"📊 Mixte: {num_triangles} triangles ({len(detail_layout)} cellules détaillées), "
+              f"{len(flat_layout)} formes")
+
+        output_rgb = cv2.cvtColor(output, cv2.COLOR_BGR2RGB, dst=output)
+        return Image.fromarray(output_rgb)
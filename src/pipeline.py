@@ -0,0 +1,121 @@
+"""
+Graphe d'étapes du pipeline - Exécute les étapes indépendantes
+en parallèle sur un pool de threads et mesure leur durée
+"""
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Sequence, Tuple
+
+
+@dataclass
+class StageTiming:
+    """Fenêtre d'exécution d'une étape (secondes depuis le début du graphe)"""
+    name: str
+    start: float
+    end: float
+    thread: str = ""
+
+    @property
+    def duration(self) -> float:
+        """Durée de l'étape"""
+        return self.end - self.start
+
+
+class StageGraph:
+    """
+    Graphe de dépendances entre étapes
+
+    Chaque étape reçoit en arguments positionnels les résultats de ses
+    dépendances, dans l'ordre où elles sont déclarées. Les OpenCV et
+    NumPy relâchent le GIL, donc deux branches indépendantes se
+    chevauchent réellement sur un pool de threads.
+    """
+
+    def __init__(self):
+        self._stages: Dict[str, Tuple[Callable[..., Any], Tuple[str, ...]]] = {}
+        self.timings: Dict[str, StageTiming] = {}
+
+    def add(self, name: str, func: Callable[..., Any], deps: Sequence[str] = ()) -> "StageGraph":
+        """
+        Ajoute une étape
+
+        Args:
+            name: Nom unique de l'étape
+            func: Fonction appelée avec les résultats des dépendances
+            deps: Noms des étapes dont elle dépend (déjà ajoutées)
+
+        Returns:
+            Le graphe (pour chaîner les appels)
+        """
+        if name in self._stages:
+            raise ValueError(f"Étape déjà définie: {name}")
+        missing = [d for d in deps if d not in self._stages]
+        if missing:
+            raise ValueError(f"Dépendances inconnues pour '{name}': {missing}")
+        self._stages[name] = (func, tuple(deps))
+        return self
+
+    def run(self, workers: int = 2) -> Dict[str, Any]:
+        """
+        Exécute toutes les étapes
+
+        Args:
+            workers: Nombre de threads (1 = exécution séquentielle dans l'ordre d'ajout)
+
+        Returns:
+            Dictionnaire nom d'étape → résultat
+        """
+        self.timings = {}
+        results: Dict[str, Any] = {}
+        origin = time.perf_counter()
+
+        def execute(name: str) -> Any:
+            func, deps = self._stages[name]
+            start = time.perf_counter() - origin
+            value = func(*(results[d] for d in deps))
+            self.timings[name] = StageTiming(name, start, time.perf_counter() - origin,
+                                             threading.current_thread().name)
+            return value
+
+        if workers <= 1:
+            for name in self._stages:
+                results[name] = execute(name)
+            return results
+
+        pending = dict(self._stages)
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="stage") as executor:
+            running = {}
+            while pending or running:
+                # Lancer toutes les étapes dont les dépendances sont prêtes
+                for name, (_, deps) in list(pending.items()):
+                    if all(d in results for d in deps):
+                        running[executor.submit(execute, name)] = name
+                        del pending[name]
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    # Propage la première exception rencontrée
+                    results[running.pop(future)] = future.result()
+        return results
+
+    def overlap(self) -> float:
+        """
+        Temps gagné par le parallélisme
+
+        Returns:
+            Somme des durées des étapes moins la durée totale du graphe
+        """
+        if not self.timings:
+            return 0.0
+        total = sum(t.duration for t in self.timings.values())
+        span = max(t.end for t in self.timings.values()) - min(t.start for t in self.timings.values())
+        return max(0.0, total - span)
+
+    def format_timings(self) -> List[str]:
+        """Lignes lisibles de la chronologie des étapes"""
+        lines = []
+        for timing in sorted(self.timings.values(), key=lambda t: t.start):
+            lines.append(f"  {timing.name:12} {timing.start * 1000:8.1f} → {timing.end * 1000:8.1f} ms "
+                         f"({timing.duration * 1000:7.1f} ms) [{timing.thread}]")
+        return lines
@@ -19,6 +19,7 @@ class Preset:
     points: int = 1000
     blur_strength: int = 18
     edge_sensitivity: int = 2
+    edge_detector: str = "full"  # "sobel", "canny" ou "full" (voir EdgeDetector)
     enhance_colors: bool = True
     add_outlines: bool = True
     
@@ -67,13 +68,14 @@ class PresetManager:
         # Charger les presets existants
         self._load_presets()
         
-        # Créer les presets par défaut s'ils n'existent pas
-        if not self.presets:
-            self._create_default_presets()
+        # Ajouter les presets par défaut absents (premier lancement ou
+        # presets ajoutés depuis la création du fichier)
+        self._add_missing_defaults()
     
-    def _create_default_presets(self):
-        """Crée les presets par défaut"""
-        defaults = [
+    @staticmethod
+    def _default_presets() -> List[Preset]:
+        """Presets fournis avec PolyGen"""
+        return [
             Preset(
                 name="Équilibré",
                 description="Rendu équilibré - recommandé pour la plupart des images",
@@ -124,6 +126,17 @@ class PresetManager:
                 enhance_colors=True,
                 add_outlines=True
             ),
+            Preset(
+                name="Lot Rapide",
+                description="Gros volumes - contours Sobel, sans CLAHE",
+                mode="classic",
+                points=1000,
+                blur_strength=18,
+                edge_sensitivity=2,
+                edge_detector="sobel",
+                enhance_colors=True,
+                add_outlines=True
+            ),
             Preset(
                 name="Hybride Équilibré",
                 description="Formes mixtes - rendu naturel et efficace",
@@ -149,10 +162,14 @@ class PresetManager:
                 add_outlines=True
             ),
         ]
-        
-        for preset in defaults:
+    
+    def _add_missing_defaults(self):
+        """Ajoute les presets par défaut absents, sans toucher aux presets existants"""
+        missing = [preset for preset in self._default_presets() if preset.name not in self.presets]
+        if not missing:
+            return
+        for preset in missing:
             self.presets[preset.name] = preset
-        
         self.save_all()
     
     def _load_presets(self):
@@ -227,9 +244,7 @@ class PresetManager:
             return False
         
         # Empêcher la suppression des presets par défaut
-        default_names = {"Équilibré", "Artistique", "Détaillé", "Expressif", "Minimaliste",
-                        "Hybride Équilibré", "Hybride Détaillé", "Hybride Minimaliste"}
-        if name in default_names:
+        if name in {preset.name for preset in self._default_presets()}:
             print(f"⚠️  Cannot delete default preset '{name}'")
             return False
         
@@ -0,0 +1,236 @@
+"""
+Cache de résultats sur disque - Rendus et maillages indexés par le contenu
+de l'image et les paramètres effectifs, partagés par le batch, la CLI et la GUI
+"""
+import hashlib
+import os
+import shutil
+import tempfile
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from PIL import Image
+
+from src.batch_manifest import params_digest
+
+DEFAULT_CACHE_DIR = Path.home() / ".polygen" / "cache"
+DEFAULT_MAX_MB = 2048
+
+
+class ResultCache:
+    """
+    Cache adressé par contenu, borné en taille (éviction LRU)
+
+    Une entrée est identifiée par l'empreinte du fichier source et celle
+    des paramètres du rendu : une copie identique de l'image, dans un autre
+    dossier ou sous un autre nom, retrouve le même résultat. Les entrées
+    sont des fichiers (rendus) ou des archives .npz (maillages) rangés par
+    préfixe d'empreinte.
+
+    La date de modification sert d'horloge LRU : chaque lecture la remet
+    à l'heure courante, et quand la taille dépasse le plafond les entrées
+    les plus anciennes sont supprimées jusqu'à 90 % du plafond. Écritures
+    et suppressions passent par des renommages atomiques : plusieurs
+    processus (workers d'un lot, CLI, GUI) peuvent partager le dossier.
+    """
+
+    def __init__(self, root: Optional[str] = None, max_mb: float = DEFAULT_MAX_MB):
+        """
+        Initialise le cache
+
+        Args:
+            root: Dossier du cache (défaut: ~/.polygen/cache)
+            max_mb: Taille maximale en mégaoctets
+        """
+        self.root = Path(root) if root else DEFAULT_CACHE_DIR
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._size: Optional[int] = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(content_hash: str, params: Dict) -> str:
+        """
+        Clé d'une entrée
+
+        Args:
+            content_hash: Empreinte du fichier source (file_digest)
+            params: Paramètres effectifs du rendu
+
+        Returns:
+            Empreinte hexadécimale
+        """
+        return hashlib.sha256(f"{content_hash}:{params_digest(params)}".encode("utf-8")).hexdigest()
+
+    def _path(self, key: str, suffix: str) -> Path:
+        """Chemin d'une entrée (sous-dossier = deux premiers caractères de la clé)"""
+        return self.root / key[:2] / f"{key}{suffix}"
+
+    def _lookup(self, key: str, suffix: str) -> Optional[Path]:
+        """Entrée existante, marquée comme récemment utilisée"""
+        path = self._path(key, suffix)
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+        return path
+
+    def fetch(self, key: str, destination: str, suffix: Optional[str] = None) -> bool:
+        """
+        Copie un rendu en cache vers sa destination
+
+        Args:
+            key: Clé de l'entrée
+            destination: Fichier à écrire
+            suffix: Extension de l'entrée (défaut: celle de destination)
+
+        Returns:
+            True si le rendu était en cache
+        """
+        suffix = suffix or Path(destination).suffix.lower()
+        path = self._lookup(key, suffix)
+        if path is None:
+            return False
+        try:
+            shutil.copyfile(path, destination)
+        except FileNotFoundError:  # Évincée entre-temps par un autre processus
+            with self._lock:
+                self.hits -= 1
+                self.misses += 1
+            return False
+        return True
+
+    def get_image(self, key: str, suffix: str = ".png") -> Optional[Image.Image]:
+        """Rendu en cache chargé en image PIL (None si absent)"""
+        path = self._lookup(key, suffix)
+        if path is None:
+            return None
+        try:
+            with Image.open(path) as image:
+                return image.copy()
+        except FileNotFoundError:
+            return None
+
+    def get_arrays(self, key: str) -> Optional[Dict[str, np.ndarray]]:
+        """Maillage en cache (tableaux nommés), None si absent"""
+        path = self._lookup(key, ".npz")
+        if path is None:
+            return None
+        try:
+            with np.load(path) as data:
+                return {name: data[name] for name in data.files}
+        except FileNotFoundError:
+            return None
+
+    def put_file(self, key: str, source: str, suffix: Optional[str] = None):
+        """
+        Ajoute un rendu déjà écrit sur disque
+
+        Args:
+            key: Clé de l'entrée
+            source: Fichier à copier dans le cache
+            suffix: Extension de l'entrée (défaut: celle de source)
+        """
+        suffix = suffix or Path(source).suffix.lower()
+        self._store(key, suffix, lambda temp_path: shutil.copyfile(source, temp_path))
+
+    def put_image(self, key: str, image: Image.Image, suffix: str = ".png"):
+        """Ajoute un rendu en mémoire (encodé selon suffix)"""
+        image_format = Image.registered_extensions()[suffix]
+        self._store(key, suffix, lambda temp_path: image.save(temp_path, format=image_format))
+
+    def put_arrays(self, key: str, **arrays: np.ndarray):
+        """Ajoute un maillage (tableaux nommés, archive .npz)"""
+        def write(temp_path):
+            with open(temp_path, "wb") as f:
+                np.savez(f, **arrays)
+        self._store(key, ".npz", write)
+
+    def _store(self, key: str, suffix: str, write):
+        """Écrit une entrée dans un fichier temporaire puis la renomme"""
+        path = self._path(key, suffix)
+        path.parent.mkdir(exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        os.close(fd)
+        try:
+            write(temp_path)
+            os.replace(temp_path, path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+        self._added(path.stat().st_size)
+
+    def _added(self, nbytes: int):
+        """Met à jour la taille connue et évince au-delà du plafond"""
+        with self._lock:
+            if self._size is None:
+                self._size = self.size_on_disk()
+            else:
+                self._size += nbytes
+            over = self._size > self.max_bytes
+        if over:
+            self.evict()
+
+    def _entries(self) -> List[Tuple[float, int, Path]]:
+        """Entrées du cache : (date d'utilisation, taille, chemin)"""
+        entries = []
+        for directory in self.root.iterdir():
+            if not directory.is_dir():
+                continue
+            for path in directory.iterdir():
+                if path.suffix == ".tmp":
+                    continue
+                try:
+                    stat = path.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+        return entries
+
+    def size_on_disk(self) -> int:
+        """Taille totale des entrées"""
+        return sum(size for _, size, _ in self._entries())
+
+    def evict(self) -> int:
+        """
+        Supprime les entrées les moins récemment utilisées
+
+        Returns:
+            Nombre d'entrées supprimées
+        """
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        target = int(self.max_bytes * 0.9)
+        removed = 0
+        for _, size, path in entries:
+            if total <= target:
+                break
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+            total -= size
+            removed += 1
+        with self._lock:
+            self._size = total
+            self.evictions += removed
+        return removed
+
+    def clear(self):
+        """Vide le cache"""
+        for _, _, path in self._entries():
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+        with self._lock:
+            self._size = 0
@@ -0,0 +1,193 @@
+"""
+Images en mémoire partagée - Transmet les images décodées et les rendus
+entre le processus principal et les workers sans les sérialiser
+"""
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from multiprocessing import resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from src.buffer_pool import BufferPool
+
+# Blocs gardés ouverts par un worker (les blocs recyclés restent les mêmes)
+MAX_ATTACHED = 16
+
+
+@dataclass(frozen=True)
+class FrameRef:
+    """Référence picklable d'un tableau rangé dans un bloc partagé"""
+    name: str
+    shape: Tuple[int, ...]
+    dtype: str = "|u1"
+
+    @property
+    def nbytes(self) -> int:
+        """Taille du tableau"""
+        return int(np.prod(self.shape)) * np.dtype(self.dtype).itemsize
+
+
+def _view(block: SharedMemory, ref: FrameRef) -> np.ndarray:
+    """Tableau NumPy posé sur un bloc (sans copie)"""
+    return np.ndarray(ref.shape, dtype=ref.dtype, buffer=block.buf)
+
+
+class SharedFramePool:
+    """
+    Blocs de mémoire partagée recyclés d'une image à l'autre
+
+    Vit dans le processus principal, qui crée et supprime les blocs. Un
+    bloc libéré est réutilisé par la prochaine image qui y tient (le plus
+    petit bloc suffisant) : les workers, qui gardent leurs blocs ouverts,
+    n'ont pas à se rattacher à chaque image. Au-delà de max_free blocs
+    libres, les plus petits sont supprimés.
+    """
+
+    def __init__(self, max_free: int = 8):
+        """
+        Initialise le pool
+
+        Args:
+            max_free: Nombre maximal de blocs libres conservés
+        """
+        self.max_free = max_free
+        self._blocks: Dict[str, SharedMemory] = {}
+        self._free: List[SharedMemory] = []
+        self._lock = threading.Lock()
+        self.created = 0
+        self.reused = 0
+        # Suivi des blocs démarré avant les workers : ils en héritent au lieu
+        # d'en lancer un chacun, qui supprimerait leurs blocs à leur arrêt
+        resource_tracker.ensure_running()
+
+    def acquire(self, shape: Tuple[int, ...], dtype=np.uint8) -> FrameRef:
+        """
+        Réserve un bloc pour un tableau
+
+        Args:
+            shape: Forme du tableau
+            dtype: Type des éléments
+
+        Returns:
+            Référence du tableau (contenu non initialisé)
+        """
+        ref_dtype = np.dtype(dtype).str
+        nbytes = int(np.prod(shape)) * np.dtype(dtype).itemsize
+        with self._lock:
+            fitting = [block for block in self._free if block.size >= nbytes]
+            if fitting:
+                block = min(fitting, key=lambda b: b.size)
+                self._free.remove(block)
+                self.reused += 1
+            else:
+                block = SharedMemory(create=True, size=max(1, nbytes))
+                self._blocks[block.name] = block
+                self.created += 1
+        return FrameRef(block.name, tuple(shape), ref_dtype)
+
+    def put(self, array: np.ndarray) -> FrameRef:
+        """Copie un tableau dans un bloc réservé"""
+        ref = self.acquire(array.shape, array.dtype)
+        np.copyto(self.view(ref), array)
+        return ref
+
+    def view(self, ref: FrameRef) -> np.ndarray:
+        """Tableau d'un bloc réservé (processus principal)"""
+        return _view(self._blocks[ref.name], ref)
+
+    def release(self, ref: FrameRef):
+        """Rend un bloc au pool (les vues dessus ne doivent plus servir)"""
+        with self._lock:
+            self._free.append(self._blocks[ref.name])
+            while len(self._free) > self.max_free:
+                smallest = min(self._free, key=lambda b: b.size)
+                self._free.remove(smallest)
+                self._unlink(self._blocks.pop(smallest.name))
+
+    @staticmethod
+    def _unlink(block: SharedMemory):
+        """Ferme et supprime un bloc"""
+        try:
+            block.close()
+        except BufferError:  # Vue encore référencée : la mémoire suit sa durée de vie
+            pass
+        block.unlink()
+
+    def close(self):
+        """Supprime tous les blocs"""
+        with self._lock:
+            for block in self._blocks.values():
+                self._unlink(block)
+            self._blocks.clear()
+            self._free.clear()
+
+    @property
+    def nbytes(self) -> int:
+        """Mémoire partagée allouée"""
+        return sum(block.size for block in self._blocks.values())
+
+
+# Blocs ouverts par le processus courant (worker), du plus ancien au plus récent
+_attached: "OrderedDict[str, SharedMemory]" = OrderedDict()
+
+
+def attach(ref: FrameRef) -> np.ndarray:
+    """
+    Tableau d'un bloc partagé créé par un autre processus (sans copie)
+
+    Les blocs restent ouverts pour les images suivantes ; seuls les
+    MAX_ATTACHED plus récents sont conservés.
+
+    Args:
+        ref: Référence reçue du processus principal
+
+    Returns:
+        Vue NumPy sur le bloc
+    """
+    block = _attached.pop(ref.name, None)
+    if block is None:
+        block = SharedMemory(name=ref.name)
+    _attached[ref.name] = block
+    while len(_attached) > MAX_ATTACHED:
+        _, old = _attached.popitem(last=False)
+        try:
+            old.close()
+        except BufferError:
+            pass
+    return _view(block, ref)
+
+
+class OutputBufferPool(BufferPool):
+    """
+    Pool dont le buffer "output" est imposé
+
+    Les moteurs dessinent leur rendu dans le buffer "output" du pool :
+    en y plaçant une vue sur un bloc partagé, le rendu est écrit
+    directement là où le processus principal l'encodera. Les autres
+    buffers viennent du pool de base (ou sont alloués à chaque demande).
+    """
+
+    def __init__(self, output: np.ndarray, base: Optional[BufferPool] = None):
+        """
+        Initialise le pool
+
+        Args:
+            output: Tableau qui recevra le rendu
+            base: Pool des buffers intermédiaires (mode mémoire réduite)
+        """
+        super().__init__()
+        self.output = output
+        self.base = base
+        self.output_used = False
+
+    def get(self, name: str, shape: Tuple[int, ...], dtype=np.uint8) -> np.ndarray:
+        if (name == "output" and tuple(shape) == self.output.shape
+                and np.dtype(dtype) == self.output.dtype):
+            self.output_used = True
+            return self.output
+        if self.base is not None:
+            return self.base.get(name, shape, dtype)
+        return np.empty(shape, dtype=dtype)
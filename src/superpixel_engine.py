@@ -0,0 +1,188 @@
+"""
+Moteur superpixels - Segmente l'image en régions SLIC et dessine
+un polygone simplifié par région
+"""
+import math
+from typing import Dict, List, Optional, Tuple
+
+import cv2
+import numpy as np
+from PIL import Image
+from scipy import ndimage
+from skimage.segmentation import slic
+
+from src.buffer_pool import BufferPool
+from src.low_poly import ENHANCE_LUT, load_image
+
+
+class SuperpixelLowPolyGenerator:
+    """
+    Générateur low poly par régions SLIC
+
+    Quelques centaines de régions suivent les contours de l'image là où
+    la triangulation de Delaunay demanderait des milliers de triangles.
+    La segmentation se fait sur une version réduite de l'image (les
+    étiquettes sont ensuite agrandies) et les couleurs moyennes de toutes
+    les régions sont obtenues en une réduction (np.bincount).
+    """
+
+    def __init__(self, image_path: str, num_regions: int = 400, compactness: float = 10.0,
+                 enhance_colors: bool = True, simplify_tolerance: float = 2.0,
+                 segment_megapixels: Optional[float] = 0.25,
+                 max_megapixels: Optional[float] = None,
+                 buffer_pool: Optional[BufferPool] = None,
+                 image: Optional[np.ndarray] = None):
+        """
+        Initialise le générateur
+
+        Args:
+            image_path: Chemin vers l'image
+            num_regions: Nombre de régions visé
+            compactness: Compacité SLIC (plus élevé = régions plus régulières)
+            enhance_colors: Amélioration des couleurs (saturation, luminosité)
+            simplify_tolerance: Écart maximal (pixels) lors de la simplification des polygones
+            segment_megapixels: Taille de l'image segmentée (None = pleine résolution)
+            max_megapixels: Taille maximale de travail en mégapixels (None = pleine résolution)
+            buffer_pool: Pool de buffers réutilisés entre images (mode mémoire réduite)
+            image: Image BGR déjà décodée (si fournie, image_path n'est pas relu)
+        """
+        self.image = image if image is not None else load_image(image_path, max_megapixels)
+        if self.image is None:
+            raise ValueError(f"Impossible de charger l'image: {image_path}")
+
+        self.image_path = image_path
+        self.height, self.width = self.image.shape[:2]
+        self.num_regions = num_regions
+        self.compactness = compactness
+        self.enhance_colors = enhance_colors
+        self.simplify_tolerance = simplify_tolerance
+        self.segment_megapixels = segment_megapixels
+        self.buffer_pool = buffer_pool
+        self.primitives: Dict[str, int] = {}
+
+    def segment(self) -> Tuple[np.ndarray, float]:
+        """
+        Segmente l'image (réduite à segment_megapixels) en superpixels SLIC
+
+        Returns:
+            (étiquettes int32 de 0 au nombre de régions - 1, échelle de l'image segmentée)
+        """
+        image = self.image
+        scale = 1.0
+        if self.segment_megapixels is not None:
+            scale = min(1.0, math.sqrt(self.segment_megapixels * 1_000_000 / (self.width * self.height)))
+        if scale < 1.0:
+            size = (max(1, round(self.width * scale)), max(1, round(self.height * scale)))
+            image = cv2.resize(image, size, interpolation=cv2.INTER_AREA)
+
+        labels = slic(cv2.cvtColor(image, cv2.COLOR_BGR2RGB), n_segments=self.num_regions,
+                      compactness=self.compactness, start_label=0, channel_axis=-1)
+        return labels.astype(np.int32), scale
+
+    def full_labels(self, labels: np.ndarray) -> np.ndarray:
+        """Étiquettes agrandies à la taille de l'image (plus proche voisin)"""
+        if labels.shape == (self.height, self.width):
+            return labels
+        return cv2.resize(labels, (self.width, self.height), interpolation=cv2.INTER_NEAREST)
+
+    def region_colors(self, labels: np.ndarray, num_labels: Optional[int] = None) -> np.ndarray:
+        """
+        Couleur moyenne de chaque région en une réduction par étiquette
+
+        Args:
+            labels: Étiquettes des régions
+            num_labels: Nombre de régions (défaut: plus grande étiquette + 1)
+
+        Returns:
+            Array (régions, 3) des couleurs BGR uint8
+        """
+        flat_labels = labels.ravel()
+        if num_labels is None:
+            num_labels = int(flat_labels.max()) + 1
+        counts = np.bincount(flat_labels, minlength=num_labels)
+        pixels = self.image.reshape(-1, 3)
+        sums = np.stack([np.bincount(flat_labels, weights=pixels[:, c], minlength=num_labels)
+                         for c in range(3)], axis=1)
+        colors = np.round(sums / np.maximum(counts, 1)[:, None]).astype(np.uint8)
+
+        if self.enhance_colors:
+            # Même amélioration que le mode classique, sur une ligne de couleurs
+            hsv = cv2.cvtColor(colors[:, None, :], cv2.COLOR_BGR2HSV)
+            colors = cv2.cvtColor(cv2.LUT(hsv, ENHANCE_LUT), cv2.COLOR_HSV2BGR)[:, 0, :]
+        return colors
+
+    def region_polygons(self, labels: np.ndarray, scale: float = 1.0) -> List[Optional[np.ndarray]]:
+        """
+        Polygone simplifié de chaque région
+
+        Chaque région est traitée dans son rectangle englobant
+        (ndimage.find_objects) : contour extérieur puis approxPolyDP, à la
+        résolution de segmentation. Les sommets sont ensuite ramenés à
+        l'échelle de l'image.
+
+        Args:
+            labels: Étiquettes des régions (résolution de segmentation)
+            scale: Échelle de la segmentation par rapport à l'image
+
+        Returns:
+            Liste (indexée par étiquette) de polygones int32, None si la région est vide
+        """
+        polygons: List[Optional[np.ndarray]] = []
+        for label, bbox in enumerate(ndimage.find_objects(labels + 1)):
+            if bbox is None:
+                polygons.append(None)
+                continue
+            mask = (labels[bbox] == label).astype(np.uint8)
+            contours, _ = cv2.findContours(mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE,
+                                           offset=(bbox[1].start, bbox[0].start))
+            contour = max(contours, key=cv2.contourArea)
+            polygon = cv2.approxPolyDP(contour, self.simplify_tolerance, True)
+            if len(polygon) < 3:
+                polygons.append(None)
+                continue
+            if scale < 1.0:
+                # Centre des pixels de segmentation → centre des pixels de l'image
+                polygon = np.round((polygon + 0.5) / scale - 0.5).astype(np.int32)
+            polygons.append(polygon)
+        return polygons
+
+    def generate(self, add_outlines: bool = True) -> Image.Image:
+        """
+        Génère l'image : une région SLIC = un polygone uni
+
+        Le fond est peint avec la couleur de chaque pixel de région pour
+        combler les interstices laissés par la simplification des polygones.
+
+        Args:
+            add_outlines: Contours noirs autour des régions
+
+        Returns:
+            Image PIL
+        """
+        small_labels, scale = self.segment()
+        polygons = self.region_polygons(small_labels, scale)
+        labels = self.full_labels(small_labels)
+        colors = self.region_colors(labels, num_labels=len(polygons))
+
+        if self.buffer_pool is not None:
+            output = self.buffer_pool.get("output", self.image.shape)
+            np.take(colors, labels, axis=0, out=output)
+        else:
+            output = colors[labels]
+
+        drawn = [(polygon, color) for polygon, color in zip(polygons, colors.tolist())
+                 if polygon is not None]
+        # Contour extérieur seul (trous non découpés) : les régions qui en
+        # entourent d'autres sont plus grandes et passent donc en premier
+        drawn.sort(key=lambda item: -cv2.contourArea(item[0]))
+        for polygon, color in drawn:
+            cv2.fillPoly(output, [polygon], color)
+        if add_outlines and drawn:
+            cv2.polylines(output, [polygon for polygon, _ in drawn], True, (0, 0, 0), 1)
+
+        self.primitives = {"régions": len(drawn),
+                           "sommets": sum(len(polygon) for polygon, _ in drawn)}
+        print(f"📊 Superpixels: {len(drawn)} régions, {self.primitives['sommets']} sommets")
+
+        output_rgb = cv2.cvtColor(output, cv2.COLOR_BGR2RGB, dst=output)
+        return Image.fromarray(output_rgb)
@@ -1,14 +1,159 @@
 """
 Module pour l'export SVG vectoriel des images low poly
 """
+import gzip
+from functools import lru_cache
+from itertools import groupby
+from typing import Optional, Sequence, TextIO
+
 import numpy as np
 from scipy.spatial import Delaunay
-import xml.etree.ElementTree as ET
-from xml.dom import minidom
+
+# Taille du tampon d'écriture et nombre de polygones formatés par écriture
+WRITE_BUFFER = 1 << 20
+CHUNK_SIZE = 8192
+# Niveau gzip des .svgz : 1 % plus gros que le niveau 9, deux fois plus rapide
+GZIP_LEVEL = 6
+
+
+def open_svg(file_path: str, compress: Optional[bool] = None) -> TextIO:
+    """
+    Ouvre un fichier SVG en écriture tamponnée
+    
+    Args:
+        file_path: Chemin du fichier de sortie
+        compress: Compression gzip (None = selon l'extension .svgz)
+        
+    Returns:
+        Fichier texte ouvert en écriture
+    """
+    if compress is None:
+        compress = file_path.lower().endswith('.svgz')
+    if compress:
+        return gzip.open(file_path, 'wt', compresslevel=GZIP_LEVEL, encoding='utf-8')
+    return open(file_path, 'w', encoding='utf-8', buffering=WRITE_BUFFER)
+
+
+@lru_cache(maxsize=None)
+def _polygon_template(vertices: int, attributes: str = '', indent: str = '    ',
+                      newline: str = '\n') -> str:
+    """Gabarit %-format d'un <polygon> : coordonnées entières puis couleur empaquetée"""
+    points = ' '.join(['%d,%d'] * vertices)
+    attributes = attributes.replace('%', '%%')
+    return f'{indent}<polygon points="{points}" fill="#%06x"{attributes}/>{newline}'
+
+
+def format_polygons(polygons, colors, attributes: str = '', indent: str = '    ',
+                    newline: str = '\n') -> str:
+    """
+    Formate un lot de polygones en une seule opération de formatage
+    
+    Coordonnées (tronquées en entiers) et couleurs sont rassemblées dans
+    un seul tableau NumPy, puis injectées d'un coup dans le gabarit répété
+    du lot, sans f-string par polygone.
+    
+    Args:
+        polygons: Array (N, sommets, 2) ou liste de tableaux de sommets
+        colors: Couleurs (B, G, R) correspondantes
+        attributes: Attributs ajoutés à chaque élément (ex: ' stroke="#000000"')
+        indent: Indentation de chaque ligne
+        newline: Fin de ligne
+        
+    Returns:
+        Éléments <polygon> concaténés
+    """
+    if len(polygons) == 0:
+        return ''
+    colors = np.asarray(colors, dtype=np.int64).reshape(-1, 3)
+    packed = (colors[:, 2] << 16) | (colors[:, 1] << 8) | colors[:, 0]
+    
+    if isinstance(polygons, np.ndarray) and polygons.ndim == 3:
+        count, vertices = polygons.shape[:2]
+        template = _polygon_template(vertices, attributes, indent, newline) * count
+        values = np.column_stack([polygons.reshape(count, -1).astype(np.int64), packed])
+    else:
+        lengths = [len(points) for points in polygons]
+        template = ''.join([_polygon_template(vertices, attributes, indent, newline)
+                            for vertices in lengths])
+        coords = np.concatenate([np.asarray(points).reshape(-1) for points in polygons])
+        # La couleur suit les coordonnées de chaque polygone
+        values = np.insert(coords.astype(np.int64), np.cumsum(lengths) * 2, packed)
+    return template % tuple(values.ravel().tolist())
+
+
+def format_paths(polygons: np.ndarray, colors, precision: int = 0, indent: str = '    ',
+                 newline: str = '\n') -> str:
+    """
+    Fusionne les polygones de même couleur en éléments <path> compacts
+    
+    Chaque polygone devient un sous-chemin "M x y l dx dy ... z" : premier
+    sommet absolu, suivants relatifs. Les sommets sont ramenés à la
+    précision demandée avant le calcul des écarts, qui ne cumulent donc
+    pas d'erreur : tronqués en entiers à la précision 0, comme dans
+    format_polygons (mêmes sommets que l'export standard), arrondis
+    au-delà. Les couleurs gardent l'ordre de leur première
+    apparition, mais deux polygones qui se chevauchent peuvent changer
+    d'ordre de peinture : réservé aux triangulations.
+    
+    Args:
+        polygons: Array (N, sommets, 2)
+        colors: Couleurs (B, G, R) correspondantes
+        precision: Nombre de décimales des coordonnées
+        indent: Indentation de chaque ligne
+        newline: Fin de ligne
+        
+    Returns:
+        Éléments <path>, un par couleur
+    """
+    if precision < 0:
+        raise ValueError(f"Précision invalide: {precision}")
+    if len(polygons) == 0:
+        return ''
+    polygons = np.asarray(polygons)
+    count, vertices = polygons.shape[:2]
+    colors = np.asarray(colors, dtype=np.int64).reshape(-1, 3)
+    packed = (colors[:, 2] << 16) | (colors[:, 1] << 8) | colors[:, 0]
+    
+    # Sommets sur la grille de précision, puis écarts au sommet précédent
+    scale = 10 ** precision
+    grid = (np.round(polygons * scale) if precision > 0 else polygons).astype(np.int64)
+    values = np.concatenate([grid[:, :1], np.diff(grid, axis=1)], axis=1).reshape(count, -1)
+    
+    # Regrouper par couleur, dans l'ordre de première apparition
+    unique_colors, first, inverse = np.unique(packed, return_index=True, return_inverse=True)
+    order = np.argsort(first)
+    rank = np.empty_like(order)
+    rank[order] = np.arange(len(order))
+    groups = rank[inverse.ravel()]
+    sizes = np.bincount(groups)
+    values = values[np.argsort(groups, kind='stable')]
+    
+    if precision > 0:
+        number = f'%.{precision + 6}g'
+        values = values / scale
+    else:
+        number = '%d'
+    subpath = f'M{number} {number}l' + ' '.join([number] * (2 * vertices - 2)) + 'z'
+    template = ''.join([f'{indent}<path fill="#{color:06x}" d="{subpath * size}"/>{newline}'
+                        for color, size in zip(unique_colors[order].tolist(), sizes.tolist())])
+    # Un signe moins sépare déjà deux nombres
+    return (template % tuple(values.ravel().tolist())).replace(' -', '-')
+
+
+def _svg_header(width: int, height: int) -> str:
+    """Balise ouvrante du document"""
+    return (f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" '
+            f'height="{height}" viewBox="0 0 {width} {height}">')
 
 
 class SVGExporter:
-    """Exporte une triangulation en fichier SVG vectoriel"""
+    """
+    Exporte une triangulation en fichier SVG vectoriel
+    
+    Les triangles sont conservés sous forme de tableaux compacts et
+    formatés par lots au moment de save() ; chaque élément porte ses
+    propres attributs de contour.
+    """
     
     def __init__(self, width: int, height: int):
         """
@@ -20,11 +165,9 @@ class SVGExporter:
         """
         self.width = width
         self.height = height
-        self.root = ET.Element('svg')
-        self.root.set('xmlns', 'http://www.w3.org/2000/svg')
-        self.root.set('width', str(width))
-        self.root.set('height', str(height))
-        self.root.set('viewBox', f'0 0 {width} {height}')
+        self._points = []
+        self._colors = []
+        self._styles = []
     
     def add_triangle(self, points: np.ndarray, color: tuple, outline: tuple = None, 
                     outline_width: float = 1):
@@ -37,23 +180,15 @@ class SVGExporter:
             outline: Couleur du contour
             outline_width: Épaisseur du contour
         """
-        polygon = ET.SubElement(self.root, 'polygon')
-        
-        # Format les points en chaîne "x1,y1 x2,y2 x3,y3"
-        points_str = ' '.join([f'{int(p[0])},{int(p[1])}' for p in points])
-        polygon.set('points', points_str)
-        
-        # Couleur de remplissage (supposé BGR, convertir en RGB pour SVG)
-        fill_color = self._format_color(color)
-        polygon.set('fill', fill_color)
+        self._points.append(np.asarray(points).astype(np.int64))
+        self._colors.append(tuple(int(c) for c in color[:3]))
         
         # Contour
         if outline:
-            outline_color = self._format_color(outline)
-            polygon.set('stroke', outline_color)
-            polygon.set('stroke-width', str(outline_width))
+            self._styles.append(f' stroke="{self._format_color(outline)}" '
+                                f'stroke-width="{outline_width}"')
         else:
-            polygon.set('stroke', 'none')
+            self._styles.append(' stroke="none"')
     
     def _format_color(self, rgb_tuple: tuple) -> str:
         """
@@ -65,46 +200,159 @@ class SVGExporter:
         Returns:
             Chaîne hex #RRGGBB
         """
-        # Supposer BGR (format OpenCV)
-        b, g, r = rgb_tuple[0], rgb_tuple[1], rgb_tuple[2]
-        return f'#{r:02x}{g:02x}{b:02x}'
+        return _format_color(rgb_tuple)
     
-    def save(self, file_path: str, pretty: bool = True):
+    def save(self, file_path: str, pretty: bool = True, compress: Optional[bool] = None,
+             compact: bool = False, precision: int = 0):
         """
         Sauvegarde le SVG dans un fichier
         
         Args:
             file_path: Chemin du fichier de sortie
-            pretty: Si True, formate le SVG de manière lisible
+            pretty: Si True, un élément indenté par ligne
+            compress: Compression gzip (None = selon l'extension .svgz)
+            compact: Contour porté par un groupe <g> et triangles de même
+                     couleur fusionnés en un <path> (voir format_paths)
+            precision: Décimales des coordonnées en mode compact
+        """
+        indent, newline = ('  ', '\n') if pretty else ('', '')
+        with open_svg(file_path, compress) as f:
+            f.write(_svg_header(self.width, self.height) + newline)
+            for start in range(0, len(self._points), CHUNK_SIZE):
+                stop = start + CHUNK_SIZE
+                # Triangles consécutifs de même contour formatés ensemble
+                runs = groupby(range(start, min(stop, len(self._points))),
+                               key=self._styles.__getitem__)
+                for style, indices in runs:
+                    indices = list(indices)
+                    points = self._points[indices[0]:indices[-1] + 1]
+                    colors = self._colors[indices[0]:indices[-1] + 1]
+                    if compact:
+                        f.write(f'{indent}<g{style}>{newline}')
+                        f.write(format_paths(np.array(points), colors, precision,
+                                             indent * 2, newline))
+                        f.write(f'{indent}</g>{newline}')
+                    else:
+                        f.write(format_polygons(points, colors, style, indent, newline))
+            f.write('</svg>\n')
+
+
+class SVGStreamWriter:
+    """
+    Écrit un SVG au fil de l'eau, sans construire d'arbre XML en mémoire
+    
+    Les polygones sont formatés par lots et écrits dès leur ajout : la
+    mémoire reste constante quel que soit leur nombre. Le contour commun
+    est porté par un groupe <g> plutôt que répété sur chaque élément.
+    Un chemin en .svgz produit un fichier compressé en gzip. En mode
+    compact, les polygones de même couleur d'un lot sont fusionnés en un
+    <path> (voir format_paths).
+    
+    Exemple:
+        with SVGStreamWriter("out.svg", 800, 600, outline=(0, 0, 0)) as writer:
+            writer.add_polygons(triangles, colors)
+    """
+    
+    def __init__(self, file_path: str, width: int, height: int,
+                 outline: tuple = None, outline_width: float = 1,
+                 compress: Optional[bool] = None, chunk_size: int = CHUNK_SIZE,
+                 compact: bool = False, precision: int = 0, linejoin: Optional[str] = None):
+        """
+        Ouvre le fichier et écrit l'en-tête
+        
+        Args:
+            file_path: Chemin du fichier de sortie
+            width: Largeur de l'image
+            height: Hauteur de l'image
+            outline: Couleur de contour commune (BGR), None = sans contour
+            outline_width: Épaisseur du contour
+            compress: Compression gzip (None = selon l'extension .svgz)
+            chunk_size: Nombre de polygones formatés par écriture
+            compact: Polygones de même couleur fusionnés en <path> (triangulations)
+            precision: Décimales des coordonnées en mode compact
+            linejoin: Jonction des contours (ex: "round"), None = défaut SVG (miter)
+        """
+        if precision < 0:
+            raise ValueError(f"Précision invalide: {precision}")
+        self.width = width
+        self.height = height
+        self.chunk_size = chunk_size
+        self.compact = compact
+        self.precision = precision
+        self.count = 0
+        self._file = open_svg(file_path, compress)
+        self._file.write(_svg_header(width, height) + '\n')
+        if outline is not None:
+            join = f' stroke-linejoin="{linejoin}"' if linejoin else ''
+            self._file.write(f'  <g stroke="{_format_color(outline)}" '
+                             f'stroke-width="{outline_width}"{join}>\n')
+        else:
+            self._file.write('  <g stroke="none">\n')
+    
+    def add_polygon(self, points: np.ndarray, color: tuple):
         """
-        # Convertir en chaîne
-        svg_str = ET.tostring(self.root, encoding='unicode')
+        Écrit un polygone
         
-        if pretty:
-            # Parser et reformater pour lisibilité
-            dom = minidom.parseString(svg_str)
-            svg_str = dom.toprettyxml(indent='  ')
-            # Retirer la déclaration XML auto-ajoutée
-            svg_str = '\n'.join(svg_str.split('\n')[1:])
+        Args:
+            points: Sommets [x, y] du polygone
+            color: Couleur de remplissage (B, G, R)
+        """
+        self.add_polygons([points], [color])
+    
+    def add_polygons(self, polygons: Sequence[np.ndarray], colors):
+        """
+        Écrit une suite de polygones dans l'ordre
         
-        with open(file_path, 'w') as f:
-            f.write(svg_str)
+        Args:
+            polygons: Array (N, sommets, 2) ou liste de tableaux de sommets
+                      (array uniquement en mode compact)
+            colors: Couleurs (B, G, R) correspondantes
+        """
+        for start in range(0, len(polygons), self.chunk_size):
+            stop = start + self.chunk_size
+            if self.compact:
+                self._file.write(format_paths(polygons[start:stop], colors[start:stop],
+                                              self.precision))
+            else:
+                self._file.write(format_polygons(polygons[start:stop], colors[start:stop]))
+        self.count += len(polygons)
+    
+    def close(self):
+        """Termine le document et ferme le fichier"""
+        if not self._file.closed:
+            self._file.write('  </g>\n</svg>\n')
+            self._file.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def _format_color(bgr: tuple) -> str:
+    """Convertit une couleur (B, G, R) en hex SVG #RRGGBB"""
+    b, g, r = (int(c) for c in bgr[:3])
+    return f'#{r:02x}{g:02x}{b:02x}'
 
 
 def generate_svg(image_path: str, output_path: str, num_points: int = 1000,
                 blur_strength: int = 18, edge_sensitivity: int = 2,
-                add_outlines: bool = True, enhance_colors: bool = True):
+                add_outlines: bool = True, enhance_colors: bool = True,
+                compact: bool = False, precision: int = 0):
     """
     Génère un SVG à partir d'une image
     
     Args:
         image_path: Chemin vers l'image source
-        output_path: Chemin de sortie SVG
+        output_path: Chemin de sortie SVG (.svgz = compressé en gzip)
         num_points: Nombre de points de triangulation
         blur_strength: Force du flou
         edge_sensitivity: Sensibilité de détection de contours
         add_outlines: Ajouter les contours noirs
         enhance_colors: Améliorer les couleurs
+        compact: Triangles de même couleur fusionnés en <path>
+        precision: Décimales des coordonnées en mode compact
     """
     import cv2
     from src.low_poly import LowPolyGenerator
@@ -124,26 +372,16 @@ def generate_svg(image_path: str, output_path: str, num_points: int = 1000,
     points = generator.generate_points(use_edges=True)
     tri = generator.triangulate(points)
     
-    # Créer l'exporteur SVG
-    exporter = SVGExporter(generator.width, generator.height)
+    # Couleur moyenne de chaque triangle
+    colors = [generator.get_triangle_color(triangle_indices, points, smoothed)
+              for triangle_indices in tri.simplices]
     
-    # Ajouter chaque triangle
-    for triangle_indices in tri.simplices:
-        # Coordonnées des points du triangle
-        tri_points = points[triangle_indices]
-        
-        # Couleur moyenne
-        color = generator.get_triangle_color(triangle_indices, points, smoothed)
-        
-        # Contour
-        outline = (0, 0, 0) if add_outlines else None
-        outline_width = 1 if add_outlines else 0
-        
-        # Ajouter au SVG
-        exporter.add_triangle(tri_points, color, outline, outline_width)
+    # Écrire les triangles par lots
+    outline = (0, 0, 0) if add_outlines else None
+    with SVGStreamWriter(output_path, generator.width, generator.height, outline=outline,
+                         compact=compact, precision=precision) as writer:
+        writer.add_polygons(points[tri.simplices], colors)
     
-    # Sauvegarder
-    exporter.save(output_path)
     print(f"SVG généré: {output_path}")
 
 
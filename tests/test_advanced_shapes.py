@@ -0,0 +1,206 @@
+"""
+Tests du générateur hybride (formes mixtes)
+"""
+import unittest
+import xml.etree.ElementTree as ET
+
+import cv2
+import numpy as np
+
+from src.advanced_shapes import (AdvancedShapeGenerator, CellStatsPyramid,
+                                 HybridLowPolyGenerator, PolygonType, SHAPES_BY_DENSITY)
+
+
+class TestHybridAnalysis(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        """Crée une image de test bruitée de taille non multiple de la grille"""
+        rng = np.random.RandomState(0)
+        test_img = rng.randint(0, 255, (97, 131, 3), dtype=np.uint8)
+        test_img[:, :60] = [40, 80, 120]
+        cls.test_path = "/tmp/test_hybrid.png"
+        cv2.imwrite(cls.test_path, test_img)
+
+    def test_vectorized_shape_choice_matches_scalar(self):
+        """choose_best_shapes donne les mêmes formes que choose_best_shape"""
+        densities = np.array([0.0, 0.19, 0.2, 0.39, 0.4, 0.6, 0.79, 0.8, 1.0])
+        indices = AdvancedShapeGenerator.choose_best_shapes(densities)
+        expected = [AdvancedShapeGenerator.choose_best_shape(d) for d in densities]
+        self.assertEqual([SHAPES_BY_DENSITY[i] for i in indices], expected)
+
+    def test_cell_stats_match_region_analysis(self):
+        """Les statistiques par blocs égalent l'analyse région par région"""
+        generator = HybridLowPolyGenerator(self.test_path)
+        smoothed = cv2.GaussianBlur(generator.image, (15, 15), 0)
+        grid_size = 20
+        cells = generator.analyze_cells(grid_size, smoothed)
+        self.assertEqual(cells.edge_density.shape, (5, 7))
+
+        for row, y in enumerate(range(0, generator.height, grid_size)):
+            for col, x in enumerate(range(0, generator.width, grid_size)):
+                mask = np.zeros((generator.height, generator.width), dtype=np.uint8)
+                mask[y:y + grid_size, x:x + grid_size] = 255
+                self.assertEqual(cells.edge_density[row, col],
+                                 generator.analyze_region_edges(mask))
+                region = smoothed[y:y + grid_size, x:x + grid_size].reshape(-1, 3)
+                np.testing.assert_array_equal(cells.mean_color[row, col],
+                                              np.mean(region, axis=0).astype(int))
+
+    def test_edges_computed_once(self):
+        """La carte de contours est mise en cache"""
+        generator = HybridLowPolyGenerator(self.test_path)
+        self.assertIs(generator.edge_map(), generator.edge_map())
+
+    def test_band_rendering_matches_sequential(self):
+        """Le rendu par bandes parallèles est identique au rendu séquentiel"""
+        generator = HybridLowPolyGenerator(self.test_path)
+        sequential = np.asarray(generator.generate_hybrid(grid_size=12))
+        sequential_stats = dict(generator.shapes_used)
+        for backend in ("thread", "process"):
+            banded = np.asarray(generator.generate_hybrid(grid_size=12, workers=3, backend=backend))
+            np.testing.assert_array_equal(banded, sequential)
+            self.assertEqual(generator.shapes_used, sequential_stats)
+
+    def test_svg_export_matches_layout(self):
+        """L'export SVG contient une forme par cellule, avec sa couleur"""
+        generator = HybridLowPolyGenerator(self.test_path)
+        svg_path = "/tmp/test_hybrid.svg"
+        count = generator.export_svg(svg_path, grid_size=20)
+        layout = generator.last_layout
+        self.assertEqual(count, len(layout))
+
+        root = ET.parse(svg_path).getroot()
+        polygons = root.findall(".//{http://www.w3.org/2000/svg}polygon")
+        self.assertEqual(len(polygons), len(layout))
+        b, g, r = layout.mean_color[0]
+        self.assertEqual(polygons[0].get("fill"), f"#{r:02x}{g:02x}{b:02x}")
+        self.assertEqual(root.get("viewBox"), f"0 0 {generator.width} {generator.height}")
+
+
+class TestStatsPyramid(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        rng = np.random.RandomState(2)
+        cls.test_path = "/tmp/test_pyramid.png"
+        cv2.imwrite(cls.test_path, rng.randint(0, 255, (83, 117, 3), dtype=np.uint8))
+
+    def test_pyramid_matches_direct_analysis(self):
+        """Les statistiques lues dans la table égalent la réduction directe"""
+        generator = HybridLowPolyGenerator(self.test_path)
+        smoothed = generator.smoothed_image()
+        for base_cell in (1, 2):
+            pyramid = CellStatsPyramid(generator.edge_map(), smoothed, base_cell)
+            for grid_size in (4, 10, 12, 30):
+                direct = generator.analyze_cells(grid_size, smoothed)
+                cached = pyramid.stats(grid_size)
+                for field in ("x0", "x1", "y0", "y1", "edge_density", "mean_color"):
+                    np.testing.assert_array_equal(getattr(cached, field), getattr(direct, field))
+
+    def test_grid_sweep_builds_pyramid_once(self):
+        """Changer de grille réutilise l'image lissée et la table"""
+        generator = HybridLowPolyGenerator(self.test_path)
+        generator.generate_hybrid(grid_size=20)
+        self.assertIsNone(generator._pyramid)
+        generator.generate_hybrid(grid_size=10)
+        pyramid = generator._pyramid
+        self.assertIsNotNone(pyramid)
+        generator.generate_hybrid(grid_size=15)
+        self.assertIs(generator._pyramid, pyramid)
+
+
+class TestQuadtreeLayout(unittest.TestCase):
+
+    def test_flat_image_uses_largest_cells(self):
+        """Une image uniforme n'est jamais subdivisée"""
+        test_path = "/tmp/test_quadtree_flat.png"
+        cv2.imwrite(test_path, np.full((128, 192, 3), 90, dtype=np.uint8))
+        generator = HybridLowPolyGenerator(test_path)
+        smoothed = generator.smoothed_image()
+        layout = generator.quadtree_layout(smoothed, min_cell=8, levels=3)
+        self.assertEqual(len(layout), 2 * 3)
+        self.assertTrue(np.all(layout.size == 32))
+
+    def test_leaves_tile_the_image(self):
+        """Les feuilles couvrent l'image sans chevauchement"""
+        test_path = "/tmp/test_quadtree_detail.png"
+        test_img = np.full((100, 150, 3), 200, dtype=np.uint8)
+        test_img[30:60, 40:90] = np.random.RandomState(1).randint(0, 255, (30, 50, 3))
+        cv2.imwrite(test_path, test_img)
+        generator = HybridLowPolyGenerator(test_path)
+        layout = generator.quadtree_layout(generator.smoothed_image(), min_cell=5, levels=2)
+        coverage = np.zeros((100, 150), dtype=np.int32)
+        for x0, x1, y0, y1 in zip(layout.x0, layout.x1, layout.y0, layout.y1):
+            coverage[y0:y1, x0:x1] += 1
+        self.assertTrue(np.all(coverage == 1))
+        self.assertGreater(len(np.unique(layout.size)), 1)
+
+
+def reference_polygon(shape_type, center, size, height=None, sides=16):
+    """Sommets calculés sommet par sommet, comme avant les gabarits"""
+    cx, cy = center
+    if shape_type in (PolygonType.SQUARE, PolygonType.RECTANGLE):
+        half_w = size / 2
+        half_h = (size if height is None else height) / 2
+        points = [[cx - half_w, cy - half_h], [cx + half_w, cy - half_h],
+                  [cx + half_w, cy + half_h], [cx - half_w, cy + half_h]]
+        return np.array(points, dtype=np.int32)
+    if shape_type == PolygonType.TRIANGLE:
+        angles = np.array([90, 210, 330]) * np.pi / 180
+    elif shape_type == PolygonType.CIRCLE:
+        angles = [2 * np.pi * i / sides for i in range(sides)]
+    elif shape_type == PolygonType.HEXAGON:
+        angles = [(i * 60 + 30) * np.pi / 180 for i in range(6)]
+    else:
+        angles = [(i * 72 - 90) * np.pi / 180 for i in range(5)]
+    points = []
+    for angle in angles:
+        points.append([cx + size * np.cos(angle), cy + size * np.sin(angle)])
+    return np.array(points, dtype=np.int32)
+
+
+class TestShapeTemplates(unittest.TestCase):
+
+    def test_shapes_match_per_vertex_formulas(self):
+        """Gabarits et create_* donnent les sommets des formules sommet par sommet"""
+        centers = np.array([[10, 20], [37, 5], [0, 0], [120, 64], [7, 301]])
+        single = {
+            PolygonType.TRIANGLE: AdvancedShapeGenerator.create_triangle,
+            PolygonType.SQUARE: AdvancedShapeGenerator.create_square,
+            PolygonType.CIRCLE: AdvancedShapeGenerator.create_circle,
+            PolygonType.HEXAGON: AdvancedShapeGenerator.create_hexagon,
+            PolygonType.PENTAGON: AdvancedShapeGenerator.create_pentagon,
+        }
+        for size in (3.5, 12.5, 17.0, 25):
+            for shape_type, create in single.items():
+                batch = AdvancedShapeGenerator.create_shapes(shape_type, centers, size)
+                for center, polygon in zip(centers, batch):
+                    expected = reference_polygon(shape_type, tuple(center), size)
+                    np.testing.assert_array_equal(polygon, expected)
+                    np.testing.assert_array_equal(create(tuple(center), size), expected)
+            rectangle = AdvancedShapeGenerator.create_rectangle((37, 5), size, size * 0.6)
+            np.testing.assert_array_equal(
+                rectangle, reference_polygon(PolygonType.RECTANGLE, (37, 5), size, size * 0.6))
+        np.testing.assert_array_equal(AdvancedShapeGenerator.create_circle((10, 20), 9.5, sides=7),
+                                      reference_polygon(PolygonType.CIRCLE, (10, 20), 9.5, sides=7))
+
+    def test_known_vertices(self):
+        """Sommets attendus pour quelques formes (troncature vers zéro comme avant)"""
+        np.testing.assert_array_equal(AdvancedShapeGenerator.create_triangle((10, 20), 10),
+                                      [[10, 30], [1, 15], [18, 14]])
+        np.testing.assert_array_equal(AdvancedShapeGenerator.create_square((10, 20), 9),
+                                      [[5, 15], [14, 15], [14, 24], [5, 24]])
+        np.testing.assert_array_equal(AdvancedShapeGenerator.create_hexagon((0, 0), 10),
+                                      [[8, 4], [0, 10], [-8, 4], [-8, -5], [0, -10], [8, -5]])
+
+    def test_template_is_cached(self):
+        """Le gabarit d'une (forme, taille) est calculé une seule fois"""
+        first = AdvancedShapeGenerator.shape_template(PolygonType.HEXAGON, 12.5)
+        second = AdvancedShapeGenerator.shape_template(PolygonType.HEXAGON, 12.5)
+        self.assertIs(first, second)
+        self.assertFalse(first.flags.writeable)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,66 @@
+"""
+Tests de l'analyse partagée entre moteurs
+"""
+import threading
+import unittest
+
+import cv2
+import numpy as np
+
+from src.advanced_shapes import HybridLowPolyGenerator
+from src.analysis import ImageAnalysis
+from src.buffer_pool import BufferPool
+from src.low_poly import LowPolyGenerator
+
+
+class TestImageAnalysis(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.image = np.random.RandomState(4).randint(0, 255, (90, 140, 3), dtype=np.uint8)
+        cls.test_path = "/tmp/test_analysis.png"
+        cv2.imwrite(cls.test_path, cls.image)
+
+    def test_results_match_direct_computation(self):
+        """Les étapes en cache égalent les appels OpenCV directs"""
+        analysis = ImageAnalysis(self.image)
+        gray = cv2.cvtColor(self.image, cv2.COLOR_BGR2GRAY)
+        enhanced = cv2.createCLAHE(clipLimit=2.0, tileGridSize=(8, 8)).apply(gray)
+        np.testing.assert_array_equal(analysis.clahe(), enhanced)
+        np.testing.assert_array_equal(analysis.edges(50, 150), cv2.Canny(enhanced, 50, 150))
+        np.testing.assert_array_equal(analysis.blurred(15),
+                                      cv2.GaussianBlur(self.image, (15, 15), 0))
+
+    def test_edge_sets_do_not_share_pool_buffers(self):
+        """Deux jeux de seuils restent distincts avec un pool de buffers"""
+        analysis = ImageAnalysis(self.image, BufferPool())
+        low = analysis.edges(10, 50).copy()
+        analysis.edges(150, 250)
+        np.testing.assert_array_equal(analysis.edges(10, 50), low)
+
+    def test_engines_share_one_analysis(self):
+        """Classique et hybride lisent la même analyse"""
+        analysis = ImageAnalysis(self.image)
+        classic = LowPolyGenerator(self.test_path, analysis=analysis)
+        hybrid = HybridLowPolyGenerator(self.test_path, analysis=analysis)
+        classic.detect_edges()
+        hybrid.edge_map()
+        self.assertEqual(analysis.misses, 4)  # gris, CLAHE et deux jeux de seuils
+        self.assertIs(classic.image, hybrid.image)
+
+    def test_concurrent_requests_compute_once(self):
+        """Des demandes simultanées attendent un seul calcul"""
+        analysis = ImageAnalysis(self.image)
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(analysis.blurred(21)))
+                   for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(analysis.misses, 1)
+        self.assertTrue(all(r is results[0] for r in results))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,65 @@
+"""
+Tests de l'auto-réglage des presets
+"""
+import tempfile
+import unittest
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+from src.auto_tune import AutoTuner, auto_tune_preset
+from src.preset_manager import PresetManager
+
+
+class TestAutoTuner(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        """Crée une image de test (quatre quadrants colorés)"""
+        test_img = np.zeros((240, 320, 3), dtype=np.uint8)
+        test_img[:120, :160] = [255, 0, 0]
+        test_img[:120, 160:] = [0, 255, 0]
+        test_img[120:, :160] = [0, 0, 255]
+        test_img[120:, 160:] = [255, 255, 0]
+        cls.test_path = "/tmp/test_auto_tune.png"
+        cv2.imwrite(cls.test_path, test_img)
+
+    def test_proxy_is_downscaled(self):
+        """Le proxy respecte la taille demandée"""
+        tuner = AutoTuner(self.test_path, proxy_megapixels=0.02)
+        self.assertLessEqual(tuner.proxy_width * tuner.proxy_height, 20000)
+        self.assertGreater(tuner.area_ratio, 1.0)
+
+    def test_stages_are_cached(self):
+        """Flou et contours ne sont calculés qu'une fois par valeur"""
+        tuner = AutoTuner(self.test_path, proxy_megapixels=0.02)
+        result = tuner.tune(points=(50, 100), blurs=(5,), sensitivities=(2,), verbose=False)
+        self.assertEqual(len(result.trials), 2)
+        self.assertEqual(len(tuner._smoothed_cache), 1)
+        # Gris, CLAHE, une carte de contours et un flou : le second essai relit tout
+        self.assertEqual(tuner.analysis.misses, 4)
+        self.assertGreater(tuner.analysis.hits, 0)
+
+    def test_time_budget_picks_fastest_when_unreachable(self):
+        """Un budget impossible retombe sur le candidat le plus rapide"""
+        tuner = AutoTuner(self.test_path, proxy_megapixels=0.02)
+        result = tuner.tune(time_budget=0.0, points=(50, 100), blurs=(5,),
+                            sensitivities=(2,), verbose=False)
+        self.assertFalse(result.target_met)
+        fastest = min(result.trials, key=lambda t: t.estimated_time)
+        self.assertEqual(result.best, fastest)
+
+    def test_winner_saved_as_preset(self):
+        """Le gagnant est sauvegardé via PresetManager"""
+        manager = PresetManager(Path(tempfile.mkdtemp()))
+        result = auto_tune_preset(self.test_path, "Auto", proxy_megapixels=0.02,
+                                  manager=manager)
+        preset = manager.load_preset("Auto")
+        self.assertIsNotNone(preset)
+        self.assertEqual(preset.points, result.best.points)
+        self.assertEqual(preset.blur_strength, result.best.blur_strength)
+
+
+if __name__ == "__main__":
+    unittest.main()
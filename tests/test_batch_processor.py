@@ -0,0 +1,260 @@
+"""
+Tests du traitement par lots
+"""
+import contextlib
+import io
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+from src.batch_processor import (BatchConfig, BatchProcessor, _init_worker, _rss_high_water,
+                                 peak_rss_bytes, reset_peak_rss)
+
+
+_render = BatchProcessor._render
+
+
+def crashing_render(self, image_path, *args):
+    """Rendu qui tue son worker sur img1.png, comme un manque de mémoire"""
+    if image_path.name == "img1.png":
+        os._exit(1)
+    return _render(self, image_path, *args)
+
+
+def run_batch(config: BatchConfig, progress_callback=None):
+    """Traite un lot sans afficher la progression"""
+    processor = BatchProcessor(config)
+    with contextlib.redirect_stdout(io.StringIO()):
+        processor.process_batch(progress_callback)
+    return processor
+
+
+class BatchTestCase(unittest.TestCase):
+    """Dossier d'entrée de quelques petites images, dont une illisible"""
+
+    def setUp(self):
+        self.work_dir = Path(tempfile.mkdtemp())
+        self.input_dir = self.work_dir / "input"
+        self.input_dir.mkdir()
+        rng = np.random.RandomState(0)
+        for index in range(5):
+            height, width = 40 + 10 * index, 60
+            cv2.imwrite(str(self.input_dir / f"img{index}.png"),
+                        rng.randint(0, 255, (height, width, 3), dtype=np.uint8))
+        (self.input_dir / "img2b.jpg").write_bytes(b"pas une image")
+
+    def tearDown(self):
+        shutil.rmtree(self.work_dir)
+
+    def config(self, **kwargs) -> BatchConfig:
+        return BatchConfig(input_dir=str(self.input_dir), output_dir=str(self.work_dir / "output"),
+                           num_points=50, **kwargs)
+
+
+class TestParallelBatch(BatchTestCase):
+
+    def test_results_follow_input_order(self):
+        """Les résultats parallèles gardent l'ordre des images d'entrée"""
+        sequential = run_batch(self.config())
+        progress = []
+        parallel = run_batch(self.config(parallel=True, workers=2, chunksize=2),
+                             lambda current, total, message: progress.append((current, total)))
+
+        self.assertEqual([r.input_file for r in parallel.results],
+                         [r.input_file for r in sequential.results])
+        self.assertEqual([r.success for r in parallel.results], [True] * 3 + [False] + [True] * 2)
+        self.assertEqual(progress, [(index, 6) for index in range(1, 7)])
+        for result in parallel.results:
+            if result.success:
+                self.assertTrue(Path(result.output_file).is_file())
+
+    def test_memory_budget(self):
+        """Sous budget mémoire, plus grandes images d'abord, ordre des résultats inchangé"""
+        progress = []
+        processor = run_batch(self.config(parallel=True, workers=2, memory_budget_mp=0.005),
+                              lambda current, total, message: progress.append(message))
+        self.assertEqual([Path(r.input_file).name for r in processor.results],
+                         ["img0.png", "img1.png", "img2.png", "img2b.jpg", "img3.png", "img4.png"])
+        self.assertEqual([r.success for r in processor.results], [True] * 3 + [False] + [True] * 2)
+        self.assertLessEqual(processor.peak_in_flight_mp, 0.005)
+        # Une seule image valide à la fois : la plus grande finit la première
+        self.assertEqual([message for message in progress if "img2b" not in message][0],
+                         "Traité: img4.png")
+
+    def test_worker_crash_fails_only_its_image(self):
+        """Un worker tué : pool relancé, seule l'image qui le refait tomber échoue"""
+        for options in ({"chunksize": 2}, {"shared_memory": True}):
+            with mock.patch.object(BatchProcessor, "_render", crashing_render):
+                processor = run_batch(self.config(parallel=True, workers=2, **options))
+            self.assertEqual([Path(r.input_file).name for r in processor.results if not r.success],
+                             ["img1.png", "img2b.jpg"])
+            for result in processor.results:
+                if result.success:
+                    self.assertTrue(Path(result.output_file).is_file())
+
+    def test_worker_opencv_threads(self):
+        """Chaque worker limite OpenCV à worker_cv_threads threads"""
+        for threads in (1, 2):
+            with ProcessPoolExecutor(max_workers=1, initializer=_init_worker,
+                                     initargs=(self.config(worker_cv_threads=threads),)) as executor:
+                self.assertEqual(executor.submit(cv2.getNumThreads).result(), threads)
+
+    def test_shared_memory_matches_sequential(self):
+        """Images échangées en mémoire partagée : mêmes rendus, dans l'ordre d'entrée"""
+        outputs = []
+        for options in ({}, {"parallel": True, "workers": 2, "shared_memory": True},
+                        {"parallel": True, "workers": 2, "shared_memory": True, "low_memory": True}):
+            processor = run_batch(self.config(hybrid_mode=True, grid_size=10, **options))
+            outputs.append([(Path(r.input_file).name, r.success,
+                             cv2.imread(r.output_file) if r.success else None)
+                            for r in processor.results])
+
+        for name, success, image in outputs[0]:
+            self.assertEqual(success, name != "img2b.jpg")
+        for shared in outputs[1:]:
+            self.assertEqual([row[:2] for row in shared], [row[:2] for row in outputs[0]])
+            for (_, success, expected), (_, _, image) in zip(outputs[0], shared):
+                if success:
+                    np.testing.assert_array_equal(image, expected)
+        self.assertIn("share", processor.results[0].stage_times)
+
+
+class TestPipelinedBatch(BatchTestCase):
+
+    def test_pipeline_matches_sequential(self):
+        """Le pipeline produit les mêmes fichiers, dans le même ordre"""
+        outputs = []
+        for config in (self.config(), self.config(prefetch=2, low_memory=True)):
+            np.random.seed(0)
+            processor = run_batch(config)
+            outputs.append([(r.input_file, r.success, r.file_size_input,
+                             cv2.imread(r.output_file) if r.success else None)
+                            for r in processor.results])
+
+        for sequential, pipelined in zip(*outputs):
+            self.assertEqual(sequential[:3], pipelined[:3])
+            if sequential[1]:
+                np.testing.assert_array_equal(sequential[3], pipelined[3])
+        self.assertFalse(outputs[1][3][1])
+
+
+class TestIncrementalBatch(BatchTestCase):
+
+    def processed(self, processor):
+        return [Path(r.input_file).name for r in processor.results if r.success and not r.skipped]
+
+    def test_only_new_or_changed_images_are_processed(self):
+        """Seules les images nouvelles, modifiées ou en échec sont retraitées"""
+        first = run_batch(self.config(incremental=True))
+        self.assertEqual(len(self.processed(first)), 5)
+        self.assertEqual(self.processed(run_batch(self.config(incremental=True))), [])
+
+        # Date modifiée, contenu identique : toujours à jour
+        touched = self.input_dir / "img0.png"
+        os.utime(touched, ns=(0, touched.stat().st_mtime_ns + 10 ** 9))
+        changed = self.input_dir / "img1.png"
+        cv2.imwrite(str(changed), np.zeros((50, 60, 3), dtype=np.uint8))
+        rerun = run_batch(self.config(incremental=True))
+        self.assertEqual(self.processed(rerun), ["img1.png"])
+        self.assertEqual([r.input_file for r in rerun.results],
+                         [r.input_file for r in first.results])
+        self.assertFalse(rerun.results[3].success)
+
+    def test_parameter_change_reprocesses(self):
+        """Changer un paramètre du rendu invalide le manifeste, pas une option d'exécution"""
+        run_batch(self.config(incremental=True))
+        self.assertEqual(self.processed(run_batch(self.config(incremental=True, prefetch=2))), [])
+        self.assertEqual(len(self.processed(run_batch(self.config(incremental=True,
+                                                                  blur_strength=9)))), 5)
+
+
+class TestCachedBatch(BatchTestCase):
+
+    def test_duplicates_in_other_folder_hit_cache(self):
+        """Des copies identiques dans un autre dossier reprennent les rendus du cache"""
+        cache_dir = str(self.work_dir / "cache")
+        first = run_batch(self.config(cache=True, cache_dir=cache_dir))
+        self.assertEqual([r.cache_hit for r in first.results if r.success], [False] * 5)
+
+        copies = self.work_dir / "copies"
+        shutil.copytree(self.input_dir, copies)
+        (copies / "img0.png").rename(copies / "renamed.png")
+        for options in ({}, {"prefetch": 2}):
+            config = BatchConfig(input_dir=str(copies), output_dir=str(self.work_dir / "copies_out"),
+                                 num_points=50, cache=True, cache_dir=cache_dir, **options)
+            rerun = run_batch(config)
+            self.assertEqual([r.cache_hit for r in rerun.results if r.success], [True] * 5)
+            self.assertEqual({Path(r.output_file).read_bytes() for r in rerun.results if r.success},
+                             {Path(r.output_file).read_bytes() for r in first.results if r.success})
+            shutil.rmtree(config.output_dir)
+
+
+class TestImageDiscovery(BatchTestCase):
+
+    def test_single_pass_matches_sorted_listing(self):
+        """Extensions sans casse, sous-dossiers parcourus, ordre d'un tri global des chemins"""
+        nested = self.input_dir / "a" / "b"
+        nested.mkdir(parents=True)
+        for name in ("photo.JPG", "scan.Png", "notes.txt"):
+            (nested / name).write_bytes(b"x")
+        (self.input_dir / "a.jpg").write_bytes(b"x")
+        processor = BatchProcessor(self.config())
+
+        images = processor.find_images()
+        names = [path.relative_to(self.input_dir).as_posix() for path in images]
+        self.assertEqual(images, sorted(images))
+        self.assertIn("a/b/photo.JPG", names)
+        self.assertIn("a/b/scan.Png", names)
+        self.assertNotIn("a/b/notes.txt", names)
+        self.assertEqual(len(names), 9)
+        self.assertEqual(sorted(processor.iter_images(sort=False)), images)
+
+    def test_streaming_batch(self):
+        """En streaming, mêmes images traitées ; le manifeste ignore les images à jour"""
+        progress = []
+        streamed = run_batch(self.config(streaming=True, incremental=True),
+                             lambda current, total, message: progress.append(total))
+        self.assertEqual(sorted(r.input_file for r in streamed.results),
+                         [str(path) for path in streamed.find_images()])
+        self.assertEqual(sum(r.success for r in streamed.results), 5)
+        self.assertEqual(set(progress), {0})
+
+        rerun = run_batch(self.config(streaming=True, incremental=True, prefetch=2))
+        self.assertEqual(sum(r.skipped for r in rerun.results), 5)
+        self.assertEqual(len(rerun.results), 6)
+
+
+class TestPeakMemory(BatchTestCase):
+
+    def test_reset_keeps_process_peak(self):
+        """Après remise à zéro, le pic par image redescend mais le pic du processus reste"""
+        block = np.ones(64 * 1024 * 1024, dtype=np.uint8)
+        del block
+        peak = peak_rss_bytes()
+        if not reset_peak_rss():
+            self.skipTest("remise à zéro du pic RSS indisponible sur cette plateforme")
+        self.assertLess(_rss_high_water(), peak)
+        self.assertGreaterEqual(peak_rss_bytes(), peak)
+
+    def test_peak_measured_only_when_render_runs_alone(self):
+        """Pic par image sur demande, en séquentiel ou dans un worker, pas en pipeline"""
+        if not reset_peak_rss():
+            self.skipTest("remise à zéro du pic RSS indisponible sur cette plateforme")
+        for options, measured in (({}, False),
+                                  ({"measure_peak_rss": True}, True),
+                                  ({"measure_peak_rss": True, "prefetch": 2}, False),
+                                  ({"measure_peak_rss": True, "parallel": True, "workers": 2}, True)):
+            processor = run_batch(self.config(**options))
+            self.assertEqual([r.peak_rss is not None for r in processor.results if r.success],
+                             [measured] * 5, options)
+
+
+if __name__ == "__main__":
+    unittest.main()
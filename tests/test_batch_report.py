@@ -0,0 +1,67 @@
+"""
+Tests du rapport de traitement par lots
+"""
+import csv
+import json
+import unittest
+
+from src.batch_report import latency_stats
+from tests.test_batch_processor import BatchTestCase, run_batch
+
+
+class TestBatchReport(BatchTestCase):
+
+    def test_json_report(self):
+        """Mesures par image (dimensions, primitives, étapes) et agrégats"""
+        processor = run_batch(self.config(measure_peak_rss=True))
+        path = self.work_dir / "rapport.json"
+        self.assertEqual(processor.write_report(str(path)), [str(path)])
+        report = json.loads(path.read_text(encoding="utf-8"))
+
+        self.assertEqual(report["params"]["mode"], "classic")
+        summary = report["summary"]
+        self.assertEqual((summary["images"], summary["processed"], summary["failed"]), (6, 5, 1))
+        self.assertGreater(summary["images_per_s"], 0)
+        self.assertAlmostEqual(summary["megapixels"], 60 * (40 + 50 + 60 + 70 + 80) / 1e6)
+        latency = summary["latency_s"]
+        self.assertLessEqual(latency["p50"], latency["p90"])
+        self.assertLessEqual(latency["p99"], latency["max"])
+
+        first = report["images"][0]
+        self.assertEqual((first["width"], first["height"]), (60, 40))
+        self.assertGreater(first["primitives"]["triangles"], 0)
+        self.assertTrue({"decode", "render", "encode"} <= set(first["stages_s"]))
+        # Étapes internes à part : la somme des étapes ne compte le rendu qu'une fois
+        self.assertTrue(first["render_steps_s"])
+        self.assertFalse([stage for stage in summary["stage_totals_s"] if "." in stage])
+        self.assertEqual(set(summary["render_step_totals_s"]), set(first["render_steps_s"]))
+        self.assertGreater(first["output_bytes"], 0)
+        self.assertGreater(first["peak_rss_bytes"], 0)
+        self.assertFalse(report["images"][3]["success"])
+
+    def test_csv_report(self):
+        """Une ligne par image, colonnes aplaties, agrégats dans un fichier à part"""
+        processor = run_batch(self.config(hybrid_mode=True, grid_size=10, prefetch=2))
+        paths = processor.write_report(str(self.work_dir / "rapport.csv"))
+        self.assertEqual(len(paths), 2)
+
+        with open(paths[0], encoding="utf-8", newline="") as f:
+            rows = list(csv.DictReader(f))
+        self.assertEqual(len(rows), 6)
+        self.assertGreater(int(rows[0]["primitives.cellules"]), 0)
+        self.assertIn("stages_s.encode", rows[0])
+        with open(paths[1], encoding="utf-8", newline="") as f:
+            summary = dict(csv.reader(f))
+        self.assertEqual(summary["summary.processed"], "5")
+        self.assertEqual(summary["params.mode"], "hybrid")
+
+    def test_latency_stats(self):
+        """Percentiles sur une série connue, valeurs vides sans image"""
+        stats = latency_stats([float(value) for value in range(1, 101)])
+        self.assertAlmostEqual(stats["p50"], 50.5)
+        self.assertAlmostEqual(stats["max"], 100.0)
+        self.assertIsNone(latency_stats([])["p90"])
+
+
+if __name__ == "__main__":
+    unittest.main()
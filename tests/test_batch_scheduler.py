@@ -0,0 +1,83 @@
+"""
+Tests de l'ordonnancement des lots parallèles
+"""
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+from src.batch_scheduler import MegapixelScheduler, image_megapixels
+
+
+def drain(scheduler: MegapixelScheduler, slots: int):
+    """Simule des workers : renvoie les vagues de tâches lancées ensemble"""
+    waves = []
+    running = []
+    while len(scheduler) or running:
+        while len(running) < slots:
+            job = scheduler.take()
+            if job is None:
+                break
+            running.append(job)
+        waves.append(list(running))
+        scheduler.release(running.pop(0))
+    return waves
+
+
+class TestMegapixelScheduler(unittest.TestCase):
+
+    def test_largest_first(self):
+        """Sans budget, les tâches partent par taille décroissante"""
+        scheduler = MegapixelScheduler([1, 50, 3, 20])
+        self.assertEqual([scheduler.take() for _ in range(4)], [1, 3, 2, 0])
+        self.assertIsNone(scheduler.take())
+
+    def test_input_order(self):
+        """largest_first=False garde l'ordre d'entrée"""
+        scheduler = MegapixelScheduler([1, 50, 3, 20], largest_first=False)
+        self.assertEqual([scheduler.take() for _ in range(4)], [0, 1, 2, 3])
+
+    def test_budget_respected(self):
+        """Le total en cours reste sous le budget, les petites tâches comblent la place"""
+        costs = [60, 60, 30, 10, 10, 5]
+        scheduler = MegapixelScheduler(costs, budget=100)
+        waves = drain(scheduler, slots=4)
+        for wave in waves:
+            self.assertLessEqual(sum(costs[job] for job in wave), 100)
+        self.assertEqual(waves[0], [0, 2, 3])
+        self.assertEqual(scheduler.peak, 100)
+        self.assertEqual(scheduler.in_flight, 0)
+
+    def test_oversized_job_runs_alone(self):
+        """Une tâche plus grande que le budget passe seule"""
+        scheduler = MegapixelScheduler([500, 10], budget=100)
+        self.assertEqual(scheduler.take(), 0)
+        self.assertIsNone(scheduler.take())
+        scheduler.release(0)
+        self.assertEqual(scheduler.take(), 1)
+
+
+class TestImageMegapixels(unittest.TestCase):
+
+    def setUp(self):
+        self.work_dir = Path(tempfile.mkdtemp())
+
+    def tearDown(self):
+        shutil.rmtree(self.work_dir)
+
+    def test_header_size_and_cap(self):
+        """Dimensions lues dans l'en-tête, plafonnées comme au chargement"""
+        path = str(self.work_dir / "image.png")
+        cv2.imwrite(path, np.zeros((1000, 2000, 3), dtype=np.uint8))
+        self.assertAlmostEqual(image_megapixels(path), 2.0)
+        self.assertAlmostEqual(image_megapixels(path, max_megapixels=0.5), 0.5)
+        invalid = self.work_dir / "invalide.jpg"
+        invalid.write_bytes(b"pas une image")
+        self.assertEqual(image_megapixels(str(invalid)), 0.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,49 @@
+"""
+Tests du pool de buffers et du mode mémoire réduite
+"""
+import unittest
+
+import cv2
+import numpy as np
+
+from src.buffer_pool import BufferPool
+from src.low_poly import LowPolyGenerator
+
+
+class TestBufferPool(unittest.TestCase):
+
+    def test_same_shape_reuses_buffer(self):
+        """Deux demandes de même forme renvoient le même tableau"""
+        pool = BufferPool()
+        first = pool.get("smoothed", (10, 10, 3))
+        second = pool.get("smoothed", (10, 10, 3))
+        self.assertIs(first, second)
+        self.assertEqual(pool.hits, 1)
+
+    def test_new_shape_replaces_buffer(self):
+        """Une nouvelle taille pour un même rôle libère l'ancienne"""
+        pool = BufferPool()
+        pool.get("output", (10, 10, 3))
+        pool.get("output", (20, 20, 3))
+        self.assertEqual(pool.nbytes, 20 * 20 * 3)
+
+    def test_low_memory_output_matches(self):
+        """Le rendu avec pool est identique au rendu standard"""
+        test_img = np.random.RandomState(0).randint(0, 255, (120, 160, 3), dtype=np.uint8)
+        test_path = "/tmp/test_buffer_pool.png"
+        cv2.imwrite(test_path, test_img)
+
+        pool = BufferPool()
+        outputs = []
+        for buffer_pool in (None, pool, pool):
+            np.random.seed(3)
+            generator = LowPolyGenerator(test_path, num_points=80, buffer_pool=buffer_pool)
+            outputs.append(np.asarray(generator.generate()))
+
+        np.testing.assert_array_equal(outputs[0], outputs[1])
+        np.testing.assert_array_equal(outputs[0], outputs[2])
+        self.assertGreater(pool.hits, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,114 @@
+"""
+Tests du chargement et du générateur classique
+"""
+import unittest
+
+import cv2
+import numpy as np
+
+from src.low_poly import EdgeDetector, LowPolyGenerator, PointSource, load_image, read_image_size
+
+
+class TestLoadImage(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        """Crée une image JPEG de 4 mégapixels"""
+        test_img = np.zeros((1600, 2400, 3), dtype=np.uint8)
+        test_img[:, :1200] = [255, 0, 0]
+        test_img[:, 1200:] = [0, 255, 0]
+        cls.test_path = "/tmp/test_load_image.jpg"
+        cv2.imwrite(cls.test_path, test_img)
+
+    def test_read_image_size(self):
+        """Les dimensions sont lues depuis l'en-tête"""
+        self.assertEqual(read_image_size(self.test_path), (2400, 1600))
+        self.assertIsNone(read_image_size("/tmp/inexistant.jpg"))
+
+    def test_full_resolution_by_default(self):
+        """Sans plafond, l'image est chargée en pleine résolution"""
+        self.assertEqual(load_image(self.test_path).shape, (1600, 2400, 3))
+
+    def test_megapixel_cap(self):
+        """Le plafond est respecté et le ratio conservé"""
+        image = load_image(self.test_path, max_megapixels=1.0)
+        height, width = image.shape[:2]
+        self.assertLessEqual(width * height, 1_000_000)
+        self.assertGreater(width * height, 900_000)
+        self.assertAlmostEqual(width / height, 1.5, places=2)
+
+    def test_generator_uses_cap(self):
+        """Le générateur travaille à la taille plafonnée"""
+        generator = LowPolyGenerator(self.test_path, num_points=100, max_megapixels=0.5)
+        self.assertLessEqual(generator.width * generator.height, 500_000)
+
+
+class TestContourPoints(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        """Crée une image avec un rectangle net"""
+        test_img = np.zeros((200, 300, 3), dtype=np.uint8)
+        test_img[50:150, 80:220] = [255, 255, 255]
+        cls.test_path = "/tmp/test_contour_points.png"
+        cv2.imwrite(cls.test_path, test_img)
+
+    def test_vertices_lie_on_edges(self):
+        """Les sommets extraits sont sur (ou tout près de) la carte de contours"""
+        generator = LowPolyGenerator(self.test_path, num_points=100,
+                                     point_source=PointSource.CONTOURS)
+        edges = generator.detect_edges()
+        vertices = generator.extract_contour_points(edges, 100).astype(int)
+        self.assertGreater(len(vertices), 0)
+        self.assertTrue(np.all(edges[vertices[:, 1], vertices[:, 0]] > 0))
+
+    def test_budget_is_respected(self):
+        """Le nombre total de points reste égal au budget"""
+        generator = LowPolyGenerator(self.test_path, num_points=60,
+                                     point_source=PointSource.CONTOURS, contour_tolerance=0.5)
+        points = generator.generate_points(use_edges=True)
+        self.assertEqual(len(points), 60)
+
+    def test_unknown_source_rejected(self):
+        """Une source inconnue est refusée"""
+        with self.assertRaises(ValueError):
+            LowPolyGenerator(self.test_path, point_source="grid")
+
+
+class TestEdgeDetectors(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.image = np.random.RandomState(5).randint(0, 255, (80, 120, 3), dtype=np.uint8)
+        cls.test_path = "/tmp/test_edge_detectors.png"
+        cv2.imwrite(cls.test_path, cls.image)
+
+    def test_sobel_matches_gradient_threshold(self):
+        """Le niveau sobel seuille |gx| + |gy| sans CLAHE"""
+        generator = LowPolyGenerator(self.test_path, edge_sensitivity=2,
+                                     edge_detector=EdgeDetector.SOBEL)
+        gray = cv2.cvtColor(self.image, cv2.COLOR_BGR2GRAY)
+        grad_x = cv2.Sobel(gray, cv2.CV_16S, 1, 0).astype(np.int32)
+        grad_y = cv2.Sobel(gray, cv2.CV_16S, 0, 1).astype(np.int32)
+        magnitude = np.minimum(np.abs(grad_x), 255) + np.minimum(np.abs(grad_y), 255)
+        expected = np.where(magnitude >= 160, 255, 0).astype(np.uint8)
+        np.testing.assert_array_equal(generator.detect_edges(), expected)
+
+    def test_canny_skips_equalization(self):
+        """Le niveau canny travaille sur les niveaux de gris bruts"""
+        generator = LowPolyGenerator(self.test_path, edge_sensitivity=2,
+                                     edge_detector=EdgeDetector.CANNY)
+        gray = cv2.cvtColor(self.image, cv2.COLOR_BGR2GRAY)
+        kernel = cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (2, 2))
+        expected = cv2.dilate(cv2.Canny(gray, 70, 160), kernel, iterations=1)
+        np.testing.assert_array_equal(generator.detect_edges(), expected)
+        self.assertNotIn("clahe", generator.analysis._cache)
+
+    def test_unknown_detector_rejected(self):
+        """Un détecteur inconnu est refusé"""
+        with self.assertRaises(ValueError):
+            LowPolyGenerator(self.test_path, edge_detector="laplacian")
+
+
+if __name__ == "__main__":
+    unittest.main()
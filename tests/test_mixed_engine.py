@@ -0,0 +1,51 @@
+"""
+Tests du moteur mixte (triangles + formes)
+"""
+import unittest
+
+import cv2
+import numpy as np
+
+from src.mixed_engine import MixedLowPolyGenerator
+
+
+class TestMixedEngine(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        """Image à moitié unie, à moitié texturée"""
+        test_img = np.full((120, 200, 3), 150, dtype=np.uint8)
+        test_img[:, 100:] = np.random.RandomState(3).randint(0, 255, (120, 100, 3))
+        cls.test_path = "/tmp/test_mixed.png"
+        cv2.imwrite(cls.test_path, test_img)
+
+    def test_triangles_only_in_detailed_half(self):
+        """Les triangles couvrent la moitié texturée, les formes l'autre"""
+        np.random.seed(0)
+        generator = MixedLowPolyGenerator(self.test_path, num_points=400, grid_size=20)
+        image = np.asarray(generator.generate(add_outlines=False))
+        self.assertEqual(image.shape, (120, 200, 3))
+        self.assertGreater(generator.primitives["triangles"], 0)
+        self.assertGreater(generator.primitives["formes"], 0)
+        # Zone unie : une seule couleur, sans contour
+        self.assertEqual(len(np.unique(image[:, :80].reshape(-1, 3), axis=0)), 1)
+
+    def test_point_budget_follows_detail_area(self):
+        """Le budget de points est proportionnel à la surface détaillée"""
+        np.random.seed(0)
+        generator = MixedLowPolyGenerator(self.test_path, num_points=400, grid_size=20)
+        generator.generate()
+        # Environ la moitié du budget pour la moitié texturée de l'image
+        self.assertLess(generator.primitives["triangles"], 2 * 400 * 0.6)
+
+    def test_flat_image_has_no_triangles(self):
+        """Une image unie n'est rendue qu'avec des formes"""
+        flat_path = "/tmp/test_mixed_flat.png"
+        cv2.imwrite(flat_path, np.full((80, 120, 3), 60, dtype=np.uint8))
+        generator = MixedLowPolyGenerator(flat_path, grid_size=20)
+        generator.generate()
+        self.assertEqual(generator.primitives["triangles"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,49 @@
+"""
+Tests du graphe d'étapes du pipeline
+"""
+import time
+import unittest
+
+from src.pipeline import StageGraph
+
+
+class TestStageGraph(unittest.TestCase):
+
+    def _graph(self):
+        graph = StageGraph()
+        graph.add("a", lambda: 2)
+        graph.add("b", lambda: 3)
+        graph.add("c", lambda a, b: a * b, deps=["a", "b"])
+        return graph
+
+    def test_dependencies_results(self):
+        """Les résultats des dépendances sont passés dans l'ordre"""
+        for workers in (1, 2):
+            results = self._graph().run(workers=workers)
+            self.assertEqual(results["c"], 6)
+
+    def test_unknown_dependency_rejected(self):
+        """Une dépendance non déclarée est refusée"""
+        graph = StageGraph()
+        with self.assertRaises(ValueError):
+            graph.add("c", lambda a: a, deps=["a"])
+
+    def test_independent_stages_overlap(self):
+        """Deux étapes indépendantes se chevauchent sur le pool"""
+        graph = StageGraph()
+        graph.add("left", lambda: time.sleep(0.1))
+        graph.add("right", lambda: time.sleep(0.1))
+        graph.run(workers=2)
+        self.assertGreater(graph.overlap(), 0.05)
+        self.assertEqual(set(graph.timings), {"left", "right"})
+
+    def test_exception_propagates(self):
+        """Une erreur dans une étape remonte à l'appelant"""
+        graph = StageGraph()
+        graph.add("boom", lambda: 1 / 0)
+        with self.assertRaises(ZeroDivisionError):
+            graph.run(workers=2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,44 @@
+"""
+Tests du gestionnaire de presets
+"""
+import json
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+from src.preset_manager import PresetManager
+
+
+class TestPresetManager(unittest.TestCase):
+
+    def setUp(self):
+        self.config_dir = Path(tempfile.mkdtemp())
+
+    def tearDown(self):
+        shutil.rmtree(self.config_dir)
+
+    def test_missing_defaults_added_to_existing_file(self):
+        """Un fichier de presets antérieur reçoit les nouveaux presets par défaut"""
+        existing = {"Perso": {"name": "Perso", "points": 300},
+                    "Équilibré": {"name": "Équilibré", "points": 1234}}
+        (self.config_dir / PresetManager.PRESETS_FILE).write_text(json.dumps(existing),
+                                                                  encoding="utf-8")
+        manager = PresetManager(self.config_dir)
+
+        self.assertEqual(manager.load_preset("Lot Rapide").edge_detector, "sobel")
+        self.assertEqual(manager.load_preset("Perso").points, 300)
+        # Un preset par défaut modifié par l'utilisateur est conservé
+        self.assertEqual(manager.load_preset("Équilibré").points, 1234)
+        saved = json.loads((self.config_dir / PresetManager.PRESETS_FILE).read_text(encoding="utf-8"))
+        self.assertIn("Lot Rapide", saved)
+
+    def test_default_presets_cannot_be_deleted(self):
+        """Les presets par défaut, y compris les plus récents, ne se suppriment pas"""
+        manager = PresetManager(self.config_dir)
+        self.assertFalse(manager.delete_preset("Lot Rapide"))
+        self.assertIsNotNone(manager.load_preset("Lot Rapide"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,81 @@
+"""
+Tests du cache de résultats
+"""
+import os
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+
+from src.result_cache import ResultCache
+
+
+class TestResultCache(unittest.TestCase):
+
+    def setUp(self):
+        self.work_dir = Path(tempfile.mkdtemp())
+        self.cache = ResultCache(str(self.work_dir / "cache"), max_mb=1)
+
+    def tearDown(self):
+        shutil.rmtree(self.work_dir)
+
+    def write(self, name: str, size: int) -> Path:
+        path = self.work_dir / name
+        path.write_bytes(os.urandom(size))
+        return path
+
+    def test_key_depends_on_content_and_params(self):
+        """Même contenu et mêmes paramètres : même clé, quel que soit l'ordre des paramètres"""
+        key = ResultCache.key("abc", {"mode": "classic", "num_points": 100})
+        self.assertEqual(key, ResultCache.key("abc", {"num_points": 100, "mode": "classic"}))
+        self.assertNotEqual(key, ResultCache.key("abd", {"mode": "classic", "num_points": 100}))
+        self.assertNotEqual(key, ResultCache.key("abc", {"mode": "classic", "num_points": 101}))
+
+    def test_hit_and_miss(self):
+        """Un rendu ajouté est recopié à l'identique, une clé inconnue est un échec"""
+        source = self.write("rendu.png", 1000)
+        destination = self.work_dir / "copie.png"
+        self.assertFalse(self.cache.fetch("aa" * 32, str(destination)))
+        self.cache.put_file("aa" * 32, str(source))
+        self.assertTrue(self.cache.fetch("aa" * 32, str(destination)))
+        self.assertEqual(destination.read_bytes(), source.read_bytes())
+        self.assertFalse(self.cache.fetch("aa" * 32, str(self.work_dir / "copie.jpg")))
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 2))
+
+    def test_images_and_arrays(self):
+        """Images PIL et maillages (tableaux nommés) relus à l'identique"""
+        pixels = np.random.RandomState(0).randint(0, 255, (20, 30, 3), dtype=np.uint8)
+        self.cache.put_image("bb" * 32, Image.fromarray(pixels))
+        np.testing.assert_array_equal(np.asarray(self.cache.get_image("bb" * 32)), pixels)
+
+        points = np.random.RandomState(1).rand(10, 2)
+        self.cache.put_arrays("cc" * 32, points=points, simplices=np.arange(9).reshape(3, 3))
+        mesh = self.cache.get_arrays("cc" * 32)
+        np.testing.assert_array_equal(mesh["points"], points)
+        self.assertEqual(mesh["simplices"].shape, (3, 3))
+        self.assertIsNone(self.cache.get_arrays("dd" * 32))
+
+    def test_lru_eviction_under_cap(self):
+        """Au-delà du plafond, les entrées les moins récemment utilisées partent en premier"""
+        keys = [f"{index:02d}" * 32 for index in range(4)]
+        for age, key in enumerate(keys):
+            self.cache.put_file(key, str(self.write(f"{key}.png", 250 * 1024)))
+            os.utime(self.cache._path(key, ".png"), (1000 + age, 1000 + age))
+        # Relire la plus ancienne la rend récente
+        self.assertTrue(self.cache.fetch(keys[0], str(self.work_dir / "lu.png")))
+
+        self.cache.put_file("ff" * 32, str(self.write("nouveau.png", 250 * 1024)))
+        self.assertLessEqual(self.cache.size_on_disk(), self.cache.max_bytes)
+        self.assertEqual(self.cache.evictions, 2)
+        remaining = {path.stem for _, _, path in self.cache._entries()}
+        self.assertEqual(remaining, {keys[0], keys[3], "ff" * 32})
+
+        self.cache.clear()
+        self.assertEqual(self.cache.size_on_disk(), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,72 @@
+"""
+Tests des images en mémoire partagée
+"""
+import unittest
+
+import numpy as np
+
+from src.buffer_pool import BufferPool
+from src.shared_frames import OutputBufferPool, SharedFramePool, attach
+
+
+class TestSharedFramePool(unittest.TestCase):
+
+    def setUp(self):
+        self.pool = SharedFramePool(max_free=2)
+
+    def tearDown(self):
+        self.pool.close()
+
+    def test_put_and_attach_round_trip(self):
+        """Un tableau copié dans un bloc se relit à l'identique, sans copie côté lecteur"""
+        array = np.random.RandomState(0).randint(0, 255, (30, 40, 3), dtype=np.uint8)
+        ref = self.pool.put(array)
+        view = attach(ref)
+        np.testing.assert_array_equal(view, array)
+        view[0, 0] = (1, 2, 3)
+        np.testing.assert_array_equal(self.pool.view(ref)[0, 0], (1, 2, 3))
+
+    def test_released_block_is_recycled(self):
+        """Un bloc libéré sert à l'image suivante qui y tient"""
+        first = self.pool.acquire((100, 100, 3))
+        self.pool.release(first)
+        second = self.pool.acquire((50, 100, 3))
+        self.assertEqual(second.name, first.name)
+        self.assertEqual(second.shape, (50, 100, 3))
+        self.assertEqual((self.pool.created, self.pool.reused), (1, 1))
+
+        # Trop petit pour la demande suivante : nouveau bloc
+        self.pool.release(second)
+        third = self.pool.acquire((200, 100, 3))
+        self.assertNotEqual(third.name, first.name)
+        self.assertEqual(self.pool.created, 2)
+
+    def test_free_blocks_are_bounded(self):
+        """Au-delà de max_free blocs libres, les plus petits sont supprimés"""
+        refs = [self.pool.acquire((10 * (index + 1), 10)) for index in range(4)]
+        for ref in refs:
+            self.pool.release(ref)
+        self.assertEqual(self.pool.nbytes, 300 + 400)
+
+
+class TestOutputBufferPool(unittest.TestCase):
+
+    def test_output_buffer_is_imposed(self):
+        """Le buffer "output" est le tableau fourni, les autres viennent du pool de base"""
+        output = np.zeros((20, 30, 3), dtype=np.uint8)
+        base = BufferPool()
+        pool = OutputBufferPool(output, base)
+        self.assertIs(pool.zeros("output", (20, 30, 3)), output)
+        self.assertTrue(pool.output_used)
+        self.assertIs(pool.get("smoothed", (20, 30, 3)), base.get("smoothed", (20, 30, 3)))
+
+    def test_other_shape_is_not_imposed(self):
+        """Une demande d'une autre forme ne reçoit pas le tableau fourni"""
+        output = np.zeros((20, 30, 3), dtype=np.uint8)
+        pool = OutputBufferPool(output)
+        self.assertEqual(pool.get("output", (10, 30, 3)).shape, (10, 30, 3))
+        self.assertFalse(pool.output_used)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,60 @@
+"""
+Tests du moteur superpixels (SLIC)
+"""
+import unittest
+
+import cv2
+import numpy as np
+
+from src.superpixel_engine import SuperpixelLowPolyGenerator
+
+
+class TestSuperpixelEngine(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        """Quatre quadrants de couleurs unies"""
+        test_img = np.zeros((120, 160, 3), dtype=np.uint8)
+        test_img[:60, :80] = [200, 40, 40]
+        test_img[:60, 80:] = [40, 200, 40]
+        test_img[60:, :80] = [40, 40, 200]
+        test_img[60:, 80:] = [200, 200, 40]
+        cls.test_path = "/tmp/test_superpixels.png"
+        cv2.imwrite(cls.test_path, test_img)
+
+    def test_region_colors_are_label_means(self):
+        """La réduction par étiquette donne la moyenne de chaque région"""
+        generator = SuperpixelLowPolyGenerator(self.test_path, num_regions=30, enhance_colors=False,
+                                               segment_megapixels=None)
+        labels, scale = generator.segment()
+        self.assertEqual(scale, 1.0)
+        colors = generator.region_colors(labels)
+        for label in (0, int(labels.max())):
+            expected = generator.image[labels == label].mean(axis=0)
+            np.testing.assert_allclose(colors[label], expected, atol=0.5)
+
+    def test_reduced_segmentation_covers_full_image(self):
+        """Segmentée à échelle réduite, l'image garde sa taille et ses couleurs"""
+        generator = SuperpixelLowPolyGenerator(self.test_path, num_regions=20, enhance_colors=False,
+                                               segment_megapixels=0.005)
+        image = cv2.cvtColor(np.asarray(generator.generate(add_outlines=False)), cv2.COLOR_RGB2BGR)
+        self.assertEqual(image.shape, generator.image.shape)
+        self.assertGreater(cv2.PSNR(generator.image, image), 20)
+        self.assertLessEqual(generator.primitives["régions"], 40)
+
+    def test_enclosed_region_stays_visible(self):
+        """Une région entourée par une autre n'est pas recouverte par son polygone"""
+        image = np.full((60, 60, 3), (200, 40, 40), dtype=np.uint8)
+        image[20:40, 20:40] = (40, 40, 200)
+        generator = SuperpixelLowPolyGenerator("", enhance_colors=False, image=image)
+        # Région extérieure (en anneau) après la région intérieure
+        labels = np.ones((60, 60), dtype=np.int32)
+        labels[20:40, 20:40] = 0
+        generator.segment = lambda: (labels, 1.0)
+        output = cv2.cvtColor(np.asarray(generator.generate(add_outlines=False)), cv2.COLOR_RGB2BGR)
+        np.testing.assert_array_equal(output[30, 30], (40, 40, 200))
+        np.testing.assert_array_equal(output[5, 5], (200, 40, 40))
+
+
+if __name__ == "__main__":
+    unittest.main()
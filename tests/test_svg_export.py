@@ -0,0 +1,142 @@
+"""
+Tests de l'export SVG
+"""
+import gzip
+import re
+import unittest
+import xml.etree.ElementTree as ET
+
+import numpy as np
+
+from src.svg_export import SVGExporter, SVGStreamWriter, format_paths, format_polygons
+
+SVG_NS = "{http://www.w3.org/2000/svg}"
+
+
+class TestFormatPolygons(unittest.TestCase):
+
+    def test_bulk_matches_per_polygon_formatting(self):
+        """Le formatage par lot égale le formatage polygone par polygone"""
+        rng = np.random.RandomState(0)
+        triangles = rng.rand(50, 3, 2) * 500
+        colors = rng.randint(0, 256, (50, 3))
+        expected = "".join(
+            f'    <polygon points="{" ".join(f"{int(x)},{int(y)}" for x, y in tri)}" '
+            f'fill="#{r:02x}{g:02x}{b:02x}"/>\n'
+            for tri, (b, g, r) in zip(triangles, colors))
+        self.assertEqual(format_polygons(triangles, colors), expected)
+        self.assertEqual(format_polygons(list(triangles), colors), expected)
+
+    def test_mixed_vertex_counts(self):
+        """Une liste de polygones de tailles différentes garde ses couleurs"""
+        polygons = [np.array([[0, 0], [4, 0], [2, 3]]),
+                    np.array([[1, 1], [5, 1], [5, 5], [1, 5]])]
+        text = format_polygons(polygons, [(0, 0, 255), (255, 0, 0)], indent="", newline="\n")
+        self.assertEqual(text.splitlines(), [
+            '<polygon points="0,0 4,0 2,3" fill="#ff0000"/>',
+            '<polygon points="1,1 5,1 5,5 1,5" fill="#0000ff"/>'])
+
+
+def decode_path(d):
+    """Sommets absolus de chaque sous-chemin "M x y l dx dy ... z" """
+    polygons = []
+    for subpath in re.findall(r"M([^l]*)l([^z]*)z", d):
+        start = [float(v) for v in re.findall(r"-?[\d.]+", subpath[0])]
+        offsets = np.array([float(v) for v in re.findall(r"-?[\d.]+", subpath[1])]).reshape(-1, 2)
+        polygons.append(np.vstack([start, start + np.cumsum(offsets, axis=0)]))
+    return polygons
+
+
+class TestCompactPaths(unittest.TestCase):
+
+    def test_paths_merge_colors_and_keep_vertices(self):
+        """Un <path> par couleur, qui redonne les sommets tronqués (précision 0) ou arrondis"""
+        rng = np.random.RandomState(2)
+        triangles = rng.rand(40, 3, 2) * 300
+        colors = np.array([(10, 20, 30), (200, 100, 0)] * 20)
+        for precision in (0, 2):
+            root = ET.fromstring(f"<g>{format_paths(triangles, colors, precision)}</g>")
+            paths = root.findall("path")
+            self.assertEqual([p.get("fill") for p in paths], ["#1e140a", "#0064c8"])
+            for offset, path in enumerate(paths):
+                decoded = decode_path(path.get("d"))
+                expected = (np.round(triangles[offset::2], precision) if precision
+                            else triangles[offset::2].astype(np.int64))
+                np.testing.assert_allclose(decoded, expected, atol=1e-9)
+
+    def test_integer_paths_match_standard_vertices(self):
+        """À la précision 0, mêmes sommets que les <polygon> de l'export standard"""
+        triangles = np.random.RandomState(3).rand(30, 3, 2) * 200
+        colors = [(1, 2, 3)] * 30
+        standard = ET.fromstring(f"<g>{format_polygons(triangles, colors)}</g>")
+        vertices = [[[float(v) for v in point.split(",")] for point in p.get("points").split()]
+                    for p in standard.findall("polygon")]
+        paths = ET.fromstring(f"<g>{format_paths(triangles, colors)}</g>").findall("path")
+        np.testing.assert_array_equal(decode_path(paths[0].get("d")), vertices)
+
+    def test_invalid_precision_rejected(self):
+        """Une précision négative est refusée"""
+        with self.assertRaises(ValueError):
+            format_paths(np.zeros((1, 3, 2)), [(0, 0, 0)], precision=-1)
+
+
+class TestSVGWriters(unittest.TestCase):
+
+    def test_exporter_keeps_per_element_styles(self):
+        """SVGExporter écrit un élément par triangle avec son contour"""
+        exporter = SVGExporter(40, 30)
+        exporter.add_triangle(np.array([[0.7, 0], [10, 0], [5, 9.9]]), (10, 20, 30), (0, 0, 0), 1)
+        exporter.add_triangle(np.array([[1, 1], [2, 2], [3, 1]]), (1, 2, 3))
+        for pretty in (True, False):
+            exporter.save("/tmp/test_exporter.svg", pretty=pretty)
+            root = ET.parse("/tmp/test_exporter.svg").getroot()
+            self.assertEqual(root.get("viewBox"), "0 0 40 30")
+            first, second = root.findall(f"{SVG_NS}polygon")
+            self.assertEqual(first.attrib, {"points": "0,0 10,0 5,9", "fill": "#1e140a",
+                                            "stroke": "#000000", "stroke-width": "1"})
+            self.assertEqual(second.get("stroke"), "none")
+
+    def test_stream_writer_chunks_and_gzip(self):
+        """Écriture par lots et sortie .svgz compressée"""
+        rng = np.random.RandomState(1)
+        triangles = rng.randint(0, 100, (25, 3, 2))
+        colors = rng.randint(0, 256, (25, 3))
+        with SVGStreamWriter("/tmp/test_stream.svgz", 100, 100, chunk_size=7) as writer:
+            writer.add_polygons(triangles, colors)
+            writer.add_polygon(triangles[0], colors[0])
+        self.assertEqual(writer.count, 26)
+
+        with gzip.open("/tmp/test_stream.svgz", "rt") as f:
+            root = ET.fromstring(f.read())
+        polygons = root.findall(f".//{SVG_NS}polygon")
+        self.assertEqual(len(polygons), 26)
+        b, g, r = colors[-1]
+        self.assertEqual(polygons[-2].get("fill"), f"#{r:02x}{g:02x}{b:02x}")
+
+    def test_stream_writer_default_joins(self):
+        """Jonctions des contours par défaut (miter) sauf demande explicite"""
+        for linejoin in (None, "round"):
+            with SVGStreamWriter("/tmp/test_joins.svg", 10, 10, outline=(0, 0, 0),
+                                 linejoin=linejoin) as writer:
+                writer.add_polygon(np.array([[0, 0], [5, 0], [2, 4]]), (1, 2, 3))
+            group = ET.parse("/tmp/test_joins.svg").getroot().find(f"{SVG_NS}g")
+            self.assertEqual(group.get("stroke-linejoin"), linejoin)
+
+    def test_compact_exporter_groups_styles(self):
+        """En mode compact, le contour est porté par un groupe <g>"""
+        exporter = SVGExporter(40, 30)
+        for offset in range(3):
+            exporter.add_triangle(np.array([[0, 0], [10, 0], [5, 9]]) + offset, (1, 2, 3),
+                                  (0, 0, 0), 1)
+        exporter.save("/tmp/test_compact.svg", compact=True)
+        root = ET.parse("/tmp/test_compact.svg").getroot()
+        group = root.find(f"{SVG_NS}g")
+        self.assertEqual(group.get("stroke"), "#000000")
+        paths = group.findall(f"{SVG_NS}path")
+        self.assertEqual(len(paths), 1)
+        self.assertEqual(len(decode_path(paths[0].get("d"))), 3)
+        self.assertIsNone(paths[0].get("stroke"))
+
+
+if __name__ == "__main__":
+    unittest.main()